@@ -8,6 +8,9 @@ IMAGE_EXTENSIONS = [".jpg", ".jpeg", ".png", ".webp", ".gif"]
 ANNOTATION_FILE_NAME = "annotations.json"
 META_FILE_NAME = "meta.json"
 
+# URL中含有这些关键词的图片视为图标/头像等非内容图片
+IMAGE_SKIP_KEYWORDS = ["icon", "avatar", "logo", "spinner", "loading", "default"]
+
 # 数据质量检查常量
 QUALITY_CHECKS = {
     "PASSED": "passed",
@@ -21,10 +21,27 @@ CRAWLER_SETTINGS = {
     "target_theme": "外卖/点餐翻车",  # 目标主题
     "search_keywords": ["外卖翻车", "点餐翻车", "外卖漫画", "点餐漫画"],  # 搜索关键词
     "concurrent_requests": 3,  # 并发请求数（避免被封）
-    "request_delay": 2,  # 请求延迟（秒）
+    "rate_limits": {  # 按主机的令牌桶限速：rate为每秒请求数，burst为允许连续发出的请求数
+        "site": {"rate": 0.5, "burst": 1},  # 站点页面和接口（平均每2秒一次）
+        "cdn": {"rate": 8, "burst": 16},  # CDN图片
+    },
+    "cdn_hosts": ["xhscdn.com", "xhscdn.net"],  # 使用cdn限速预算的主机后缀
     "timeout": 30,  # 请求超时时间
     "max_scroll_attempts": 5,  # 最大滚动次数（用于加载更多内容）
-    "scroll_pause_time": 2,  # 滚动后暂停时间（秒）
+    "scroll_pause_time": 2,  # 滚动后等待新卡片出现的上限（秒），新卡片出现即继续
+    "incremental_search": True,  # 滚动加载时只解析新增的笔记卡片
+    "search_note_target": 50,  # 每个关键词滚动收集的候选笔记数量
+    "scroll_time_budget": 30,  # 每个关键词滚动收集的时间上限（秒）
+    "scroll_no_growth_rounds": 2,  # 连续多少次滚动没有新卡片时停止
+    "download_workers": 6,  # 并发下载图片的线程数
+    "download_per_host": 4,  # 同一主机同时进行的下载数上限
+    "download_chunk_size": 65536,  # 流式下载每次写入的字节数
+    "image_store": True,  # 图片按内容存入共享存储，连环画目录中为硬链接，重复图片不再下载
+    "image_store_dir": PROCESSED_DATA_DIR / "image_store",  # 图片存储目录
+    "http_cache": False,  # GET响应缓存到本地，开发时反复运行几乎不产生网络请求
+    "http_cache_dir": DATA_DIR / "http_cache",  # 响应缓存目录
+    "http_cache_ttl": 86400,  # 缓存有效期（秒），过期后用条件请求验证
+    "http_cache_max_mb": 512,  # 缓存总大小上限，超出时淘汰最久未使用的响应
 }
 
 # Selenium浏览器设置
@@ -36,8 +53,37 @@ SELENIUM_SETTINGS = {
     "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "implicit_wait": 10,  # 隐式等待时间（秒）
     "explicit_wait": 15,  # 显式等待时间（秒）
+    "page_latency_budget": 15,  # 每个页面所有就绪等待的总时间上限（秒）
+    "wait_poll_interval": 0.2,  # 就绪条件轮询间隔（秒）
+    "popup_wait": 1,  # 页面有登录提示但弹窗尚未显示时，等待其出现的最长时间（秒）
+    "capture_network": False,  # 从浏览器网络日志捕获接口JSON，HTML解析仅作为回退
+    "blocking_profile": "scrape",  # 资源拦截配置：off, lite（视频/字体/统计）, scrape（另外拦截图片）
+    "record_page_metrics": True,  # 记录每个页面的传输量和加载时间
+    "warm_start": True,  # 热启动：从本地缓存解析驱动，复用持久化用户目录
+    "driver_path": None,  # 手动指定的ChromeDriver路径
+    "profile_dir": DATA_DIR / "chrome_profile",  # 持久化浏览器用户目录
+    "session_ttl_hours": 6,  # 登录成功后多少小时内跳过登录检查
     "download_images": True,  # 是否下载图片
     "save_screenshots": True,  # 是否保存截图（用于调试）
+    "pool_size": 1,  # 处理笔记详情页的浏览器数量（大于1时启用浏览器工作池）
+    "worker_min_interval": 3,  # 每个浏览器两次访问之间的最小间隔（秒）
+    "worker_jitter": 2,  # 在最小间隔之上追加的随机间隔上限（秒）
+    "tab_count": 1,  # 主浏览器中并行加载笔记详情页的标签页数量（大于1且未启用工作池时生效）
+    "tab_page_timeout": 15,  # 标签页中单个页面加载就绪的上限（秒）
+    "tab_min_interval": 1.5,  # 两个标签页开始加载页面之间的最小间隔（秒）
+    "tab_jitter": 1,  # 在标签页最小间隔之上追加的随机间隔上限（秒）
+}
+
+# 解析器设置
+PARSER_SETTINGS = {
+    "search_engine": "lxml",  # 搜索结果解析引擎：lxml（单次遍历）, legacy（旧版多选择器扫描）
+    "cache_size": 32,  # 按页面内容哈希缓存的解析结果数量（0表示不缓存）
+    "adaptive_selectors": True,  # 按历史命中率优先尝试最有效的选择器
+    "adaptive_legacy_selectors": False,  # 旧版引擎是否也按命中率排序（默认关闭，保持为对比基线）
+    "full_result_size": 20,  # 单个策略产出这么多有效笔记即视为完整结果，不再尝试其他策略
+    "selector_stats_window": 100,  # 每个策略保留的最近页面样本数
+    "selector_stats_file": DATA_DIR / "parser_selector_stats.json",  # 选择器统计持久化文件
+    "partial_detail_parse": True,  # 详情页先只解析script标签，需要HTML回退时才构建完整DOM
 }
 
 # 请求重试策略
@@ -75,6 +121,14 @@ TAGS = {
     "secondary_tags": ["外卖小哥", "美食", "吐槽", "搞笑", "日常"],
 }
 
+# 搜索关键词对应的相关词（用于判断笔记与搜索关键词是否相关）
+RELATED_KEYWORDS = {
+    "外卖翻车": ["外卖", "翻车", "美团", "饿了么", "送餐", "外卖小哥", "点餐", "吃啥"],
+    "点餐翻车": ["点餐", "翻车", "外卖", "美团", "饿了么", "餐厅", "吃啥"],
+    "外卖漫画": ["外卖", "漫画", "美团", "饿了么", "送餐", "画", "插图"],
+    "点餐漫画": ["点餐", "漫画", "外卖", "餐厅", "画", "插图"],
+}
+
 # 日志配置
 LOG_CONFIG = {
     "level": "INFO",  # 日志级别：DEBUG, INFO, WARNING, ERROR, CRITICAL
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+解析器基准测试脚本
+在debug_pages录制页面上运行解析方法，统计延迟分位数、峰值内存和提取数量，
+并与基线对比，性能退化超过阈值时返回非零退出码
+
+搜索页方法使用search_*.html，详情页方法使用note_*.html（没有录制的详情页时跳过）；
+峰值内存为每个方法在独立子进程中运行时的常驻内存(RSS)增量，包含lxml等C扩展的分配
+"""
+
+import re
+import sys
+import glob
+import time
+import logging
+import argparse
+import platform
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows没有resource模块
+    resource = None
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.crawler.parser import XHSParser
+from src.utils.helper import format_timestamp, safe_json_dump, safe_json_load
+
+
+DEFAULT_CORPUS = str(project_root / "debug_pages" / "search_*.html")
+DEFAULT_DETAIL_CORPUS = str(project_root / "debug_pages" / "note_*.html")
+DEFAULT_BASELINE = project_root / "data" / "benchmarks" / "parser_baseline.json"
+
+
+def load_corpus(pattern: str) -> List[Tuple[str, str, str]]:
+    """
+    加载录制页面
+
+    Args:
+        pattern: 页面文件的glob模式
+
+    Returns:
+        (文件名, 关键词, 页面源码) 列表
+    """
+    pages = []
+    for filepath in sorted(glob.glob(pattern)):
+        path = Path(filepath)
+        # 文件名格式: search_{keyword}_{timestamp}.html（详情页为note_{note_id}_{timestamp}.html）
+        parts = path.stem.split('_')
+        keyword = '_'.join(parts[1:-1]) if len(parts) >= 3 else ''
+        with open(path, 'r', encoding='utf-8') as f:
+            pages.append((path.name, keyword, f.read()))
+    return pages
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """计算分位数（线性插值）"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def build_methods(parser: XHSParser) -> Dict[str, Tuple[str, Callable[[str, str], int]]]:
+    """构建待测方法：方法名 -> (页面类型search/detail, 方法)，每个方法返回提取到的笔记数量"""
+
+    def search_direct(page_source: str, keyword: str) -> int:
+        return len(parser.parse_search_results_direct(page_source, keyword))
+
+    def search_legacy(page_source: str, keyword: str) -> int:
+        return len(parser.parse_search_results_direct(page_source, keyword, engine='legacy'))
+
+    def search_simple(page_source: str, keyword: str) -> int:
+        return len(parser.parse_search_results_simple(page_source, keyword))
+
+    def note_detail_with(target: XHSParser) -> Callable[[str, str], int]:
+        def note_detail(page_source: str, keyword: str) -> int:
+            match = re.search(r'/explore/([a-f0-9]{24})', page_source)
+            note_id = match.group(1) if match else ''
+            detail = target.parse_note_detail_direct(
+                page_source, f"https://www.xiaohongshu.com/explore/{note_id}"
+            )
+            return 1 if detail.get('note_id') else 0
+        return note_detail
+
+    # 对照组：详情页一开始就构建完整DOM
+    level = parser.logger.level
+    full_parser = XHSParser(search_engine=parser.search_engine, cache_size=0)
+    # 两个解析器共用同一个日志器，创建后恢复日志级别
+    full_parser.logger.setLevel(level)
+    full_parser.partial_detail_parse = False
+
+    return {
+        'parse_search_results_direct': ('search', search_direct),
+        'parse_search_results_legacy': ('search', search_legacy),
+        'parse_search_results_simple': ('search', search_simple),
+        'parse_note_detail_direct': ('detail', note_detail_with(parser)),
+        'parse_note_detail_full_dom': ('detail', note_detail_with(full_parser)),
+    }
+
+
+def create_parser() -> XHSParser:
+    """创建基准测试用的解析器"""
+    # 关闭解析缓存，否则重复运行只会测到缓存命中
+    parser = XHSParser(cache_size=0)
+    # 基准测试时关闭解析器的INFO日志，避免日志IO影响计时
+    parser.logger.setLevel(logging.WARNING)
+    return parser
+
+
+def _max_rss_kb() -> Optional[int]:
+    """当前进程的峰值常驻内存（KB），不支持统计时返回None"""
+    # Linux的ru_maxrss在exec后继承父进程的峰值，优先读取只属于本进程的VmHWM
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS单位为字节
+    return usage // 1024 if sys.platform == 'darwin' else usage
+
+
+def measure_peak_rss(name: str, pattern: str) -> Optional[float]:
+    """
+    在子进程中运行方法，返回峰值RSS相对运行前的增量（KB）
+
+    Args:
+        name: 方法名
+        pattern: 页面文件的glob模式
+
+    Returns:
+        增量KB，不支持统计时返回None
+    """
+    _, func = build_methods(create_parser())[name]
+    before = _max_rss_kb()
+    if before is None:
+        return None
+    # 逐个读取页面，增量只包含单个页面的源码和解析过程
+    for filepath in sorted(glob.glob(pattern)):
+        for _, keyword, page_source in load_corpus(glob.escape(filepath)):
+            func(page_source, keyword)
+    return float(_max_rss_kb() - before)
+
+
+def benchmark_method(func: Callable[[str, str], int], pages: List[Tuple[str, str, str]],
+                     repeat: int = 3, name: str = '', pattern: str = '') -> Dict[str, Any]:
+    """
+    对单个方法进行基准测试
+
+    Args:
+        func: 待测方法
+        pages: 录制页面
+        repeat: 每页重复次数，取最小值作为该页延迟
+        name: 方法名（用于在子进程中测量峰值内存，为空时不测量）
+        pattern: 页面文件的glob模式（子进程重新加载页面）
+
+    Returns:
+        统计结果字典
+    """
+    latencies = []
+    notes_extracted = 0
+
+    for _, keyword, page_source in pages:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            count = func(page_source, keyword)
+            elapsed = (time.perf_counter() - start) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        latencies.append(best)
+        notes_extracted += count
+
+    # 峰值内存在新的子进程中单独测量，各方法（各引擎）之间互不影响
+    peak_rss = None
+    if name:
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+            peak_rss = executor.submit(measure_peak_rss, name, pattern).result()
+
+    return {
+        'pages': len(pages),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p90_ms': round(percentile(latencies, 90), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'max_ms': round(max(latencies), 3) if latencies else 0.0,
+        'total_ms': round(sum(latencies), 3),
+        'peak_rss_kb': peak_rss,
+        'notes_extracted': notes_extracted,
+    }
+
+
+def compare_with_baseline(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any],
+                          max_regression: float) -> List[str]:
+    """
+    与基线对比
+
+    Args:
+        results: 本次测试结果
+        baseline: 基线数据
+        max_regression: 允许的最大退化比例（0.2表示20%）
+
+    Returns:
+        退化描述列表，为空表示通过
+    """
+    regressions = []
+    baseline_methods = baseline.get('methods', {})
+
+    for name, stats in results.items():
+        base = baseline_methods.get(name)
+        if not base:
+            continue
+
+        for metric in ('p50_ms', 'p90_ms', 'peak_rss_kb'):
+            old_value = base.get(metric) or 0
+            new_value = stats.get(metric) or 0
+            if old_value > 0 and new_value > old_value * (1 + max_regression):
+                regressions.append(
+                    f"{name}.{metric}: {old_value} -> {new_value} "
+                    f"(+{(new_value / old_value - 1) * 100:.1f}%)"
+                )
+
+        if stats.get('notes_extracted', 0) < base.get('notes_extracted', 0):
+            regressions.append(
+                f"{name}.notes_extracted: {base['notes_extracted']} -> {stats['notes_extracted']}"
+            )
+
+    return regressions
+
+
+def print_results(results: Dict[str, Dict[str, Any]]):
+    """打印结果表格"""
+    header = f"{'方法':<30}{'p50(ms)':>10}{'p90(ms)':>10}{'p99(ms)':>10}{'峰值RSS(KB)':>14}{'笔记数':>8}"
+    print(header)
+    print("-" * 82)
+    for name, stats in results.items():
+        peak_rss = stats['peak_rss_kb'] if stats['peak_rss_kb'] is not None else '-'
+        print(f"{name:<30}{stats['p50_ms']:>10}{stats['p90_ms']:>10}{stats['p99_ms']:>10}"
+              f"{peak_rss:>14}{stats['notes_extracted']:>8}")
+
+
+def main() -> int:
+    """主函数"""
+    arg_parser = argparse.ArgumentParser(description="解析器基准测试")
+    arg_parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="录制搜索页的glob模式")
+    arg_parser.add_argument("--detail-corpus", default=DEFAULT_DETAIL_CORPUS, help="录制详情页的glob模式")
+    arg_parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="基线JSON文件路径")
+    arg_parser.add_argument("--save-baseline", action="store_true", help="将本次结果保存为基线")
+    arg_parser.add_argument("--max-regression", type=float, default=0.2,
+                            help="允许的最大退化比例，默认0.2（20%%）")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="每页重复次数")
+    arg_parser.add_argument("--method", action="append", help="只测试指定方法（可重复）")
+    args = arg_parser.parse_args()
+
+    patterns = {'search': args.corpus, 'detail': args.detail_corpus}
+    corpora = {kind: load_corpus(pattern) for kind, pattern in patterns.items()}
+    if not corpora['search']:
+        print(f"未找到录制页面: {args.corpus}")
+        return 1
+
+    for kind, pages in corpora.items():
+        print(f"加载 {len(pages)} 个{kind}页面，共 {sum(len(p[2]) for p in pages) / 1024 / 1024:.1f} MB")
+    if _max_rss_kb() is None:
+        print("当前平台不支持统计峰值内存")
+
+    methods = build_methods(create_parser())
+    if args.method:
+        methods = {name: method for name, method in methods.items() if name in args.method}
+
+    results = {}
+    for name, (kind, func) in methods.items():
+        if not corpora[kind]:
+            print(f"跳过 {name}: 没有录制的{kind}页面（{patterns[kind]}）")
+            continue
+        results[name] = benchmark_method(func, corpora[kind], repeat=args.repeat,
+                                         name=name, pattern=patterns[kind])
+
+    print_results(results)
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        safe_json_dump({
+            'created_at': format_timestamp(),
+            'python': platform.python_version(),
+            'pages': {kind: len(pages) for kind, pages in corpora.items()},
+            'methods': results,
+        }, baseline_path)
+        print(f"\n基线已保存到: {baseline_path}")
+        return 0
+
+    baseline = safe_json_load(baseline_path)
+    if not baseline:
+        print(f"\n未找到基线文件: {baseline_path}，使用 --save-baseline 生成")
+        return 0
+
+    regressions = compare_with_baseline(results, baseline, args.max_regression)
+    if regressions:
+        print(f"\n❌ 性能退化超过 {args.max_regression * 100:.0f}%:")
+        for item in regressions:
+            print(f"  - {item}")
+        return 1
+
+    print("\n✅ 与基线相比无性能退化")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+资源拦截对比脚本
+分别在不同拦截配置下访问同一组页面，对比平均传输量和加载时间
+"""
+
+import sys
+import argparse
+import urllib.parse
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from config.settings import CRAWLER_SETTINGS, SELENIUM_SETTINGS
+from src.crawler.resource_blocking import BLOCKING_PROFILES
+from src.crawler.selenium_handler import SeleniumHandler
+
+
+def default_urls():
+    """默认使用配置中的搜索关键词页面"""
+    return [
+        f"https://www.xiaohongshu.com/search_result?keyword={urllib.parse.quote(keyword)}"
+        for keyword in CRAWLER_SETTINGS["search_keywords"]
+    ]
+
+
+def run_profile(profile: str, urls, headless: bool):
+    """使用指定配置访问所有页面，返回指标报告（每个配置使用全新的用户目录，避免前一个配置留下的缓存）"""
+    handler = SeleniumHandler(browser='chrome', headless=headless, blocking_profile=profile,
+                              persistent_profile=False)
+    if not handler.initialize():
+        return None
+
+    try:
+        handler.login_with_cookies()
+        for url in urls:
+            handler.get_page(url, wait_selector=".feeds-container", max_retries=1)
+            # 配置中关闭了自动记录时，单独记录每个页面
+            if not SELENIUM_SETTINGS.get("record_page_metrics"):
+                handler.record_page_metrics()
+        return handler.page_metrics.report()
+    finally:
+        handler.close()
+
+
+def main() -> int:
+    """主函数"""
+    arg_parser = argparse.ArgumentParser(description="对比资源拦截配置的传输量和加载时间")
+    arg_parser.add_argument("--url", action="append", help="要访问的页面（可重复），默认使用搜索关键词页面")
+    arg_parser.add_argument("--profile", action="append", choices=list(BLOCKING_PROFILES),
+                            help="要对比的拦截配置（可重复），默认为off和scrape")
+    arg_parser.add_argument("--show-browser", action="store_true", help="显示浏览器界面")
+    args = arg_parser.parse_args()
+
+    urls = args.url or default_urls()
+    profiles = args.profile or ['off', 'scrape']
+
+    reports = {}
+    for profile in profiles:
+        print(f"使用拦截配置 {profile} 访问 {len(urls)} 个页面...")
+        report = run_profile(profile, urls, headless=not args.show_browser)
+        if report:
+            reports[profile] = report
+
+    if not reports:
+        print("浏览器初始化失败")
+        return 1
+
+    print(f"\n{'配置':<10}{'页面数':>8}{'平均传输(KB)':>14}{'平均加载(ms)':>14}{'平均资源数':>12}")
+    print("-" * 58)
+    for profile, report in reports.items():
+        print(f"{profile:<10}{report['pages']:>8}{report['avg_transfer_kb']:>14}"
+              f"{report['avg_load_ms']:>14}{report['avg_resources']:>12}")
+
+    baseline = reports.get('off')
+    if baseline and baseline['avg_transfer_kb']:
+        for profile, report in reports.items():
+            if profile == 'off':
+                continue
+            saved = 1 - report['avg_transfer_kb'] / baseline['avg_transfer_kb']
+            print(f"\n{profile} 相比 off 节省传输量 {saved * 100:.1f}%")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+批量解析归档页面脚本
+使用进程池重新解析保存的HTML页面，结果写入JSONL
+"""
+
+import sys
+import glob
+import time
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.crawler.bulk_parser import PARSE_KINDS, parse_many
+
+
+def main() -> int:
+    """主函数"""
+    arg_parser = argparse.ArgumentParser(description="批量解析归档页面")
+    arg_parser.add_argument("pattern", help="页面文件的glob模式，例如 debug_pages/search_*.html")
+    arg_parser.add_argument("--kind", default="search", choices=PARSE_KINDS, help="解析类型")
+    arg_parser.add_argument("--output", default=str(project_root / "data" / "raw" / "parsed.jsonl"),
+                            help="JSONL输出路径")
+    arg_parser.add_argument("--workers", type=int, default=None, help="进程数，默认为CPU核数")
+    arg_parser.add_argument("--chunksize", type=int, default=8, help="每次分发的任务数")
+    arg_parser.add_argument("--unordered", action="store_true", help="按完成顺序输出")
+    args = arg_parser.parse_args()
+
+    files = sorted(glob.glob(args.pattern))
+    if not files:
+        print(f"未找到页面文件: {args.pattern}")
+        return 1
+
+    start = time.perf_counter()
+    total = failed = 0
+    for record in parse_many(files, kind=args.kind, workers=args.workers, chunksize=args.chunksize,
+                             ordered=not args.unordered, output_path=args.output):
+        total += 1
+        if not record['ok']:
+            failed += 1
+            print(f"解析失败: {record['source']}: {record['error']}")
+
+    elapsed = time.perf_counter() - start
+    print(f"解析 {total} 个页面，失败 {failed} 个，用时 {elapsed:.2f} 秒，结果: {args.output}")
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
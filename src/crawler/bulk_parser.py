@@ -0,0 +1,147 @@
+"""
+批量解析模块
+使用进程池并行解析大量归档HTML页面，结果以流式方式返回并可写入JSONL
+"""
+
+import os
+import re
+import json
+import time
+import logging
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+
+PARSE_KINDS = ('search', 'search_simple', 'detail')
+NOTE_ID_PATTERN = re.compile(r'([a-f0-9]{24})')
+
+# 每个工作进程复用的解析器实例
+_worker_parser = None
+
+
+def _init_worker(search_engine: Optional[str] = None):
+    """工作进程初始化：只创建一次解析器，避免每页重复初始化日志和正则"""
+    global _worker_parser
+    from src.crawler.parser import XHSParser
+
+    # 批量模式下每页只解析一次，不需要缓存
+    _worker_parser = XHSParser(search_engine=search_engine, cache_size=0)
+    _worker_parser.logger.setLevel(logging.WARNING)
+
+
+def is_path_source(source: Union[str, Path]) -> bool:
+    """判断输入是文件路径还是页面源码"""
+    if isinstance(source, Path):
+        return True
+    if not source or len(source) > 4096 or source.lstrip().startswith('<'):
+        return False
+    return os.path.isfile(source)
+
+
+def keyword_from_filename(path: Union[str, Path]) -> str:
+    """从 search_{keyword}_{timestamp}.html 格式的文件名中提取关键词"""
+    parts = Path(path).stem.split('_')
+    return '_'.join(parts[1:-1]) if len(parts) >= 3 else ''
+
+
+def _parse_task(task: Tuple[int, Union[str, Path], str, Optional[str]]) -> Dict[str, Any]:
+    """
+    工作进程中执行的单个解析任务
+
+    Args:
+        task: (序号, 路径或源码, 解析类型, 关键词或笔记URL)
+
+    Returns:
+        结果记录
+    """
+    index, source, kind, extra = task
+    from_path = is_path_source(source)
+    record = {
+        'index': index,
+        'source': str(source) if from_path else f"<page:{len(source)}>",
+        'kind': kind,
+    }
+
+    start = time.perf_counter()
+    try:
+        if from_path:
+            with open(source, 'r', encoding='utf-8') as f:
+                page_source = f.read()
+        else:
+            page_source = source
+
+        if kind == 'detail':
+            note_url = extra
+            if note_url is None and from_path:
+                # 文件名中含笔记ID时据此还原URL
+                match = NOTE_ID_PATTERN.search(Path(source).stem)
+                note_url = f"https://www.xiaohongshu.com/explore/{match.group(1)}" if match else ''
+            record['result'] = _worker_parser.parse_note_detail_direct(page_source, note_url or '')
+        else:
+            keyword = extra if extra is not None else (keyword_from_filename(source) if from_path else '')
+            if kind == 'search_simple':
+                record['result'] = _worker_parser.parse_search_results_simple(page_source, keyword)
+            else:
+                record['result'] = _worker_parser.parse_search_results_direct(page_source, keyword)
+        record['ok'] = True
+    except Exception as e:
+        record['ok'] = False
+        record['error'] = str(e)
+
+    record['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 3)
+    return record
+
+
+def parse_many(
+    sources: Iterable[Union[str, Path]],
+    kind: str = 'search',
+    keyword: Optional[str] = None,
+    note_url: Optional[str] = None,
+    workers: Optional[int] = None,
+    chunksize: int = 8,
+    ordered: bool = True,
+    output_path: Optional[Union[str, Path]] = None,
+    search_engine: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    使用进程池批量解析页面
+
+    Args:
+        sources: 文件路径或页面源码的可迭代对象
+        kind: 解析类型：search, search_simple, detail
+        keyword: 搜索关键词，为None时从文件名中提取
+        note_url: 详情页URL（仅detail类型使用），为None时从文件名中的笔记ID还原
+        workers: 进程数，默认为CPU核数
+        chunksize: 每次分发给工作进程的任务数
+        ordered: 是否按输入顺序返回结果
+        output_path: JSONL输出路径，为None时不写文件
+        search_engine: 搜索结果解析引擎
+
+    Yields:
+        结果记录：index, source, kind, ok, result/error, elapsed_ms
+    """
+    if kind not in PARSE_KINDS:
+        raise ValueError(f"不支持的解析类型: {kind}")
+
+    extra = note_url if kind == 'detail' else keyword
+    tasks = ((index, source, kind, extra) for index, source in enumerate(sources))
+
+    output_file = None
+    if output_path:
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_file = open(output_path, 'w', encoding='utf-8')
+
+    try:
+        with Pool(processes=workers or os.cpu_count() or 1,
+                  initializer=_init_worker, initargs=(search_engine,)) as pool:
+            mapper = pool.imap if ordered else pool.imap_unordered
+            for record in mapper(_parse_task, tasks, chunksize=max(1, chunksize)):
+                if output_file:
+                    output_file.write(json.dumps(record, ensure_ascii=False) + '\n')
+                yield record
+    finally:
+        if output_file:
+            output_file.close()
+
@@ -0,0 +1,147 @@
+"""
+图片下载引擎模块
+有界线程池并发下载图片，按主机限制同时进行的下载数，
+一个连环画的图片批量提交，总耗时约等于最慢的一张；
+多个工作线程同时保存连环画时，各批次共享线程池和主机并发上限；
+启动时清理上次异常退出留下的下载临时文件
+"""
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlparse
+
+from config.settings import CRAWLER_SETTINGS
+from src.crawler.request_handler import PARTIAL_PREFIX, PARTIAL_SUFFIX
+from src.utils.logger import setup_logger
+
+
+def sweep_partial_downloads(root: Union[str, Path]) -> int:
+    """
+    删除目录下残留的下载临时文件（下载过程中进程被终止时留下）
+
+    Args:
+        root: 下载目标的根目录，递归查找
+
+    Returns:
+        删除的文件数
+    """
+    removed = 0
+    for path in Path(root).rglob(f"{PARTIAL_PREFIX}*{PARTIAL_SUFFIX}"):
+        try:
+            path.unlink()
+            removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+class DownloadEngine:
+    """并发图片下载引擎"""
+
+    def __init__(self, request_handler, max_workers: Optional[int] = None, per_host: Optional[int] = None,
+                 download_root: Optional[Union[str, Path]] = None):
+        """
+        初始化下载引擎
+
+        Args:
+            request_handler: RequestHandler实例（共享session和连接池）
+            max_workers: 下载线程数，为None时使用配置中的设置
+            per_host: 同一主机同时进行的下载数上限，为None时使用配置中的设置
+            download_root: 下载目标的根目录，启动时清理其中残留的临时文件
+        """
+        self.request_handler = request_handler
+        self.max_workers = max(1, max_workers or CRAWLER_SETTINGS.get("download_workers", 6))
+        self.per_host = max(1, per_host or CRAWLER_SETTINGS.get("download_per_host", 4))
+        self.logger = setup_logger("download_engine")
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="image-download")
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            'batches': 0,
+            'images': 0,
+            'failed': 0,
+            'bytes': 0,
+            'download_seconds': 0.0,  # 各图片耗时之和（顺序下载的耗时）
+            'wall_seconds': 0.0,      # 批量下载的实际耗时
+            'swept_partials': 0,      # 启动时清理的残留临时文件数
+        }
+
+        if download_root and Path(download_root).exists():
+            self.stats['swept_partials'] = sweep_partial_downloads(download_root)
+            if self.stats['swept_partials']:
+                self.logger.info(f"清理了 {self.stats['swept_partials']} 个残留的下载临时文件")
+
+    def _slot(self, url: str) -> threading.BoundedSemaphore:
+        """获取主机的并发槽位"""
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_slots[host]
+
+    def _download(self, url: str, save_path: str) -> Dict[str, Any]:
+        """下载单张图片并记录耗时"""
+        result = {'url': url, 'path': save_path, 'success': False, 'message': '', 'seconds': 0.0,
+                  'bytes': 0, 'md5': ''}
+        with self._slot(url):
+            start = time.perf_counter()
+            try:
+                # CDN图片使用单独的限速预算，并发由主机槽位控制
+                result.update(self.request_handler.stream_download(url, save_path))
+            except Exception as e:
+                result['message'] = f"下载图片失败: {e}"
+            result['seconds'] = round(time.perf_counter() - start, 3)
+        return result
+
+    def download_batch(self, jobs: Sequence[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        并发下载一批图片
+
+        Args:
+            jobs: (图片URL, 保存路径)列表
+
+        Returns:
+            与jobs顺序一致的结果列表：{'url', 'path', 'success', 'message', 'seconds', 'bytes', 'md5'}
+        """
+        if not jobs:
+            return []
+
+        start = time.perf_counter()
+        futures = [self._executor.submit(self._download, url, str(path)) for url, path in jobs]
+        results = []
+        for (url, path), future in zip(jobs, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append({'url': url, 'path': str(path), 'success': False,
+                                'message': str(e), 'seconds': 0.0, 'bytes': 0, 'md5': ''})
+        wall = time.perf_counter() - start
+
+        with self._lock:
+            self.stats['batches'] += 1
+            self.stats['images'] += len(results)
+            self.stats['failed'] += sum(1 for result in results if not result['success'])
+            self.stats['bytes'] += sum(result['bytes'] for result in results)
+            self.stats['download_seconds'] += sum(result['seconds'] for result in results)
+            self.stats['wall_seconds'] += wall
+
+        slowest = max(result['seconds'] for result in results)
+        self.logger.info(f"批量下载 {len(results)} 张图片，耗时 {wall:.2f} 秒（最慢一张 {slowest:.2f} 秒）")
+        return results
+
+    def report(self) -> Dict[str, Any]:
+        """下载统计"""
+        with self._lock:
+            return {
+                **self.stats,
+                'download_seconds': round(self.stats['download_seconds'], 2),
+                'wall_seconds': round(self.stats['wall_seconds'], 2),
+            }
+
+    def close(self):
+        """关闭线程池"""
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,179 @@
+"""
+浏览器工作池模块
+多个SeleniumHandler从共享队列领取任务，每个浏览器单独控制访问节奏
+"""
+
+import time
+import queue
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.crawler.selenium_handler import SeleniumHandler
+from src.utils.logger import setup_logger
+
+
+class DriverPool:
+    """浏览器工作池"""
+
+    def __init__(self, size: int = 3, headless: bool = False, min_interval: float = 3.0,
+                 jitter: float = 2.0, login: bool = True,
+                 handler_factory: Optional[Callable[[], SeleniumHandler]] = None):
+        """
+        初始化工作池
+
+        Args:
+            size: 浏览器数量
+            headless: 是否无头模式
+            min_interval: 同一个浏览器两次任务开始之间的最小间隔（秒）
+            jitter: 在最小间隔之上追加的随机间隔上限（秒）
+            login: 启动后是否使用共享的cookie文件登录
+            handler_factory: 创建SeleniumHandler的函数（默认为Chrome）
+        """
+        self.size = max(1, size)
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self.login = login
+        self.handler_factory = handler_factory or (
+            # 持久化用户目录只能被一个浏览器使用，工作池中的浏览器使用临时目录
+            lambda: SeleniumHandler(browser='chrome', headless=headless, user_data_dir=None,
+                                    persistent_profile=False)
+        )
+        self.handlers: List[SeleniumHandler] = []
+        self.logger = setup_logger("driver_pool")
+
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Any] = {
+            'processed': 0,
+            'failed': 0,
+            'pacing_wait_seconds': 0.0,
+            'workers': {},
+        }
+
+    def start(self) -> int:
+        """
+        并行启动所有浏览器
+
+        Returns:
+            成功启动的浏览器数量
+        """
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            handlers = list(executor.map(self._start_handler, range(self.size)))
+
+        self.handlers = [handler for handler in handlers if handler is not None]
+        self.logger.info(f"浏览器工作池启动 {len(self.handlers)}/{self.size} 个浏览器")
+        return len(self.handlers)
+
+    def _start_handler(self, index: int) -> Optional[SeleniumHandler]:
+        """启动单个浏览器，cookie从共享文件加载"""
+        handler = self.handler_factory()
+        try:
+            if not handler.initialize():
+                self.logger.warning(f"浏览器 {index} 初始化失败")
+                return None
+            if self.login and not handler.login_with_cookies():
+                self.logger.warning(f"浏览器 {index} 未能通过cookie登录，继续以未登录状态工作")
+            return handler
+        except Exception as e:
+            self.logger.error(f"浏览器 {index} 启动失败: {e}")
+            handler.close()
+            return None
+
+    def run(self, items: Iterable[Any], task: Callable[[SeleniumHandler, Any], Any],
+            should_stop: Optional[Callable[[], bool]] = None) -> List[Tuple[Any, Any]]:
+        """
+        并发处理队列中的任务
+
+        Args:
+            items: 任务列表（如笔记信息）
+            task: 任务函数，参数为(浏览器, 任务)
+            should_stop: 返回True时各浏览器不再领取新任务
+
+        Returns:
+            (任务, 结果)列表，按完成顺序排列；失败的任务不在其中
+        """
+        if not self.handlers:
+            raise RuntimeError("浏览器工作池未启动")
+
+        work = queue.Queue()
+        for item in items:
+            work.put(item)
+
+        results: List[Tuple[Any, Any]] = []
+        threads = [
+            threading.Thread(
+                target=self._worker,
+                args=(index, handler, work, task, should_stop, results),
+                name=f"driver-worker-{index}",
+                daemon=True,
+            )
+            for index, handler in enumerate(self.handlers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return results
+
+    def _worker(self, index: int, handler: SeleniumHandler, work: queue.Queue,
+                task: Callable[[SeleniumHandler, Any], Any],
+                should_stop: Optional[Callable[[], bool]], results: List[Tuple[Any, Any]]):
+        """工作线程：领取任务并按节奏执行"""
+        worker_stats = {'processed': 0, 'failed': 0, 'busy_seconds': 0.0}
+        with self._lock:
+            self.stats['workers'][index] = worker_stats
+
+        # 错开各浏览器的第一次访问
+        next_start = time.monotonic() + index * self.min_interval / len(self.handlers)
+
+        while not (should_stop and should_stop()):
+            try:
+                item = work.get_nowait()
+            except queue.Empty:
+                break
+
+            wait = next_start - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+                with self._lock:
+                    self.stats['pacing_wait_seconds'] += wait
+
+            started = time.monotonic()
+            next_start = started + self.min_interval + random.uniform(0, self.jitter)
+
+            try:
+                result = task(handler, item)
+                with self._lock:
+                    results.append((item, result))
+                    self.stats['processed'] += 1
+                    worker_stats['processed'] += 1
+            except Exception as e:
+                self.logger.error(f"浏览器 {index} 处理任务失败: {e}")
+                with self._lock:
+                    self.stats['failed'] += 1
+                    worker_stats['failed'] += 1
+            finally:
+                worker_stats['busy_seconds'] += time.monotonic() - started
+                work.task_done()
+
+    def report(self) -> Dict[str, Any]:
+        """工作池统计"""
+        with self._lock:
+            return {
+                'size': len(self.handlers),
+                'processed': self.stats['processed'],
+                'failed': self.stats['failed'],
+                'pacing_wait_seconds': round(self.stats['pacing_wait_seconds'], 2),
+                'workers': {
+                    index: {**stats, 'busy_seconds': round(stats['busy_seconds'], 2)}
+                    for index, stats in self.stats['workers'].items()
+                },
+            }
+
+    def close(self):
+        """关闭所有浏览器"""
+        for handler in self.handlers:
+            handler.close()
+        self.handlers = []
@@ -0,0 +1,225 @@
+"""
+字段收集器模块
+按声明式字段规则，单次迭代遍历JSON数据收集全部目标字段，并记录每个值的来源路径
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def _image_from_dict(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """识别图片节点：含urlDefault或HTTP地址url的字典"""
+    url = data.get('urlDefault') or data.get('url_default')
+    if not url:
+        url = data.get('url')
+        if not url or not ('http' in str(url) or '//' in str(url)):
+            return None
+
+    return {
+        'url': url,
+        'width': data.get('width', 0),
+        'height': data.get('height', 0),
+        'caption': data.get('desc', '') or data.get('title', ''),
+    }
+
+
+def _tag_from_dict(data: Dict[str, Any]) -> Optional[str]:
+    """识别标签节点：含字符串name的字典"""
+    name = data.get('name')
+    return name if isinstance(name, str) else None
+
+
+def _tag_from_str(data: str) -> Optional[str]:
+    """识别#开头的标签字符串"""
+    return data[1:] if data.startswith('#') else None
+
+
+# 用户信息所在的子树键名
+USER_SCOPE = ('user', 'author', 'userInfo')
+
+# 笔记字段规则
+# first: 取遍历中第一个命中keys的非空值，指定within时只在这些键名下的子树中查找
+# collect: 收集所有被match识别的节点，stop为True时不再深入该节点，指定outside时跳过这些键名下的子树
+# 标签和用户节点都带有name键，因此title不使用name，username只在用户子树中查找，tags不在用户子树中收集
+NOTE_FIELD_SPECS: Dict[str, Dict[str, Any]] = {
+    'note_id': {'mode': 'first', 'keys': ('id', 'noteId', 'note_id')},
+    'title': {'mode': 'first', 'keys': ('title', 'noteTitle')},
+    'content': {'mode': 'first', 'keys': ('desc', 'content', 'description', 'noteDesc')},
+    'username': {'mode': 'first', 'keys': ('nickname', 'nickName', 'name', 'username'),
+                 'within': USER_SCOPE},
+    'likes': {'mode': 'first', 'keys': ('likes', 'likeCount', 'likedCount', 'liked_count', 'favCount')},
+    'images': {'mode': 'collect', 'match_dict': _image_from_dict, 'stop': True},
+    'tags': {'mode': 'collect', 'match_dict': _tag_from_dict, 'match_str': _tag_from_str, 'stop': True,
+             'outside': USER_SCOPE},
+}
+
+
+def format_path(path: Tuple[Any, ...]) -> str:
+    """将路径元组格式化为 a.b[0].c 形式"""
+    parts = []
+    for key in path:
+        if isinstance(key, int):
+            parts.append(f"[{key}]")
+        else:
+            parts.append(f".{key}" if parts else str(key))
+    return ''.join(parts)
+
+
+class FieldCollector:
+    """声明式字段收集器"""
+
+    def __init__(self, specs: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        初始化收集器
+
+        Args:
+            specs: 字段规则，默认为笔记字段规则
+        """
+        self.specs = specs or NOTE_FIELD_SPECS
+        self._scopes: Dict[str, Tuple[str, ...]] = {
+            field: tuple(spec['within']) for field, spec in self.specs.items() if spec.get('within')
+        }
+        self._excluded: Dict[str, Tuple[str, ...]] = {
+            field: tuple(spec['outside']) for field, spec in self.specs.items() if spec.get('outside')
+        }
+
+        # 预先建立 键名 -> 字段 的索引，遍历时只需一次字典查找
+        self._key_index: Dict[str, List[str]] = {}
+        for field, spec in self.specs.items():
+            if spec['mode'] == 'first':
+                for key in spec['keys']:
+                    self._key_index.setdefault(key, []).append(field)
+
+        self._dict_matchers: List[Tuple[str, Callable, bool]] = [
+            (field, spec['match_dict'], spec.get('stop', False))
+            for field, spec in self.specs.items()
+            if spec['mode'] == 'collect' and spec.get('match_dict')
+        ]
+        self._str_matchers: List[Tuple[str, Callable]] = [
+            (field, spec['match_str'])
+            for field, spec in self.specs.items()
+            if spec['mode'] == 'collect' and spec.get('match_str')
+        ]
+
+    def collect(self, data: Any, root_path: Tuple[Any, ...] = ()) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        单次遍历收集所有字段
+
+        同一层字典中的键先于其子节点被检查，因此较浅的字段优先。
+
+        Args:
+            data: JSON数据
+            root_path: data在原始数据中的路径
+
+        Returns:
+            (字段值字典, 字段来源路径字典)；first字段的路径为字符串，collect字段为路径列表
+        """
+        values: Dict[str, Any] = {}
+        paths: Dict[str, Any] = {}
+        for field, spec in self.specs.items():
+            if spec['mode'] == 'collect':
+                values[field] = []
+                paths[field] = []
+
+        pending_first = sum(1 for spec in self.specs.values() if spec['mode'] == 'first')
+
+        # 栈元素: (节点, 键, 父元素)，路径在命中时才回溯生成
+        root_entry = (data, None, None)
+        stack = [root_entry]
+
+        def build_path(entry, key=None) -> str:
+            keys = [] if key is None else [key]
+            while entry is not None and entry[2] is not None:
+                keys.append(entry[1])
+                entry = entry[2]
+            return format_path(root_path + tuple(reversed(keys)))
+
+        def in_scope(entry, scope) -> bool:
+            while entry is not None and entry[2] is not None:
+                if entry[1] in scope:
+                    return True
+                entry = entry[2]
+            return bool(root_path) and root_path[-1] in scope
+
+        while stack:
+            entry = stack.pop()
+            node = entry[0]
+
+            if isinstance(node, dict):
+                stop = False
+                for field, matcher, stop_on_match in self._dict_matchers:
+                    item = matcher(node)
+                    if item is None or (field in self._excluded and in_scope(entry, self._excluded[field])):
+                        continue
+                    values[field].append(item)
+                    paths[field].append(build_path(entry))
+                    stop = stop or stop_on_match
+
+                if pending_first:
+                    for key, value in node.items():
+                        fields = self._key_index.get(key)
+                        if not fields or value is None:
+                            continue
+                        for field in fields:
+                            if field in values:
+                                continue
+                            if field in self._scopes and not in_scope(entry, self._scopes[field]):
+                                continue
+                            values[field] = value
+                            paths[field] = build_path(entry, key)
+                            pending_first -= 1
+
+                if stop:
+                    continue
+
+                children = [(value, key, entry) for key, value in node.items()
+                            if isinstance(value, (dict, list, str))]
+                stack.extend(reversed(children))
+
+            elif isinstance(node, list):
+                children = [(value, index, entry) for index, value in enumerate(node)
+                            if isinstance(value, (dict, list, str))]
+                stack.extend(reversed(children))
+
+            elif isinstance(node, str) and self._str_matchers:
+                for field, matcher in self._str_matchers:
+                    item = matcher(node)
+                    if item is None or (field in self._excluded and in_scope(entry, self._excluded[field])):
+                        continue
+                    values[field].append(item)
+                    paths[field].append(build_path(entry))
+
+        return values, paths
+
+
+def find_note_subtree(state: Dict[str, Any]) -> Tuple[Any, Tuple[Any, ...]]:
+    """
+    在页面状态中定位笔记详情子树
+
+    Args:
+        state: window.__INITIAL_STATE__字典
+
+    Returns:
+        (子树, 子树路径)；找不到时返回整个状态和空路径
+    """
+    note_state = state.get('note') if isinstance(state, dict) else None
+    if not isinstance(note_state, dict):
+        return state, ()
+
+    detail_map = note_state.get('noteDetailMap')
+    if not isinstance(detail_map, dict):
+        return state, ()
+
+    # 优先使用当前笔记，其次是任意有内容的笔记
+    candidates = []
+    for key in ('currentNoteId', 'firstNoteId'):
+        note_id = note_state.get(key)
+        if note_id and note_id in detail_map:
+            candidates.append(note_id)
+    candidates.extend(key for key in detail_map if key not in candidates)
+
+    for note_id in candidates:
+        detail = detail_map.get(note_id)
+        if isinstance(detail, dict) and isinstance(detail.get('note'), dict) and detail['note']:
+            return detail['note'], ('note', 'noteDetailMap', note_id, 'note')
+
+    return state, ()
@@ -0,0 +1,260 @@
+"""
+HTTP响应缓存模块
+按规范化URL把响应体存到磁盘，并记录ETag/Last-Modified；
+有效期内直接使用缓存，过期后发送条件请求验证，总大小超过上限时按最近最少使用淘汰；
+索引每保存若干个响应写入一次，启动时删除索引中没有的响应体（如上次异常退出前写入的）
+"""
+
+import os
+import time
+import shutil
+import tempfile
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from src.utils.helper import safe_json_dump, safe_json_load
+
+logger = logging.getLogger(__name__)
+
+# 随缓存保存的响应头
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+def normalize_url(url: str) -> str:
+    """
+    规范化URL作为缓存键：协议和主机小写，去掉片段，查询参数排序
+
+    Args:
+        url: 完整URL（含查询参数）
+
+    Returns:
+        规范化后的URL
+    """
+    parsed = urlparse(url)
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    return urlunparse((parsed.scheme.lower(), parsed.netloc.lower(), parsed.path or '/', '', query, ''))
+
+
+class HTTPCache:
+    """磁盘HTTP响应缓存"""
+
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, cache_dir: Union[str, Path], ttl_seconds: float = 86400, max_bytes: int = 512 * 1024 * 1024,
+                 save_every: int = 20):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 缓存目录
+            ttl_seconds: 缓存有效期，过期后需要条件请求验证
+            max_bytes: 响应体总大小上限
+            save_every: 每保存多少个响应写入一次索引
+        """
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.save_every = max(1, save_every)
+        self._unsaved = 0
+        self.index_path = self.cache_dir / self.INDEX_FILE
+        self._lock = threading.Lock()
+
+        # 键 -> {'url', 'headers', 'size', 'stored_at', 'last_used'}，按最近使用排序
+        index = safe_json_load(self.index_path)
+        entries = index.get('entries', {}) if isinstance(index, dict) else {}
+        self.entries: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict(
+            sorted(entries.items(), key=lambda item: item[1].get('last_used', 0))
+        )
+        self._remove_orphans()
+        self.total_bytes = sum(entry.get('size', 0) for entry in self.entries.values())
+
+        self.stats = {
+            'hits': 0,          # 有效期内直接使用
+            'misses': 0,        # 没有缓存
+            'revalidated': 0,   # 条件请求返回304
+            'refreshed': 0,     # 条件请求返回了新内容
+            'stored': 0,
+            'evicted': 0,
+            'bytes_served': 0,  # 从缓存提供的字节数（省下的下载量）
+        }
+
+    def _remove_orphans(self):
+        """删除索引中没有的响应体，并丢弃响应体已不存在的条目，使总大小与磁盘一致"""
+        known = {self._body_path(key) for key in self.entries}
+        for path in self.cache_dir.glob('*/*'):
+            if path.is_file() and path not in known:
+                path.unlink(missing_ok=True)
+        for key in [key for key in self.entries if not self._body_path(key).exists()]:
+            del self.entries[key]
+
+    def _body_path(self, key: str) -> Path:
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return self.cache_dir / digest[:2] / digest
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        查找缓存条目
+
+        Args:
+            url: 完整URL
+
+        Returns:
+            缓存条目（含'key'和'fresh'），没有缓存时返回None
+        """
+        key = normalize_url(url)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None or not self._body_path(key).exists():
+                self.stats['misses'] += 1
+                return None
+            fresh = time.time() - entry['stored_at'] < self.ttl_seconds
+            return {**entry, 'key': key, 'fresh': fresh}
+
+    @staticmethod
+    def conditional_headers(entry: Dict[str, Any]) -> Dict[str, str]:
+        """条件请求头"""
+        headers = {}
+        if entry['headers'].get('ETag'):
+            headers['If-None-Match'] = entry['headers']['ETag']
+        if entry['headers'].get('Last-Modified'):
+            headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+        return headers
+
+    def response(self, entry: Dict[str, Any], revalidated: bool = False) -> requests.Response:
+        """
+        用缓存条目构造响应对象，响应体从磁盘流式读取
+
+        Args:
+            entry: lookup()返回的条目
+            revalidated: 是否是条件请求验证后使用
+
+        Returns:
+            状态码为200的Response，from_cache属性为True
+        """
+        key = entry['key']
+        with self._lock:
+            self.stats['revalidated' if revalidated else 'hits'] += 1
+            self.stats['bytes_served'] += entry['size']
+            if key in self.entries:
+                self.entries[key]['last_used'] = time.time()
+                if revalidated:
+                    self.entries[key]['stored_at'] = time.time()
+                self.entries.move_to_end(key)
+
+        response = requests.Response()
+        response.status_code = 200
+        response.url = entry['url']
+        response.headers = CaseInsensitiveDict({**entry['headers'], 'Content-Length': str(entry['size'])})
+        response.raw = open(self._body_path(key), 'rb')
+        response.reason = 'OK'
+        response.from_cache = True
+        return response
+
+    def store(self, url: str, body: bytes, headers) -> bool:
+        """
+        保存响应体
+
+        Args:
+            url: 完整URL
+            body: 响应体
+            headers: 响应头
+
+        Returns:
+            是否保存
+        """
+        return self._store(url, headers, lambda path: path.write_bytes(body))
+
+    def store_file(self, url: str, path: Union[str, Path], headers) -> bool:
+        """
+        保存已经写入磁盘的响应体（流式下载的文件）
+
+        Args:
+            url: 完整URL
+            path: 响应体文件
+            headers: 响应头
+
+        Returns:
+            是否保存
+        """
+        return self._store(url, headers, lambda target: shutil.copyfile(path, target))
+
+    def _store(self, url: str, headers, write) -> bool:
+        """写入响应体并更新索引"""
+        if 'no-store' in (headers.get('Cache-Control') or '').lower():
+            return False
+
+        key = normalize_url(url)
+        body_path = self._body_path(key)
+        # 先写临时文件再原子替换，正在读取旧响应体的线程不受影响；
+        # 异常退出残留的临时文件不在索引中，下次启动时被清理
+        temp_path = None
+        try:
+            body_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(prefix='.store-', dir=body_path.parent)
+            os.close(fd)
+            write(Path(temp_path))
+        except OSError as e:
+            logger.debug(f"写入缓存失败: {e}")
+            if temp_path:
+                Path(temp_path).unlink(missing_ok=True)
+            return False
+
+        with self._lock:
+            try:
+                os.replace(temp_path, body_path)
+            except OSError as e:
+                logger.debug(f"写入缓存失败: {e}")
+                Path(temp_path).unlink(missing_ok=True)
+                return False
+
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)['size']
+                self.stats['refreshed'] += 1
+
+            size = body_path.stat().st_size
+            self.entries[key] = {
+                'url': url,
+                'headers': {name: headers[name] for name in STORED_HEADERS if headers.get(name)},
+                'size': size,
+                'stored_at': time.time(),
+                'last_used': time.time(),
+            }
+            self.total_bytes += size
+            self.stats['stored'] += 1
+            self._evict()
+
+            self._unsaved += 1
+            if self._unsaved >= self.save_every:
+                self._save_index()
+        return True
+
+    def _evict(self):
+        """超出大小上限时淘汰最近最少使用的条目"""
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            key, entry = self.entries.popitem(last=False)
+            self._body_path(key).unlink(missing_ok=True)
+            self.total_bytes -= entry['size']
+            self.stats['evicted'] += 1
+
+    def save(self) -> bool:
+        """保存索引"""
+        with self._lock:
+            return self._save_index()
+
+    def _save_index(self) -> bool:
+        """写入索引（调用方持有锁）"""
+        self._unsaved = 0
+        return safe_json_dump({'entries': self.entries}, self.index_path)
+
+    def report(self) -> Dict[str, Any]:
+        """缓存统计"""
+        with self._lock:
+            return {**self.stats, 'entries': len(self.entries), 'size_mb': round(self.total_bytes / 1024 / 1024, 1)}
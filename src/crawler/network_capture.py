@@ -0,0 +1,127 @@
+"""
+网络响应捕获模块
+通过Chrome性能日志和DevTools协议获取页面加载过程中接口返回的JSON
+"""
+
+import json
+import base64
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 需要捕获的接口：类型 -> URL片段
+API_PATTERNS = {
+    'search': '/api/sns/web/v1/search/notes',
+    'feed': '/api/sns/web/v1/feed',
+    'homefeed': '/api/sns/web/v1/homefeed',
+}
+
+
+class NetworkCapture:
+    """接口响应捕获器"""
+
+    def __init__(self, driver, patterns: Optional[Dict[str, str]] = None):
+        """
+        初始化捕获器
+
+        Args:
+            driver: 开启了performance日志的Chrome WebDriver
+            patterns: 需要捕获的接口，类型 -> URL片段
+        """
+        self.driver = driver
+        self.patterns = patterns or API_PATTERNS
+        # requestId -> (接口类型, URL)，响应头已到达但body尚未加载完成
+        self._pending: Dict[str, Tuple[str, str]] = {}
+        # 已加载完成但尚未被drain取走的响应：(requestId, 接口类型, URL)
+        self._finished: List[Tuple[str, str, str]] = []
+        self.stats = {'captured': 0, 'failed': 0, 'bytes': 0}
+
+    def enable(self):
+        """开启DevTools网络事件"""
+        self.driver.execute_cdp_cmd('Network.enable', {})
+
+    def reset(self):
+        """丢弃之前的日志，开始捕获新页面"""
+        try:
+            self.driver.get_log('performance')
+        except Exception as e:
+            logger.debug(f"清空性能日志失败: {e}")
+        self._pending.clear()
+        self._finished.clear()
+
+    def match(self, url: str) -> Optional[str]:
+        """返回URL对应的接口类型，不需要捕获时返回None"""
+        for kind, pattern in self.patterns.items():
+            if pattern in url:
+                return kind
+        return None
+
+    def drain(self, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        读取自上次调用以来完成的接口响应
+
+        只读取指定类型的响应body，其他类型的响应留给之后的drain
+
+        Args:
+            kind: 只返回指定类型的接口，为None时返回全部
+
+        Returns:
+            响应列表：{'kind', 'url', 'data'}
+        """
+        responses = []
+
+        try:
+            entries = self.driver.get_log('performance')
+        except Exception as e:
+            logger.debug(f"读取性能日志失败: {e}")
+            entries = []
+
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, TypeError, ValueError):
+                continue
+
+            method = message.get('method')
+            params = message.get('params') or {}
+
+            if method == 'Network.responseReceived':
+                url = (params.get('response') or {}).get('url', '')
+                api_kind = self.match(url)
+                if api_kind:
+                    self._pending[params.get('requestId')] = (api_kind, url)
+
+            elif method == 'Network.loadingFinished' and params.get('requestId') in self._pending:
+                api_kind, url = self._pending.pop(params['requestId'])
+                self._finished.append((params['requestId'], api_kind, url))
+
+        remaining = []
+        for request_id, api_kind, url in self._finished:
+            if kind is not None and kind != api_kind:
+                remaining.append((request_id, api_kind, url))
+                continue
+            data = self._read_body(request_id, url)
+            if data is not None:
+                responses.append({'kind': api_kind, 'url': url, 'data': data})
+        self._finished = remaining
+
+        return responses
+
+    def _read_body(self, request_id: str, url: str) -> Optional[Any]:
+        """通过DevTools读取响应body并解析JSON"""
+        try:
+            result = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+            body = result.get('body', '')
+            if result.get('base64Encoded'):
+                body = base64.b64decode(body).decode('utf-8')
+
+            data = json.loads(body)
+            self.stats['captured'] += 1
+            self.stats['bytes'] += len(body)
+            return data
+
+        except Exception as e:
+            self.stats['failed'] += 1
+            logger.debug(f"读取接口响应失败 {url}: {e}")
+            return None
@@ -0,0 +1,201 @@
+"""
+页面解析缓存模块
+按页面内容哈希缓存解析结果，并提供可在多个检查之间共享的已解析页面对象
+"""
+
+import copy
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Union
+
+from bs4 import BeautifulSoup
+from lxml import html as lxml_html
+
+from src.crawler.state_extractor import extract_initial_state
+
+
+def content_hash(text: str) -> str:
+    """计算页面文本的快速哈希"""
+    return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+
+
+class ParsedPage:
+    """
+    已解析页面
+
+    持有页面文本、URL和内容哈希，DOM树、BeautifulSoup和页面状态按需构建并缓存，
+    供重定向检查、登录检查和解析器共享
+    """
+
+    _NOT_LOADED = object()
+
+    def __init__(self, text: str, url: str = '', digest: Optional[str] = None):
+        self.text = text or ''
+        self.url = url
+        self.digest = digest or content_hash(self.text)
+        self._tree = None
+        self._soup = None
+        self._state = self._NOT_LOADED
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def __contains__(self, keyword: str) -> bool:
+        return keyword in self.text
+
+    @property
+    def tree(self):
+        """lxml DOM树（首次访问时构建）"""
+        if self._tree is None and self.text:
+            self._tree = lxml_html.document_fromstring(self.text)
+        return self._tree
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        """BeautifulSoup对象（首次访问时构建）"""
+        if self._soup is None:
+            self._soup = BeautifulSoup(self.text, 'html.parser')
+        return self._soup
+
+    @property
+    def state(self) -> Optional[Dict[str, Any]]:
+        """window.__INITIAL_STATE__（首次访问时提取）"""
+        if self._state is self._NOT_LOADED:
+            self._state = extract_initial_state(self.text)
+        return self._state
+
+    def find_keyword(self, keywords) -> Optional[str]:
+        """
+        返回页面文本中第一个出现的关键词
+
+        Args:
+            keywords: 关键词列表
+
+        Returns:
+            命中的关键词，未命中返回None
+        """
+        for keyword in keywords:
+            if keyword in self.text:
+                return keyword
+        return None
+
+
+class ParseCache:
+    """按内容哈希的有界LRU解析缓存（线程安全，解析在锁外进行）"""
+
+    def __init__(self, maxsize: int = 32):
+        """
+        初始化缓存
+
+        Args:
+            maxsize: 最多缓存的条目数（页面和解析结果分别计数）
+        """
+        self.maxsize = maxsize
+        self._pages: 'OrderedDict[str, ParsedPage]' = OrderedDict()
+        self._results: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get_page(self, page_source: Union[str, ParsedPage], url: str = '') -> ParsedPage:
+        """
+        获取页面对象，相同内容的页面返回同一个对象
+
+        Args:
+            page_source: 页面源码或已解析页面
+            url: 页面URL
+
+        Returns:
+            ParsedPage实例
+        """
+        if isinstance(page_source, ParsedPage):
+            page = page_source
+        else:
+            digest = content_hash(page_source or '')
+            with self._lock:
+                page = self._pages.get(digest)
+            if page is None:
+                page = ParsedPage(page_source, url, digest)
+            elif url and not page.url:
+                page.url = url
+
+        with self._lock:
+            # 并发时可能已有同内容的页面对象，沿用先放入的那个
+            page = self._pages.setdefault(page.digest, page)
+            self._pages.move_to_end(page.digest)
+            while len(self._pages) > self.maxsize:
+                self._pages.popitem(last=False)
+
+        return page
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        读取缓存结果，未命中时计算并写入
+
+        Args:
+            key: 缓存键
+            compute: 计算函数
+
+        Returns:
+            结果的副本（避免调用方修改缓存内容）
+        """
+        with self._lock:
+            hit = key in self._results
+            if hit:
+                self.hits += 1
+                self._results.move_to_end(key)
+                result = self._results[key]
+            else:
+                self.misses += 1
+        if hit:
+            return copy.deepcopy(result)
+
+        result = compute()
+        with self._lock:
+            self._results[key] = result
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+
+        return copy.deepcopy(result)
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._pages.clear()
+            self._results.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存统计"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total * 100, 2) if total else 0,
+                'cached_pages': len(self._pages),
+                'cached_results': len(self._results),
+            }
+
+
+def memoize_parse(func: Callable) -> Callable:
+    """
+    解析方法缓存装饰器
+
+    被装饰方法的第一个参数为页面源码（或ParsedPage），实例需要有parse_cache属性；
+    相同内容和参数的调用只解析一次
+    """
+
+    @functools.wraps(func)
+    def wrapper(self, page_source, *args, **kwargs):
+        cache: Optional[ParseCache] = getattr(self, 'parse_cache', None)
+        if cache is None:
+            text = page_source.text if isinstance(page_source, ParsedPage) else page_source
+            return func(self, text, *args, **kwargs)
+
+        page = cache.get_page(page_source)
+        key = (func.__name__, page.digest, args, tuple(sorted(kwargs.items())))
+        return cache.get_or_compute(key, lambda: func(self, page.text, *args, **kwargs))
+
+    return wrapper
@@ -0,0 +1,129 @@
+"""
+页面快照模块
+一次导航（或一次DOM变化）内只拉取一次page_source和一次页面状态，供重定向检查、登录检查和解析共享
+"""
+
+from typing import Any, Callable, Dict, Optional
+
+from src.crawler.page_cache import ParsedPage
+
+
+class SnapshotStats:
+    """快照统计：实际拉取与复用的次数和字节数"""
+
+    def __init__(self):
+        self.snapshots = 0       # 创建的快照数（导航或DOM变化周期数）
+        self.fetches = 0         # 实际拉取page_source的次数
+        self.fetched_bytes = 0
+        self.reuses = 0          # 其他消费方复用已拉取源码的次数
+        self.saved_bytes = 0     # 复用省下的传输字节数
+        self.probes = 0          # 实际执行页面状态探测的次数
+        self.probes_reused = 0
+
+    def report(self) -> Dict[str, Any]:
+        """快照统计报告"""
+        return {
+            'snapshots': self.snapshots,
+            'source_fetches': self.fetches,
+            'source_reuses': self.reuses,
+            'fetched_kb': round(self.fetched_bytes / 1024, 1),
+            'saved_kb': round(self.saved_bytes / 1024, 1),
+            'saved_kb_per_page': round(self.saved_bytes / 1024 / self.snapshots, 1) if self.snapshots else 0,
+            'probes': self.probes,
+            'probes_reused': self.probes_reused,
+        }
+
+
+class PageSnapshot:
+    """
+    单个DOM周期内的页面快照
+
+    页面源码和页面状态（登录弹窗、头像、拦截关键词等派生标志）都在首次访问时拉取，
+    之后的访问直接复用；解析树由ParsedPage按需构建。
+    复用按消费方统计：每个消费方第一次使用已拉取的源码时计一次节省，重复读取属性不计
+    """
+
+    _NOT_LOADED = object()
+
+    def __init__(self, driver, epoch: int, prober: Callable[[], Optional[Dict[str, Any]]],
+                 stats: Optional[SnapshotStats] = None):
+        """
+        初始化快照
+
+        Args:
+            driver: WebDriver实例
+            epoch: 快照所属的DOM周期编号
+            prober: 页面状态探测函数（SeleniumHandler.probe_page）
+            stats: 共享的统计对象
+        """
+        self.driver = driver
+        self.epoch = epoch
+        self._prober = prober
+        self.stats = stats or SnapshotStats()
+        self.stats.snapshots += 1
+        self._status = self._NOT_LOADED
+        self._page: Optional[ParsedPage] = None
+        self._size = 0  # 源码的UTF-8字节数，拉取时计算一次
+        self._consumers = set()
+
+    @property
+    def status(self) -> Optional[Dict[str, Any]]:
+        """页面状态（probe_page的结果），探测失败时为None且不缓存"""
+        if self._status is self._NOT_LOADED:
+            status = self._prober()
+            self.stats.probes += 1
+            if status is None:
+                return None
+            self._status = status
+        else:
+            self.stats.probes_reused += 1
+        return self._status
+
+    @property
+    def url(self) -> str:
+        """页面URL，优先使用已探测的状态，避免额外往返"""
+        if self._status is not self._NOT_LOADED:
+            return self._status.get('url', '')
+        if self._page is not None and self._page.url:
+            return self._page.url
+        return self.driver.current_url
+
+    @property
+    def page(self) -> ParsedPage:
+        """页面对象（首次访问时拉取page_source）"""
+        if self._page is None:
+            text = self.driver.page_source or ''
+            url = self._status.get('url', '') if self._status is not self._NOT_LOADED else ''
+            self._page = ParsedPage(text, url)
+            self._size = len(text.encode('utf-8'))
+            self.stats.fetches += 1
+            self.stats.fetched_bytes += self._size
+        return self._page
+
+    def page_for(self, consumer: str) -> ParsedPage:
+        """
+        供指定消费方使用的页面对象
+
+        源码已被其他消费方拉取时，该消费方第一次使用计为一次复用
+
+        Args:
+            consumer: 消费方名称（如parser）
+
+        Returns:
+            ParsedPage实例
+        """
+        if self._page is not None and consumer not in self._consumers:
+            self.stats.reuses += 1
+            self.stats.saved_bytes += self._size
+        self._consumers.add(consumer)
+        return self.page
+
+    @property
+    def text(self) -> str:
+        """页面源码"""
+        return self.page.text
+
+    @property
+    def loaded(self) -> bool:
+        """是否已经拉取过页面源码"""
+        return self._page is not None
@@ -7,42 +7,384 @@
 import re
 import json
 import time
+import threading
 from typing import Dict, List, Optional, Tuple, Any
 from urllib.parse import urlparse, urljoin, unquote
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
-from config.settings import TAGS
+from config.settings import TAGS, PARSER_SETTINGS, RELATED_KEYWORDS
+from config.constants import IMAGE_SKIP_KEYWORDS
+from src.crawler.search_extractor import SearchResultExtractor, CARD_STRATEGIES, parse_count
+from src.crawler.state_extractor import extract_initial_state
+from src.crawler.field_collector import FieldCollector, find_note_subtree
+from src.crawler.page_cache import ParseCache, memoize_parse
+from src.crawler.selector_stats import SelectorStats
+from src.utils.keyword_matcher import get_theme_matcher
 from src.utils.logger import setup_logger
 
 
+# 详情页部分解析时只构建这些标签
+SCRIPT_STRAINER = SoupStrainer('script')
+IMAGE_STRAINER = SoupStrainer('img')
+
+
 class XHSParser:
     """小红书页面解析器"""
     
-    def __init__(self):
+    SEARCH_ENGINES = ('lxml', 'legacy')
+    
+    # 旧版引擎的选择器（默认顺序）
+    LEGACY_SELECTORS = [
+        'div[data-note-id]',  # 小红书2024年新的数据结构
+        'div.note-item',       # 笔记项
+        'article',             # 文章标签
+        'div[class*="note-"]', # 包含note的类
+        'div[class*="feed-"]', # feed流
+        'div[class*="card-"]', # 卡片
+        'a[href*="/explore/"]', # 探索链接
+        'div[class*="item"]',   # item类
+        'section',              # 区块
+    ]
+    
+    def __init__(self, search_engine: Optional[str] = None, cache_size: Optional[int] = None,
+                 adaptive: Optional[bool] = None, stats_file=None):
+        """
+        初始化解析器
+        
+        Args:
+            search_engine: 搜索结果解析引擎，为None时使用配置中的设置
+            cache_size: 解析结果缓存大小，为None时使用配置中的设置，0表示不缓存
+            adaptive: 是否按历史命中率排序选择器，为None时使用配置中的设置（旧版引擎默认不排序）
+            stats_file: 选择器统计持久化文件，为None时只在内存中统计
+        """
         self.logger = setup_logger("xhs_parser")
+        self.search_engine = search_engine or PARSER_SETTINGS["search_engine"]
+        if self.search_engine not in self.SEARCH_ENGINES:
+            raise ValueError(f"不支持的解析引擎: {self.search_engine}")
+        self.search_extractor = SearchResultExtractor()
+        self.field_collector = FieldCollector()
+        
+        # 相同内容的页面只解析一次
+        if cache_size is None:
+            cache_size = PARSER_SETTINGS["cache_size"]
+        self.parse_cache = ParseCache(cache_size) if cache_size > 0 else None
+        self.keyword_matcher = get_theme_matcher()
+        
+        # 选择器命中统计
+        self.adaptive = PARSER_SETTINGS["adaptive_selectors"] if adaptive is None else adaptive
+        # 旧版引擎是新引擎的对比基线，默认保持原有的完整扫描
+        self.adaptive_legacy = PARSER_SETTINGS["adaptive_legacy_selectors"] if adaptive is None else adaptive
+        self.full_result_size = PARSER_SETTINGS["full_result_size"]
+        self.selector_stats = SelectorStats(stats_file, window=PARSER_SETTINGS["selector_stats_window"])
+        
+        # 详情页部分解析统计（工作池中多个线程共用解析器）
+        self.partial_detail_parse = PARSER_SETTINGS["partial_detail_parse"]
+        self._stats_lock = threading.Lock()
+        self.detail_stats = {
+            'pages': 0,
+            'fast_path': 0,       # 不需要完整DOM的页面数
+            'state_direct': 0,    # 直接从源码提取到页面状态的页面数
+            'script_soup': 0,     # 构建script标签子树的次数
+            'image_soup': 0,      # 构建img标签子树的次数
+            'full_soup': 0,       # 构建完整DOM的次数
+            'full_soup_ms': 0.0,
+            'full_soup_kb': 0.0,
+            'full_soup_nodes': 0,     # 完整DOM的节点数合计（内存占用的近似）
+            'partial_soup_ms': 0.0,   # 构建script/img子树的耗时合计
+            'partial_soup_nodes': 0,
+            'skipped_kb': 0.0,    # 未构建完整DOM的页面大小合计
+        }
     
-    def parse_search_results_direct(self, page_source: str, keyword: str) -> List[Dict[str, Any]]:
+    @memoize_parse
+    def parse_search_results_direct(self, page_source: str, keyword: str,
+                                    engine: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         解析小红书直接搜索结果页面
+        
+        Args:
+            page_source: 页面HTML源代码
+            keyword: 搜索关键词
+            engine: 解析引擎（lxml/legacy），为None时使用实例设置
+            
+        Returns:
+            笔记信息列表
+        """
+        engine = engine or self.search_engine
+        if engine == 'legacy':
+            return self._parse_search_results_legacy(page_source, keyword)
+        
+        notes = []
+        
+        try:
+            if self.adaptive:
+                candidates = self._extract_cards_adaptive(page_source)
+            else:
+                candidates = self.search_extractor.extract(page_source)
+            
+            # HTML中没有卡片时，尝试页面状态中的搜索feeds
+            if not candidates:
+                state = extract_initial_state(page_source)
+                if state:
+                    candidates = self._parse_state_feeds(state)
+            
+            for note_info in candidates:
+                if not self._validate_note_info(note_info):
+                    continue
+                # 关键词过滤：确保笔记内容与关键词相关
+                if self._is_related_to_keyword(note_info, keyword):
+                    note_info['search_keyword'] = keyword
+                    notes.append(note_info)
+            
+            self.logger.info(f"成功解析 {len(notes)} 个笔记")
+            
+        except Exception as e:
+            self.logger.error(f"解析搜索结果失败: {str(e)}")
+        
+        return notes
+    
+    def parse_search_fragments(self, fragments: List[str], keyword: str,
+                               seen_ids: Optional[set] = None) -> List[Dict[str, Any]]:
+        """
+        增量解析滚动加载的新卡片
+        
+        Args:
+            fragments: 新增卡片的outerHTML列表
+            keyword: 搜索关键词
+            seen_ids: 已见过的笔记ID集合（会被原地更新）
+            
+        Returns:
+            新的相关笔记列表
+        """
+        notes = []
+        
+        try:
+            for note_info in self.search_extractor.extract_fragments(fragments, seen_ids):
+                if not self._validate_note_info(note_info):
+                    continue
+                if self._is_related_to_keyword(note_info, keyword):
+                    note_info['search_keyword'] = keyword
+                    notes.append(note_info)
+        except Exception as e:
+            self.logger.error(f"增量解析搜索结果失败: {str(e)}")
+        
+        return notes
+    
+    def _extract_cards_adaptive(self, page_source: str) -> List[Dict[str, Any]]:
+        """
+        按历史命中率依次尝试卡片选择器，得到完整结果后停止；
+        排名第一的策略产出骤降时，本页改用完整扫描
+        
+        Args:
+            page_source: 页面HTML源代码
+            
+        Returns:
+            有效的笔记卡片列表
+        """
+        if not page_source:
+            return []
+        
+        root = self.search_extractor.parse_document(page_source)
+        taken, seen_ids = set(), set()
+        candidates = []
+        
+        ranked = self.selector_stats.rank('lxml', list(CARD_STRATEGIES))
+        for index, strategy in enumerate(ranked):
+            found = [
+                note_info for note_info in self.search_extractor.iter_strategy_cards(root, strategy, taken, seen_ids)
+                if self._validate_note_info(note_info)
+            ]
+            if self._record_strategy('lxml', strategy, len(found), is_best=(index == 0)):
+                return self.search_extractor.extract(page_source)
+            candidates.extend(found)
+            
+            if len(candidates) >= self.full_result_size:
+                break
+        
+        return candidates
+    
+    def _record_strategy(self, group: str, strategy: str, yield_count: int, is_best: bool = False) -> bool:
+        """
+        记录策略产出
+        
+        排名第一的策略产出骤降时，页面布局可能已变化：清空该分组的统计，
+        之后的页面按默认顺序重新积累排名
+        
+        Returns:
+            是否需要对当前页面回退到完整扫描
+        """
+        expected = self.selector_stats.mean(group, strategy)
+        
+        if is_best and expected and expected >= self.full_result_size / 2 and yield_count < expected / 2:
+            self.logger.warning(
+                f"选择器 '{strategy}' 产出从平均 {expected:.1f} 降到 {yield_count}，页面布局可能已变化，回退到完整扫描"
+            )
+            self.selector_stats.reset(group)
+            return True
+        
+        self.selector_stats.record(group, strategy, yield_count)
+        return False
+    
+    def save_selector_stats(self) -> bool:
+        """持久化选择器统计"""
+        return self.selector_stats.save()
+    
+    def parse_many(self, sources, kind: str = 'search', **kwargs):
+        """
+        使用进程池批量解析页面，结果流式返回
+        
+        Args:
+            sources: 文件路径或页面源码的可迭代对象
+            kind: 解析类型：search, search_simple, detail
+            **kwargs: 传给bulk_parser.parse_many的其他参数（workers, chunksize, ordered, output_path等）
+            
+        Returns:
+            结果记录迭代器
+        """
+        from src.crawler.bulk_parser import parse_many
+        
+        kwargs.setdefault('search_engine', self.search_engine)
+        return parse_many(sources, kind=kind, **kwargs)
+    
+    def _parse_state_feeds(self, state: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        从页面状态的search.feeds中解析笔记卡片
+        
+        Args:
+            state: window.__INITIAL_STATE__字典
+            
+        Returns:
+            笔记信息列表
+        """
+        search_state = state.get('search') or {}
+        feeds = search_state.get('feeds') or []
+        if isinstance(feeds, dict):
+            # Vue响应式数据可能包装为 {_value: [...]}
+            feeds = feeds.get('_value') or feeds.get('value') or []
+        
+        notes = []
+        for item in feeds:
+            note_info = self._note_from_feed_item(item)
+            if note_info:
+                notes.append(note_info)
+        return notes
+    
+    def parse_feed_response(self, response: Dict[str, Any], keyword: str = '') -> List[Dict[str, Any]]:
+        """
+        解析搜索/推荐接口返回的JSON
+        
+        Args:
+            response: 接口响应，形如 {"data": {"items": [...]}}
+            keyword: 搜索关键词，为空时不做关键词过滤
+            
+        Returns:
+            笔记信息列表
+        """
+        notes = []
+        
+        for item in self._response_items(response):
+            # 搜索结果中混有话题、用户等非笔记条目
+            if item.get('model_type', 'note') != 'note':
+                continue
+            
+            note_info = self._note_from_feed_item(item)
+            if not note_info or not self._validate_note_info(note_info):
+                continue
+            if keyword:
+                if not self._is_related_to_keyword(note_info, keyword):
+                    continue
+                note_info['search_keyword'] = keyword
+            notes.append(note_info)
+        
+        return notes
+    
+    def parse_note_response(self, response: Dict[str, Any], note_url: str) -> Dict[str, Any]:
+        """
+        解析笔记详情接口返回的JSON
+        
+        Args:
+            response: 接口响应，形如 {"data": {"items": [{"id": ..., "note_card": {...}}]}}
+            note_url: 笔记URL
+            
+        Returns:
+            笔记详情字典，响应中没有笔记时返回空字典
+        """
+        items = self._response_items(response)
+        note_id = self._extract_note_id_from_url(note_url)
+        item = next((i for i in items if i.get('id') == note_id), items[0] if items else None)
+        if not item:
+            return {}
+        
+        note_detail = self._empty_note_detail(note_url)
+        note_detail.update(self._parse_json_data(item))
+        
+        note_card = item.get('note_card') or item.get('noteCard') or {}
+        interact = note_card.get('interact_info') or note_card.get('interactInfo') or {}
+        note_detail['comments'] = parse_count(str(interact.get('comment_count') or interact.get('commentCount') or ''))
+        note_detail['collections'] = parse_count(str(interact.get('collected_count') or interact.get('collectedCount') or ''))
+        
+        return self._clean_note_data(note_detail)
+    
+    @staticmethod
+    def _response_items(response: Any) -> List[Dict[str, Any]]:
+        """取出接口响应中的items列表"""
+        data = response.get('data') if isinstance(response, dict) else None
+        items = data.get('items') if isinstance(data, dict) else None
+        return [item for item in items or [] if isinstance(item, dict)]
+    
+    def _note_from_feed_item(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """将单个feed条目转换为笔记信息"""
+        if not isinstance(item, dict):
+            return None
+        
+        note_card = item.get('noteCard') or item.get('note_card') or {}
+        note_id = item.get('id') or note_card.get('noteId') or note_card.get('note_id')
+        if not note_id:
+            return None
+        
+        title = note_card.get('displayTitle') or note_card.get('display_title') or note_card.get('title') or ''
+        user = note_card.get('user') or {}
+        cover = note_card.get('cover') or {}
+        interact = note_card.get('interactInfo') or note_card.get('interact_info') or {}
+        
+        note_info = {
+            'note_id': str(note_id),
+            'url': f"https://www.xiaohongshu.com/explore/{note_id}",
+            'title': title,
+            'content': note_card.get('desc') or title,
+            'tags': re.findall(r'#([^#\s]+)', title)[:5],
+            'username': user.get('nickname') or user.get('nickName') or '',
+            'likes': parse_count(str(interact.get('likedCount') or interact.get('liked_count') or '')),
+        }
+        
+        cover_url = cover.get('urlDefault') or cover.get('url_default') or cover.get('url')
+        if cover_url:
+            note_info['cover_url'] = cover_url
+        if item.get('xsecToken') or item.get('xsec_token'):
+            note_info['xsec_token'] = item.get('xsecToken') or item.get('xsec_token')
+        
+        return note_info
+    
+    def _parse_search_results_legacy(self, page_source: str, keyword: str) -> List[Dict[str, Any]]:
+        """
+        旧版搜索结果解析（多选择器扫描，保留用于对比）
         """
         notes = []
         
         try:
             soup = BeautifulSoup(page_source, 'html.parser')
             
+            adaptive_notes = self._extract_legacy_adaptive(soup) if self.adaptive_legacy else None
+            if adaptive_notes is not None:
+                for note_info in adaptive_notes:
+                    if self._is_related_to_keyword(note_info, keyword):
+                        note_info['search_keyword'] = keyword
+                        notes.append(note_info)
+                self.logger.info(f"成功解析 {len(notes)} 个笔记")
+                return notes
+            
             # 小红书搜索结果有多种布局，尝试多种选择器
-            selectors = [
-                'div[data-note-id]',  # 小红书2024年新的数据结构
-                'div.note-item',       # 笔记项
-                'article',             # 文章标签
-                'div[class*="note-"]', # 包含note的类
-                'div[class*="feed-"]', # feed流
-                'div[class*="card-"]', # 卡片
-                'a[href*="/explore/"]', # 探索链接
-                'div[class*="item"]',   # item类
-                'section',              # 区块
-            ]
+            selectors = self.LEGACY_SELECTORS
             
             all_elements = []
             for selector in selectors:
@@ -88,39 +430,63 @@ class XHSParser:
         
         return notes
 
-    def _is_related_to_keyword(self, note_info: Dict[str, Any], keyword: str) -> bool:
+    def _extract_legacy_adaptive(self, soup) -> Optional[List[Dict[str, Any]]]:
         """
-        检查笔记是否与关键词相关
+        旧版引擎的自适应扫描：选择器和提取方法都按历史命中率排序，得到完整结果后停止
+        
+        Args:
+            soup: BeautifulSoup对象
+            
+        Returns:
+            有效的笔记信息列表；排名第一的选择器产出骤降时返回None，由调用方完整扫描
         """
-        # 提取所有文本
-        texts = []
-        if note_info.get('title'):
-            texts.append(note_info['title'].lower())
-        if note_info.get('content'):
-            texts.append(note_info['content'].lower())
-        if note_info.get('tags'):
-            for tag in note_info['tags']:
-                texts.append(tag.lower())
-        
-        all_text = ' '.join(texts)
-        
-        # 关键词字典
-        keyword_dict = {
-            '外卖翻车': ['外卖', '翻车', '美团', '饿了么', '送餐', '外卖小哥', '点餐', '吃啥'],
-            '点餐翻车': ['点餐', '翻车', '外卖', '美团', '饿了么', '餐厅', '吃啥'],
-            '外卖漫画': ['外卖', '漫画', '美团', '饿了么', '送餐', '画', '插图'],
-            '点餐漫画': ['点餐', '漫画', '外卖', '餐厅', '画', '插图']
+        extractors = {
+            'v2': self._extract_note_from_element_v2,
+            'v1': self._extract_note_from_element,
         }
+        extractor_order = self.selector_stats.rank('legacy_extractor', list(extractors))
         
-        # 获取相关关键词
-        related_keywords = keyword_dict.get(keyword, [keyword])
+        results = []
+        seen_ids = set()
+        seen_elements = set()
+        
+        ranked = self.selector_stats.rank('legacy', self.LEGACY_SELECTORS)
+        for index, selector in enumerate(ranked):
+            found = 0
+            elements = [elem for elem in soup.select(selector) if id(elem) not in seen_elements]
+            
+            for element in elements[:50]:  # 限制处理数量
+                seen_elements.add(id(element))
+                
+                note_info = None
+                for name in extractor_order:
+                    note_info = extractors[name](element)
+                    self.selector_stats.record('legacy_extractor', name, 1 if note_info else 0)
+                    if note_info:
+                        break
+                
+                if note_info and self._validate_note_info(note_info) and note_info['note_id'] not in seen_ids:
+                    seen_ids.add(note_info['note_id'])
+                    results.append(note_info)
+                    found += 1
+            
+            if self._record_strategy('legacy', selector, found, is_best=(index == 0)):
+                return None
+            
+            if len(results) >= self.full_result_size:
+                break
         
-        # 检查是否包含任一关键词
-        for kw in related_keywords:
-            if kw in all_text:
-                return True
+        return results
+    
+    def _is_related_to_keyword(self, note_info: Dict[str, Any], keyword: str) -> bool:
+        """
+        检查笔记是否与关键词相关
+        """
+        # 获取相关关键词
+        related_keywords = RELATED_KEYWORDS.get(keyword, [keyword])
         
-        return False
+        # 一次扫描标题、内容和标签，检查是否包含任一关键词
+        return self.keyword_matcher.contains_any(note_info, related_keywords)
 
     def _extract_note_from_element(self, element) -> Optional[Dict[str, Any]]:
         """
@@ -322,6 +688,7 @@ class XHSParser:
         
         return True
     
+    @memoize_parse
     def parse_note_detail_direct(self, page_source: str, note_url: str) -> Dict[str, Any]:
         """
         解析笔记详情页面
@@ -333,31 +700,29 @@ class XHSParser:
         Returns:
             笔记详情字典
         """
-        note_detail = {
-            'note_id': '',
-            'title': '',
-            'content': '',
-            'images': [],
-            'tags': [],
-            'username': '',
-            'publish_time': '',
-            'likes': 0,
-            'comments': 0,
-            'collections': 0,
-            'url': note_url,
-        }
+        note_detail = self._empty_note_detail(note_url)
+        
+        self._count_detail(pages=1)
+        soup = None
         
         try:
-            soup = BeautifulSoup(page_source, 'html.parser')
+            # 非部分解析模式下一开始就构建完整DOM
+            soup = None if self.partial_detail_parse else self._build_soup(page_source)
             
-            # 1. 从script标签提取JSON数据（主要方法）
-            json_data = self._extract_json_data(soup)
+            # 1. 直接从源码提取页面状态（主要方法，无需构建DOM）
+            json_data = extract_initial_state(page_source)
+            if json_data is not None:
+                self._count_detail(state_direct=1)
+            else:
+                # 只需要script标签
+                json_data = self._extract_json_data(soup or self._build_soup(page_source, SCRIPT_STRAINER))
             if json_data:
                 parsed_data = self._parse_json_data(json_data)
                 note_detail.update(parsed_data)
             
             # 2. 如果JSON解析失败，从HTML提取
             if not note_detail.get('note_id') or not note_detail.get('content'):
+                soup = soup or self._build_soup(page_source)
                 html_data = self._parse_html_data(soup)
                 note_detail.update(html_data)
             
@@ -365,9 +730,11 @@ class XHSParser:
             if not note_detail['note_id']:
                 note_detail['note_id'] = self._extract_note_id_from_url(note_url)
             
-            # 4. 提取图片（如果JSON中没有）
+            # 4. 提取图片（如果JSON中没有），只需要img标签
             if not note_detail['images']:
-                note_detail['images'] = self._extract_images_from_html(soup)
+                note_detail['images'] = self._extract_images_from_html(
+                    soup or self._build_soup(page_source, IMAGE_STRAINER)
+                )
             
             # 5. 清理数据
             note_detail = self._clean_note_data(note_detail)
@@ -379,8 +746,98 @@ class XHSParser:
             import traceback
             traceback.print_exc()
         
+        # 完整DOM只会赋值给soup，为None说明本页走了快速路径
+        if soup is None:
+            self._count_detail(fast_path=1, skipped_kb=len(page_source) / 1024)
+        
         return note_detail
     
+    @staticmethod
+    def _empty_note_detail(note_url: str) -> Dict[str, Any]:
+        """笔记详情的默认字段"""
+        return {
+            'note_id': '',
+            'title': '',
+            'content': '',
+            'images': [],
+            'tags': [],
+            'username': '',
+            'publish_time': '',
+            'likes': 0,
+            'comments': 0,
+            'collections': 0,
+            'url': note_url,
+        }
+    
+    def _build_soup(self, page_source: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+        """
+        构建BeautifulSoup并记录构建统计
+        
+        Args:
+            page_source: 页面HTML源代码
+            parse_only: 只构建匹配的标签，为None时构建完整DOM
+        """
+        if parse_only is SCRIPT_STRAINER:
+            self._count_detail(script_soup=1)
+        elif parse_only is IMAGE_STRAINER:
+            self._count_detail(image_soup=1)
+        
+        start = time.perf_counter()
+        soup = BeautifulSoup(page_source, 'html.parser', parse_only=parse_only)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        nodes = sum(1 for _ in soup.descendants)
+        
+        if parse_only is None:
+            self._count_detail(full_soup=1, full_soup_ms=elapsed_ms, full_soup_kb=len(page_source) / 1024,
+                               full_soup_nodes=nodes)
+        else:
+            self._count_detail(partial_soup_ms=elapsed_ms, partial_soup_nodes=nodes)
+        
+        return soup
+    
+    def _count_detail(self, **amounts):
+        """累加详情页解析统计"""
+        with self._stats_lock:
+            for key, amount in amounts.items():
+                self.detail_stats[key] += amount
+    
+    def detail_parse_report(self) -> Dict[str, Any]:
+        """
+        详情页部分解析报告
+        
+        Returns:
+            快速路径占比；按完整DOM平均构建速度估算、扣除子树构建耗时后的节省时间；
+            以及每页构建的节点数（内存占用的近似）与完整DOM节点数的对比
+        """
+        with self._stats_lock:
+            stats = dict(self.detail_stats)
+        partial_soups = stats['script_soup'] + stats['image_soup']
+        report = {
+            'pages': stats['pages'],
+            'fast_path': stats['fast_path'],
+            'fast_path_rate': round(stats['fast_path'] / stats['pages'] * 100, 2) if stats['pages'] else 0,
+            'state_direct': stats['state_direct'],
+            'script_soup': stats['script_soup'],
+            'image_soup': stats['image_soup'],
+            'full_soup': stats['full_soup'],
+            'avg_full_soup_ms': round(stats['full_soup_ms'] / stats['full_soup'], 2) if stats['full_soup'] else None,
+            'partial_soup_ms': round(stats['partial_soup_ms'], 2),
+            'estimated_saved_ms': None,
+            'avg_full_soup_nodes': round(stats['full_soup_nodes'] / stats['full_soup']) if stats['full_soup'] else None,
+            'avg_partial_soup_nodes': round(stats['partial_soup_nodes'] / partial_soups) if partial_soups else None,
+            # 每页实际构建的节点数（完整DOM和子树合计）
+            'avg_nodes_per_page': (
+                round((stats['full_soup_nodes'] + stats['partial_soup_nodes']) / stats['pages'])
+                if stats['pages'] else None
+            ),
+        }
+        
+        if stats['full_soup_kb']:
+            ms_per_kb = stats['full_soup_ms'] / stats['full_soup_kb']
+            report['estimated_saved_ms'] = round(stats['skipped_kb'] * ms_per_kb - stats['partial_soup_ms'], 2)
+        
+        return report
+    
     def _extract_json_data(self, soup) -> Optional[Dict]:
         """从script标签中提取JSON数据"""
         script_tags = soup.find_all('script')
@@ -391,9 +848,13 @@ class XHSParser:
             
             text = script.string
             
+            # 页面状态按括号配对截取，避免非贪婪正则截断对象
+            state = extract_initial_state(text)
+            if state:
+                return state
+            
             # 小红书常见的JSON数据模式
             patterns = [
-                r'window\.__INITIAL_STATE__\s*=\s*({.*?})\s*;',
                 r'"noteDetailMap"\s*:\s*({[^}]+})',
                 r'"note"\s*:\s*({[^}]+})',
                 r'"id"\s*:\s*"[^"]+"[^}]+"desc"\s*:\s*"[^"]+"',
@@ -431,89 +892,23 @@ class XHSParser:
         }
         
         try:
-            # 深度优先搜索有用的数据
-            def search_in_dict(data, target_keys, result_key=None):
-                if isinstance(data, dict):
-                    for key, value in data.items():
-                        if key in target_keys:
-                            if result_key:
-                                result[result_key] = value
-                            return value
-                        
-                        # 递归搜索
-                        found = search_in_dict(value, target_keys, result_key)
-                        if found is not None:
-                            return found
-                elif isinstance(data, list):
-                    for item in data:
-                        found = search_in_dict(item, target_keys, result_key)
-                        if found is not None:
-                            return found
-                return None
+            # 尽量只遍历笔记详情子树，并在一次遍历中收集所有字段
+            subtree, subtree_path = find_note_subtree(json_data)
+            values, paths = self.field_collector.collect(subtree, subtree_path)
             
-            # 搜索笔记ID
-            note_id = search_in_dict(json_data, ['id', 'noteId', 'note_id'], 'note_id')
-            if note_id:
-                result['note_id'] = str(note_id)
+            for key in ('note_id', 'title', 'content', 'username'):
+                if values.get(key):
+                    result[key] = str(values[key])
             
-            # 搜索标题
-            title = search_in_dict(json_data, ['title', 'noteTitle', 'name'], 'title')
-            if title:
-                result['title'] = str(title)
+            likes = values.get('likes')
+            if likes:
+                result['likes'] = likes if isinstance(likes, int) else parse_count(str(likes))
             
-            # 搜索内容
-            content = search_in_dict(json_data, ['desc', 'content', 'description', 'noteDesc'], 'content')
-            if content:
-                result['content'] = str(content)
+            result['images'] = values.get('images', [])
+            result['tags'] = list(set(values.get('tags', [])))
+            result['source_paths'] = paths
             
-            # 搜索用户名
-            username = search_in_dict(json_data, ['nickname', 'name', 'username', 'userNickname'], 'username')
-            if username:
-                result['username'] = str(username)
-            
-            # 搜索点赞数
-            likes = search_in_dict(json_data, ['likes', 'likeCount', 'favCount'])
-            if likes:
-                result['likes'] = int(likes) if str(likes).isdigit() else 0
-            
-            # 搜索图片
-            def extract_images(data):
-                images = []
-                if isinstance(data, dict):
-                    if 'url' in data and ('http' in str(data['url']) or '//' in str(data['url'])):
-                        images.append({
-                            'url': data['url'],
-                            'width': data.get('width', 0),
-                            'height': data.get('height', 0),
-                            'caption': data.get('desc', '') or data.get('title', '')
-                        })
-                    else:
-                        for key, value in data.items():
-                            images.extend(extract_images(value))
-                elif isinstance(data, list):
-                    for item in data:
-                        images.extend(extract_images(item))
-                return images
-            
-            result['images'] = extract_images(json_data)
-            
-            # 搜索标签
-            def extract_tags(data):
-                tags = []
-                if isinstance(data, dict):
-                    if 'name' in data and isinstance(data['name'], str):
-                        tags.append(data['name'])
-                    else:
-                        for key, value in data.items():
-                            tags.extend(extract_tags(value))
-                elif isinstance(data, list):
-                    for item in data:
-                        tags.extend(extract_tags(item))
-                elif isinstance(data, str) and data.startswith('#'):
-                    tags.append(data[1:])
-                return tags
-            
-            result['tags'] = list(set(extract_tags(json_data)))
+            self.logger.debug(f"JSON字段来源: { {k: v for k, v in paths.items() if isinstance(v, str)} }")
             
         except Exception as e:
             self.logger.debug(f"从JSON解析数据失败: {str(e)}")
@@ -581,6 +976,7 @@ class XHSParser:
         return result
     
 
+    @memoize_parse
     def parse_search_results_simple(self, page_source: str, keyword: str) -> List[Dict[str, Any]]:
         """
         简单方法解析搜索结果 - 只提取笔记ID
@@ -633,7 +1029,7 @@ class XHSParser:
                 
                 # 过滤小图标
                 src_lower = src.lower()
-                if any(keyword in src_lower for keyword in ['icon', 'avatar', 'logo', 'spinner', 'loading', 'default']):
+                if any(keyword in src_lower for keyword in IMAGE_SKIP_KEYWORDS):
                     continue
                 
                 # 获取alt文本
@@ -702,15 +1098,6 @@ class XHSParser:
         if not note_data:
             return False
         
-        # 提取所有文本
-        texts = []
-        if note_data.get('title'):
-            texts.append(note_data['title'].lower())
-        if note_data.get('content'):
-            texts.append(note_data['content'].lower())
-        
-        all_text = ' '.join(texts)
-        
         # 主题关键词
         theme_keywords = []
         theme_parts = theme.lower().split('/')
@@ -720,19 +1107,8 @@ class XHSParser:
         # 添加中文关键词
         theme_keywords.extend(['外卖', '点餐', '翻车', '漫画', '吃啥', '美食', '吐槽'])
         
-        # 检查是否包含关键词
-        for keyword in theme_keywords:
-            if keyword and keyword in all_text:
-                return True
-        
-        # 检查标签
-        for tag in note_data.get('tags', []):
-            tag_lower = tag.lower()
-            for keyword in theme_keywords:
-                if keyword and keyword in tag_lower:
-                    return True
-        
-        return False
+        # 检查标题、内容和标签是否包含关键词
+        return self.keyword_matcher.contains_any(note_data, theme_keywords)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,147 @@
+"""
+请求限速模块
+按主机的令牌桶限速，站点页面和CDN图片使用不同的速率和突发上限，
+只有请求超出预算时才等待，并统计等待时间
+"""
+
+import time
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+from config.settings import CRAWLER_SETTINGS
+
+# 未配置时的默认预算：rate为每秒请求数，burst为允许连续发出的请求数
+DEFAULT_BUDGETS = {
+    'site': {'rate': 0.5, 'burst': 1},
+    'cdn': {'rate': 8, 'burst': 16},
+}
+
+
+class TokenBucket:
+    """令牌桶"""
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self.updated = now
+
+    def reserve(self, now: float) -> float:
+        """
+        预订一个令牌
+
+        令牌不足时仍然扣除（记为欠账），返回需要等待的秒数，
+        并发请求因此按顺序排队而不会同时醒来
+
+        Args:
+            now: 当前时间
+
+        Returns:
+            需要等待的秒数
+        """
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+class RateLimiter:
+    """按主机限速的线程安全限速器"""
+
+    def __init__(self, budgets: Optional[Dict[str, Dict[str, float]]] = None,
+                 cdn_hosts: Optional[Iterable[str]] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        初始化限速器
+
+        Args:
+            budgets: 预算名称（site, cdn） -> {'rate': 每秒请求数, 'burst': 突发上限}
+            cdn_hosts: 使用cdn预算的主机后缀
+            clock: 时钟函数（测试时可替换）
+            sleep: 等待函数（测试时可替换）
+        """
+        self.budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+        self.cdn_hosts = tuple(cdn_hosts or ())
+        self.clock = clock
+        self.sleep = sleep
+
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        # 预算名称 -> {requests, waits, wait_seconds, max_wait_seconds}
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    def budget_for(self, host: str) -> str:
+        """主机使用的预算名称"""
+        host = host.lower()
+        if any(host == suffix or host.endswith('.' + suffix) for suffix in self.cdn_hosts):
+            return 'cdn'
+        return 'site'
+
+    def acquire(self, url: str) -> float:
+        """
+        请求前获取许可，超出预算时等待
+
+        Args:
+            url: 请求URL
+
+        Returns:
+            实际等待的秒数
+        """
+        host = urlparse(url).netloc
+        budget = self.budget_for(host)
+
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                config = self.budgets[budget]
+                bucket = self._buckets[host] = TokenBucket(config['rate'], config['burst'], self.clock())
+            wait = bucket.reserve(self.clock())
+
+            stats = self.stats.setdefault(budget, {'requests': 0, 'waits': 0, 'wait_seconds': 0.0, 'max_wait_seconds': 0.0})
+            stats['requests'] += 1
+            if wait > 0:
+                stats['waits'] += 1
+                stats['wait_seconds'] += wait
+                stats['max_wait_seconds'] = max(stats['max_wait_seconds'], wait)
+
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+    def report(self) -> Dict[str, Any]:
+        """各预算的请求数、等待次数和等待时间"""
+        with self._lock:
+            return {
+                budget: {
+                    'requests': stats['requests'],
+                    'waits': stats['waits'],
+                    'wait_seconds': round(stats['wait_seconds'], 2),
+                    'max_wait_seconds': round(stats['max_wait_seconds'], 2),
+                }
+                for budget, stats in self.stats.items()
+            }
+
+
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    获取共享的限速器（首次调用时按配置创建）
+
+    Returns:
+        RateLimiter实例
+    """
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter(
+                CRAWLER_SETTINGS.get("rate_limits"),
+                CRAWLER_SETTINGS.get("cdn_hosts", ["xhscdn.com"])
+            )
+        return _rate_limiter
@@ -0,0 +1,203 @@
+"""
+页面就绪等待模块
+可组合的等待条件，页面就绪后立即返回，并记录每类等待的耗时
+"""
+
+import time
+from typing import Any, Callable, Dict, Optional
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+# 等待条件：接收driver，就绪时返回真值
+Condition = Callable[[Any], Any]
+
+# 搜索结果卡片
+FEED_SELECTOR = "section.note-item, div.note-item, div[data-note-id]"
+
+# 已收集卡片的标记属性，值为卡片链接（虚拟列表复用节点时链接会变化）
+CARD_MARKER = "data-xhs-collected"
+
+# 登录弹窗
+LOGIN_POPUP_SELECTOR = ".login-container, .login-dialog, .login-box, .login-modal, .qrcode-login-container"
+
+VISIBLE_COUNT_SCRIPT = """
+var nodes = document.querySelectorAll(arguments[0]);
+var count = 0;
+for (var i = 0; i < nodes.length; i++) {
+    if (nodes[i].offsetParent !== null || nodes[i].getClientRects().length) count++;
+}
+return count;
+"""
+
+NEW_CARDS_SCRIPT = """
+var cards = document.querySelectorAll(arguments[0]);
+var count = 0;
+for (var i = 0; i < cards.length; i++) {
+    var link = cards[i].querySelector('a[href*="/explore/"], a[href*="/search_result/"]');
+    if (cards[i].getAttribute(arguments[1]) !== (link ? link.getAttribute('href') : '')) count++;
+}
+return count;
+"""
+
+NETWORK_IDLE_SCRIPT = """
+var entries = performance.getEntriesByType('resource');
+var last = 0;
+for (var i = 0; i < entries.length; i++) {
+    if (entries[i].responseEnd > last) last = entries[i].responseEnd;
+}
+return performance.now() - last;
+"""
+
+
+def _safe(condition: Condition) -> Condition:
+    """执行脚本出错（如页面正在跳转）时视为未就绪"""
+    def check(driver):
+        try:
+            return condition(driver)
+        except WebDriverException:
+            return False
+    return check
+
+
+def document_ready() -> Condition:
+    """document.readyState为complete"""
+    return _safe(lambda driver: driver.execute_script("return document.readyState") == 'complete')
+
+
+def element_present(selector: str) -> Condition:
+    """存在匹配选择器的元素"""
+    return _safe(lambda driver: driver.execute_script(
+        "return document.querySelector(arguments[0]) !== null", selector
+    ))
+
+
+def feed_populated(selector: str = FEED_SELECTOR, min_count: int = 1) -> Condition:
+    """搜索结果中至少有min_count张卡片"""
+    return _safe(lambda driver: driver.execute_script(
+        "return document.querySelectorAll(arguments[0]).length", selector
+    ) >= min_count)
+
+
+def new_cards_present(selector: str = FEED_SELECTOR, marker: str = CARD_MARKER) -> Condition:
+    """存在尚未被收集（没有标记或标记与链接不一致）的卡片"""
+    return _safe(lambda driver: driver.execute_script(NEW_CARDS_SCRIPT, selector, marker) > 0)
+
+
+def state_script_present() -> Condition:
+    """页面状态window.__INITIAL_STATE__已写入"""
+    return _safe(lambda driver: driver.execute_script("return !!window.__INITIAL_STATE__"))
+
+
+def popup_visible(selector: str = LOGIN_POPUP_SELECTOR) -> Condition:
+    """登录弹窗可见"""
+    return _safe(lambda driver: driver.execute_script(VISIBLE_COUNT_SCRIPT, selector) > 0)
+
+
+def popup_gone(selector: str = LOGIN_POPUP_SELECTOR) -> Condition:
+    """没有可见的登录弹窗"""
+    return _safe(lambda driver: driver.execute_script(VISIBLE_COUNT_SCRIPT, selector) == 0)
+
+
+def network_idle(idle_ms: int = 500) -> Condition:
+    """最近idle_ms毫秒内没有资源请求完成"""
+    return _safe(lambda driver: driver.execute_script(NETWORK_IDLE_SCRIPT) >= idle_ms)
+
+
+def all_of(*conditions: Condition) -> Condition:
+    """所有条件都满足"""
+    return lambda driver: all(condition(driver) for condition in conditions)
+
+
+def any_of(*conditions: Condition) -> Condition:
+    """任一条件满足"""
+    return lambda driver: any(condition(driver) for condition in conditions)
+
+
+class PageBudget:
+    """单个页面的延迟预算，页面上的所有等待共享"""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.started = time.monotonic()
+
+    def remaining(self) -> float:
+        """剩余秒数"""
+        return max(0.0, self.seconds - (time.monotonic() - self.started))
+
+
+class ReadinessWaiter:
+    """就绪等待器"""
+
+    def __init__(self, driver, budget_seconds: float = 15, poll_interval: float = 0.2):
+        """
+        初始化等待器
+
+        Args:
+            driver: WebDriver实例
+            budget_seconds: 每个页面的延迟预算（秒）
+            poll_interval: 条件轮询间隔（秒）
+        """
+        self.driver = driver
+        self.budget_seconds = budget_seconds
+        self.poll_interval = poll_interval
+        self.budget = PageBudget(budget_seconds)
+        # 等待名称 -> {count, timeouts, total_seconds, max_seconds}
+        self.stats: Dict[str, Dict[str, float]] = {}
+        # 条件经过等待才满足的次数（说明等待期间DOM发生了变化）
+        self.changes = 0
+
+    def new_page(self) -> PageBudget:
+        """开始新页面，重置延迟预算"""
+        self.budget = PageBudget(self.budget_seconds)
+        return self.budget
+
+    def wait(self, condition: Condition, name: str, timeout: Optional[float] = None) -> bool:
+        """
+        等待条件满足
+
+        Args:
+            condition: 等待条件
+            name: 等待名称（用于统计）
+            timeout: 本次等待的上限，实际上限不超过当前页面的剩余预算
+
+        Returns:
+            条件是否满足
+        """
+        limit = self.budget.remaining()
+        if timeout is not None:
+            limit = min(limit, timeout)
+
+        start = time.monotonic()
+        try:
+            ready = bool(condition(self.driver))
+            if not ready and limit > 0:
+                WebDriverWait(self.driver, limit, poll_frequency=self.poll_interval).until(condition)
+                ready = True
+                self.changes += 1
+        except TimeoutException:
+            ready = False
+
+        self._record(name, time.monotonic() - start, ready)
+        return ready
+
+    def _record(self, name: str, elapsed: float, ready: bool):
+        """记录一次等待"""
+        stats = self.stats.setdefault(name, {'count': 0, 'timeouts': 0, 'total_seconds': 0.0, 'max_seconds': 0.0})
+        stats['count'] += 1
+        stats['total_seconds'] += elapsed
+        stats['max_seconds'] = max(stats['max_seconds'], elapsed)
+        if not ready:
+            stats['timeouts'] += 1
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """各类等待的次数、超时次数和平均/最长耗时"""
+        return {
+            name: {
+                'count': stats['count'],
+                'timeouts': stats['timeouts'],
+                'avg_seconds': round(stats['total_seconds'] / stats['count'], 3),
+                'max_seconds': round(stats['max_seconds'], 3),
+            }
+            for name, stats in self.stats.items()
+        }
@@ -3,8 +3,9 @@
 处理HTTP请求、代理、重试策略等
 """
 
-import time
-import random
+import os
+import hashlib
+import tempfile
 from typing import Dict, Optional, Tuple, Any
 from urllib.parse import urljoin
 
@@ -19,18 +20,25 @@ from config.settings import (
     LOG_CONFIG
 )
 from config.constants import HEADERS
+from src.crawler.http_cache import HTTPCache
+from src.crawler.rate_limiter import get_rate_limiter
 from src.utils.logger import setup_logger
 
+# 流式下载的临时文件名（与目标文件在同一目录）
+PARTIAL_PREFIX = '.download-'
+PARTIAL_SUFFIX = '.part'
+
 
 class RequestHandler:
     """HTTP请求处理器"""
     
-    def __init__(self, use_proxy: bool = None):
+    def __init__(self, use_proxy: bool = None, use_cache: bool = None):
         """
         初始化请求处理器
         
         Args:
             use_proxy: 是否使用代理，如果为None则使用配置中的设置
+            use_cache: 是否缓存GET响应，如果为None则使用配置中的设置
         """
         self.logger = setup_logger("request_handler")
         self.session = requests.Session()
@@ -45,9 +53,18 @@ class RequestHandler:
         self.proxies = PROXY_SETTINGS["proxy_list"]
         self.current_proxy_index = 0
         
-        # 配置请求参数
-        self.request_delay = CRAWLER_SETTINGS["request_delay"]
+        # 配置请求参数（各主机的访问频率由共享限速器控制）
+        self.rate_limiter = get_rate_limiter()
         self.timeout = CRAWLER_SETTINGS["timeout"]
+        self.chunk_size = CRAWLER_SETTINGS.get("download_chunk_size", 64 * 1024)
+        
+        # 配置响应缓存
+        use_cache = use_cache if use_cache is not None else CRAWLER_SETTINGS.get("http_cache", False)
+        self.cache = HTTPCache(
+            CRAWLER_SETTINGS["http_cache_dir"],
+            ttl_seconds=CRAWLER_SETTINGS.get("http_cache_ttl", 86400),
+            max_bytes=int(CRAWLER_SETTINGS.get("http_cache_max_mb", 512) * 1024 * 1024)
+        ) if use_cache else None
         
         # 设置请求头
         self.headers = HEADERS.copy()
@@ -64,7 +81,9 @@ class RequestHandler:
             backoff_factor=self.retry_delay
         )
         
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # 连接池需容纳下载引擎的并发线程
+        pool_size = max(10, CRAWLER_SETTINGS.get("download_workers", 6))
+        adapter = HTTPAdapter(max_retries=retry_strategy, pool_connections=pool_size, pool_maxsize=pool_size)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
     
@@ -90,11 +109,6 @@ class RequestHandler:
         self.logger.debug(f"使用代理: {proxy}")
         return {"http": proxy, "https": proxy}
     
-    def _add_random_delay(self):
-        """添加随机延迟，避免请求过快"""
-        delay = self.request_delay + random.uniform(-0.5, 0.5)
-        time.sleep(max(0.5, delay))
-    
     def make_request(
         self,
         url: str,
@@ -103,7 +117,9 @@ class RequestHandler:
         data: Optional[Dict] = None,
         json_data: Optional[Dict] = None,
         headers: Optional[Dict] = None,
-        timeout: Optional[int] = None
+        timeout: Optional[int] = None,
+        delay: bool = True,
+        stream: bool = False
     ) -> Tuple[bool, Optional[requests.Response], str]:
         """
         发送HTTP请求
@@ -116,17 +132,32 @@ class RequestHandler:
             json_data: JSON数据
             headers: 请求头
             timeout: 超时时间
+            delay: 是否经过限速器（超出该主机的预算时等待）
+            stream: 是否流式读取响应体（调用方负责读取并关闭响应）
             
         Returns:
             (是否成功, 响应对象, 错误信息)
         """
-        # 添加随机延迟
-        self._add_random_delay()
+        # 有效期内的缓存直接返回，过期的缓存发送条件请求
+        cached = None
+        cache_url = None
+        if self.cache and method.upper() == "GET":
+            cache_url = self._cache_url(url, params)
+            cached = self.cache.lookup(cache_url)
+            if cached and cached['fresh']:
+                self.logger.debug(f"使用缓存: {url}")
+                return True, self.cache.response(cached), "缓存命中"
+        
+        # 按主机限速，只有超出预算时才等待
+        if delay:
+            self.rate_limiter.acquire(url)
         
         # 准备请求参数
         request_headers = self.headers.copy()
         if headers:
             request_headers.update(headers)
+        if cached:
+            request_headers.update(HTTPCache.conditional_headers(cached))
         
         request_timeout = timeout or self.timeout
         proxies = self._get_proxy()
@@ -140,7 +171,8 @@ class RequestHandler:
                     params=params,
                     headers=request_headers,
                     timeout=request_timeout,
-                    proxies=proxies
+                    proxies=proxies,
+                    stream=stream
                 )
             elif method.upper() == "POST":
                 response = self.session.post(
@@ -155,9 +187,18 @@ class RequestHandler:
             else:
                 return False, None, f"不支持的HTTP方法: {method}"
             
+            # 内容未变化，使用缓存
+            if cached and response.status_code == 304:
+                response.close()
+                self.logger.debug(f"缓存已验证: {url}")
+                return True, self.cache.response(cached, revalidated=True), "缓存已验证"
+            
             # 检查响应状态
             if response.status_code == 200:
                 self.logger.debug(f"请求成功: {url}")
+                # 流式响应由stream_download写完文件后存入缓存
+                if cache_url and not stream:
+                    self.cache.store(cache_url, response.content, response.headers)
                 return True, response, "请求成功"
             else:
                 error_msg = f"请求失败，状态码: {response.status_code}"
@@ -181,44 +222,101 @@ class RequestHandler:
             self.logger.error(f"{error_msg}: {url}")
             return False, None, error_msg
     
-    def download_image(self, url: str, save_path: str) -> Tuple[bool, str]:
+    @staticmethod
+    def _cache_url(url: str, params: Optional[Dict] = None) -> str:
+        """缓存使用的完整URL（与实际发出的请求一致，含查询参数）"""
+        return requests.Request("GET", url, params=params).prepare().url
+    
+    def download_image(self, url: str, save_path: str, delay: bool = True) -> Tuple[bool, str]:
         """
         下载图片
         
         Args:
             url: 图片URL
             save_path: 保存路径
+            delay: 是否经过限速器
             
         Returns:
             (是否成功, 错误信息)
         """
-        self.logger.info(f"下载图片: {url}")
+        result = self.stream_download(url, save_path, delay=delay)
+        return result['success'], result['message']
+    
+    def stream_download(self, url: str, save_path: str, delay: bool = True) -> Dict[str, Any]:
+        """
+        流式下载文件
+        
+        分块写入同目录下的临时文件并同时计算MD5，长度与Content-Length一致后
+        原子地重命名为目标文件；失败时删除临时文件，目标路径上不会出现不完整的文件
         
-        success, response, error_msg = self.make_request(url)
+        Args:
+            url: 文件URL
+            save_path: 保存路径
+            delay: 是否经过限速器
+            
+        Returns:
+            {'success', 'message', 'bytes', 'md5'}
+        """
+        self.logger.info(f"下载图片: {url}")
+        result = {'success': False, 'message': '', 'bytes': 0, 'md5': ''}
         
+        success, response, error_msg = self.make_request(url, delay=delay, stream=True)
         if not success or not response:
-            return False, error_msg
+            if response is not None:
+                response.close()
+            result['message'] = error_msg
+            return result
         
+        directory = os.path.dirname(os.path.abspath(save_path))
+        temp_path = None
         try:
-            # 保存图片
-            with open(save_path, 'wb') as f:
-                f.write(response.content)
+            expected = response.headers.get('Content-Length')
+            digest = hashlib.md5()
+            size = 0
             
-            self.logger.info(f"图片保存成功: {save_path}")
-            return True, "下载成功"
+            fd, temp_path = tempfile.mkstemp(prefix=PARTIAL_PREFIX, suffix=PARTIAL_SUFFIX, dir=directory)
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    if not chunk:
+                        continue
+                    f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+            
+            if size == 0:
+                result['message'] = "下载图片失败: 响应为空"
+            elif expected and expected.isdigit() and int(expected) != size and not response.headers.get('Content-Encoding'):
+                result['message'] = f"下载图片失败: 数据不完整（{size}/{expected}字节）"
+            else:
+                os.replace(temp_path, save_path)
+                temp_path = None
+                if self.cache and not getattr(response, 'from_cache', False):
+                    self.cache.store_file(self._cache_url(url), save_path, response.headers)
+                result.update(success=True, message="下载成功", bytes=size, md5=digest.hexdigest())
+                self.logger.info(f"图片保存成功: {save_path}")
+            
+            if not result['success']:
+                self.logger.error(f"{result['message']}: {url}")
+            return result
             
         except IOError as e:
-            error_msg = f"保存图片失败: {str(e)}"
-            self.logger.error(error_msg)
-            return False, error_msg
+            result['message'] = f"保存图片失败: {str(e)}"
+            self.logger.error(result['message'])
+            return result
         except Exception as e:
-            error_msg = f"下载图片失败: {str(e)}"
-            self.logger.error(error_msg)
-            return False, error_msg
+            result['message'] = f"下载图片失败: {str(e)}"
+            self.logger.error(result['message'])
+            return result
+        finally:
+            response.close()
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
     
     def close(self):
-        """关闭session"""
+        """关闭session并保存缓存索引"""
         self.session.close()
+        if self.cache:
+            self.cache.save()
         self.logger.info("请求处理器已关闭")
 
 
@@ -0,0 +1,147 @@
+"""
+资源拦截模块
+爬取时浏览器不需要加载图片、视频、字体和统计脚本（图片由RequestHandler单独下载），
+通过内容设置和DevTools URL拦截阻止这些资源，并统计每个页面的传输量和加载时间
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+# 资源类型 -> DevTools Network.setBlockedURLs 通配模式
+RESOURCE_PATTERNS = {
+    'image': ['*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+              '*sns-webpic*', '*sns-img*', '*sns-avatar*', '*picasso-static*'],
+    'media': ['*.mp4', '*.m3u8', '*.ts', '*.webm', '*.mp3', '*sns-video*'],
+    'font': ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot'],
+    'tracker': ['*google-analytics.com*', '*googletagmanager.com*', '*apm-fe.xiaohongshu.com*',
+                '*t2.xiaohongshu.com*', '*spltapi.xiaohongshu.com*', '*sentry*'],
+}
+
+# 预设的拦截配置
+BLOCKING_PROFILES = {
+    'off': [],
+    'scrape': ['image', 'media', 'font', 'tracker'],
+    'lite': ['media', 'font', 'tracker'],
+}
+
+# 页面传输量和加载时间（Navigation/Resource Timing）
+PAGE_METRICS_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0];
+var resources = performance.getEntriesByType('resource');
+var bytes = nav ? (nav.transferSize || 0) : 0;
+for (var i = 0; i < resources.length; i++) bytes += resources[i].transferSize || 0;
+return {
+    load_ms: nav ? Math.round(nav.loadEventEnd || nav.duration || 0) : 0,
+    transfer_bytes: bytes,
+    resources: resources.length
+};
+"""
+
+
+def resolve_profile(profile: Any) -> List[str]:
+    """
+    解析拦截配置
+
+    Args:
+        profile: 预设名称、资源类型列表或None
+
+    Returns:
+        资源类型列表
+    """
+    if not profile:
+        return []
+    if isinstance(profile, str):
+        if profile not in BLOCKING_PROFILES:
+            raise ValueError(f"不支持的资源拦截配置: {profile}")
+        return list(BLOCKING_PROFILES[profile])
+
+    types = list(profile)
+    unknown = [t for t in types if t not in RESOURCE_PATTERNS]
+    if unknown:
+        raise ValueError(f"不支持的资源类型: {unknown}")
+    return types
+
+
+def blocked_url_patterns(types: Iterable[str]) -> List[str]:
+    """资源类型对应的URL拦截模式"""
+    patterns = []
+    for resource_type in types:
+        patterns.extend(RESOURCE_PATTERNS[resource_type])
+    return patterns
+
+
+def content_setting_prefs(types: Iterable[str]) -> Dict[str, int]:
+    """
+    Chrome内容设置（2表示禁止），在浏览器启动时生效
+
+    图片不通过内容设置禁止：内容设置无法在运行时关闭，扫码登录时二维码也会被拦截；
+    图片改用可随时解除的URL拦截
+    """
+    prefs = {}
+    if types:
+        prefs['profile.default_content_setting_values.notifications'] = 2
+        prefs['profile.default_content_setting_values.geolocation'] = 2
+    if 'media' in types:
+        prefs['profile.default_content_setting_values.media_stream'] = 2
+        prefs['profile.default_content_setting_values.auto_picture_in_picture'] = 2
+    return prefs
+
+
+def enable_url_blocking(driver, types: Iterable[str]) -> bool:
+    """
+    通过DevTools开启URL拦截
+
+    Args:
+        driver: Chrome WebDriver
+        types: 资源类型列表，为空时解除拦截
+
+    Returns:
+        是否成功
+    """
+    types = list(types)
+    patterns = blocked_url_patterns(types)
+
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+        if patterns:
+            logger.info(f"已拦截资源类型: {', '.join(types)}（{len(patterns)} 个URL模式）")
+        else:
+            logger.info("已解除资源拦截")
+        return True
+    except Exception as e:
+        logger.warning(f"开启URL拦截失败: {e}")
+        return False
+
+
+class PageMetrics:
+    """按页面累计传输量和加载时间"""
+
+    def __init__(self, profile_name: str = 'off'):
+        self.profile_name = profile_name
+        self.pages = 0
+        self.transfer_bytes = 0
+        self.load_ms = 0
+        self.resources = 0
+
+    def record(self, metrics: Dict[str, Any]):
+        """记录一个页面的指标"""
+        if not metrics:
+            return
+        self.pages += 1
+        self.transfer_bytes += int(metrics.get('transfer_bytes') or 0)
+        self.load_ms += int(metrics.get('load_ms') or 0)
+        self.resources += int(metrics.get('resources') or 0)
+
+    def report(self) -> Dict[str, Any]:
+        """平均每页的传输量（KB）、加载时间和资源数"""
+        pages = self.pages or 1
+        return {
+            'profile': self.profile_name,
+            'pages': self.pages,
+            'avg_transfer_kb': round(self.transfer_bytes / pages / 1024, 1),
+            'avg_load_ms': round(self.load_ms / pages, 1),
+            'avg_resources': round(self.resources / pages, 1),
+        }
@@ -0,0 +1,135 @@
+"""
+滚动收集模块
+滚动搜索结果页，以新卡片出现作为加载完成的信号，按出现顺序去重收集笔记，
+达到目标数量、连续没有新卡片或超出时间预算时停止
+"""
+
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List
+
+from src.crawler.readiness import FEED_SELECTOR, new_cards_present
+
+logger = logging.getLogger(__name__)
+
+# 停止原因
+STOP_TARGET = 'target'
+STOP_NO_GROWTH = 'no_growth'
+STOP_TIME_BUDGET = 'time_budget'
+STOP_MAX_SCROLLS = 'max_scrolls'
+
+
+class ScrollHarvester:
+    """搜索结果滚动收集器"""
+
+    def __init__(self, handler, target: int = 50, max_scrolls: int = 5, scroll_wait: float = 2,
+                 time_budget: float = 30, no_growth_rounds: int = 2, scroll_pixels: int = 1500,
+                 selector: str = FEED_SELECTOR):
+        """
+        初始化收集器
+
+        Args:
+            handler: SeleniumHandler实例
+            target: 收集到多少个笔记后停止
+            max_scrolls: 最大滚动次数
+            scroll_wait: 每次滚动后等待新卡片出现的上限（秒），新卡片出现即继续
+            time_budget: 整个收集过程的时间上限（秒）
+            no_growth_rounds: 连续多少次滚动没有新卡片时停止
+            scroll_pixels: 每次滚动的像素数
+            selector: 卡片CSS选择器
+        """
+        self.handler = handler
+        self.target = target
+        self.max_scrolls = max_scrolls
+        self.scroll_wait = scroll_wait
+        self.time_budget = time_budget
+        self.no_growth_rounds = max(1, no_growth_rounds)
+        self.scroll_pixels = scroll_pixels
+        self.selector = selector
+
+        # note_id -> 笔记信息，保持出现顺序
+        self.notes: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self.stats: Dict[str, Any] = {}
+
+    @property
+    def note_ids(self) -> List[str]:
+        """按出现顺序排列的笔记ID"""
+        return list(self.notes)
+
+    def harvest(self, parse: Callable[[List[str]], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        滚动并收集笔记
+
+        Args:
+            parse: 将新卡片outerHTML列表解析为笔记列表的函数（笔记需包含note_id）
+
+        Returns:
+            按出现顺序排列的笔记列表，最多target个
+        """
+        started = time.monotonic()
+        scrolls = 0
+        stale = 0
+        cards_seen = 0
+        stop_reason = STOP_MAX_SCROLLS
+
+        # 第一批为当前已渲染的全部卡片
+        fragments, total = self.handler.collect_new_feed_cards(self.selector)
+        cards_seen += len(fragments)
+        self._add(parse(fragments) if fragments else [])
+
+        while True:
+            elapsed = time.monotonic() - started
+            if len(self.notes) >= self.target:
+                stop_reason = STOP_TARGET
+                break
+            if elapsed >= self.time_budget:
+                stop_reason = STOP_TIME_BUDGET
+                break
+            if scrolls >= self.max_scrolls:
+                stop_reason = STOP_MAX_SCROLLS
+                break
+
+            scrolls += 1
+            self.handler.scroll_down(pixels=self.scroll_pixels, duration=0)
+            # 每次滚动是一轮新的加载，使用新的延迟预算
+            self.handler.waiter.new_page()
+            wait = min(self.scroll_wait, self.time_budget - elapsed)
+            self.handler.wait_until(new_cards_present(self.selector), 'scroll_new_cards', timeout=wait)
+
+            fragments, total = self.handler.collect_new_feed_cards(self.selector)
+            if not fragments:
+                stale += 1
+                logger.info(f"第{scrolls}次滚动没有新卡片（连续{stale}次）")
+                if stale >= self.no_growth_rounds:
+                    stop_reason = STOP_NO_GROWTH
+                    break
+                continue
+
+            stale = 0
+            cards_seen += len(fragments)
+            added = self._add(parse(fragments))
+            logger.info(
+                f"第{scrolls}次滚动：新卡片 {len(fragments)} 个，新笔记 {added} 个，"
+                f"累计 {len(self.notes)} 个（页面 {total}）"
+            )
+
+        self.stats = {
+            'notes': len(self.notes),
+            'scrolls': scrolls,
+            'cards_seen': cards_seen,
+            'seconds': round(time.monotonic() - started, 2),
+            'stop_reason': stop_reason,
+        }
+        logger.info(f"滚动收集结束：{self.stats}")
+        return list(self.notes.values())[:self.target]
+
+    def _add(self, notes: List[Dict[str, Any]]) -> int:
+        """按出现顺序去重加入笔记，返回新增数量"""
+        added = 0
+        for note in notes:
+            note_id = note.get('note_id')
+            if note_id and note_id not in self.notes:
+                self.notes[note_id] = note
+                added += 1
+        return added
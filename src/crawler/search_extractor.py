@@ -0,0 +1,258 @@
+"""
+搜索结果提取器模块
+基于lxml单次遍历DOM，使用预编译XPath提取笔记卡片
+"""
+
+import re
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Any
+from urllib.parse import urljoin
+
+from lxml import etree
+from lxml import html as lxml_html
+
+from config.constants import IMAGE_SKIP_KEYWORDS
+
+
+BASE_URL = 'https://www.xiaohongshu.com'
+
+# 笔记ID模式（24位十六进制）
+NOTE_ID_PATTERN = re.compile(r'^[a-f0-9]{24}$')
+NOTE_HREF_PATTERN = re.compile(r'/(?:explore|search_result|discovery/item)/([a-f0-9]{24})')
+HASH_TAG_PATTERN = re.compile(r'#([^#\s]+)')
+
+
+def _has_class(name: str) -> str:
+    """生成按class精确匹配的XPath条件"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# 笔记卡片选择器：按文档顺序一次性返回所有候选卡片
+CARD_XPATH = etree.XPath(
+    f"//section[{_has_class('note-item')}]"
+    f" | //div[{_has_class('note-item')}]"
+    f" | //div[@data-note-id]"
+    f" | //article"
+)
+
+# 没有结构化卡片时，退回到探索链接的父元素
+LINK_CARD_XPATH = etree.XPath("//a[contains(@href, '/explore/')]/..")
+
+# 按策略拆分的卡片选择器（自适应模式下按命中率依次尝试）
+CARD_STRATEGIES = OrderedDict([
+    ('section.note-item', etree.XPath(f"//section[{_has_class('note-item')}]")),
+    ('div.note-item', etree.XPath(f"//div[{_has_class('note-item')}]")),
+    ('div[data-note-id]', etree.XPath("//div[@data-note-id]")),
+    ('article', etree.XPath("//article")),
+    ('explore-link-parent', LINK_CARD_XPATH),
+])
+
+# 卡片内部字段选择器
+HREF_XPATH = etree.XPath(".//a/@href")
+TITLE_XPATH = etree.XPath(f".//a[{_has_class('title')}]//text() | .//*[{_has_class('title')}]/span//text()")
+HEADING_XPATH = etree.XPath(".//h1//text() | .//h2//text() | .//h3//text() | .//h4//text()")
+IMAGE_XPATH = etree.XPath(".//img")
+USERNAME_XPATH = etree.XPath(f".//*[{_has_class('name')}]//text()")
+AUTHOR_XPATH = etree.XPath(f".//*[{_has_class('author')}]//text()")
+LIKES_XPATH = etree.XPath(f".//*[{_has_class('count')}]//text()")
+TEXT_XPATH = etree.XPath(".//text()")
+
+
+def parse_count(text: str) -> int:
+    """
+    解析点赞数等计数文本，支持"1.2万"、"3k"等写法
+
+    Args:
+        text: 计数文本
+
+    Returns:
+        整数计数，无法解析时返回0
+    """
+    if not text:
+        return 0
+
+    text = text.strip().lower().replace(',', '')
+    multiplier = 1
+    if text.endswith('万') or text.endswith('w'):
+        multiplier = 10000
+        text = text[:-1]
+    elif text.endswith('k'):
+        multiplier = 1000
+        text = text[:-1]
+
+    try:
+        return int(float(text) * multiplier)
+    except ValueError:
+        return 0
+
+
+def normalize_image_url(src: str) -> Optional[str]:
+    """补全图片URL，非HTTP地址返回None"""
+    if not src:
+        return None
+    if src.startswith('//'):
+        return 'https:' + src
+    if src.startswith('/'):
+        return urljoin(BASE_URL, src)
+    if not src.startswith('http'):
+        return None
+    return src
+
+
+class SearchResultExtractor:
+    """基于lxml的搜索结果提取器"""
+
+    def iter_cards(self, page_source: str) -> Iterator[Dict[str, Any]]:
+        """
+        遍历页面中的笔记卡片，边遍历边产出笔记信息
+
+        Args:
+            page_source: 页面HTML源代码
+
+        Yields:
+            笔记信息字典
+        """
+        if not page_source:
+            return
+
+        root = self.parse_document(page_source)
+
+        cards = CARD_XPATH(root)
+        if not cards:
+            cards = LINK_CARD_XPATH(root)
+
+        yield from self._iter_from_cards(cards, set(), set())
+
+    def extract_fragments(self, fragments: Iterable[str], seen_ids: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+        """
+        从增量获取的卡片HTML片段中提取笔记
+
+        片段拼接后只构建一次文档树，解析开销与新增卡片数量成正比，而不是与整个页面大小成正比
+
+        Args:
+            fragments: 卡片outerHTML列表
+            seen_ids: 已产出的笔记ID集合（会被原地更新），其中的笔记不再产出
+
+        Returns:
+            新笔记信息列表
+        """
+        fragments = [fragment for fragment in fragments if fragment]
+        if not fragments:
+            return []
+
+        root = self.parse_document(f"<html><body>{''.join(fragments)}</body></html>")
+
+        cards = CARD_XPATH(root)
+        if not cards:
+            cards = LINK_CARD_XPATH(root)
+
+        return list(self._iter_from_cards(cards, set(), seen_ids if seen_ids is not None else set()))
+
+    def parse_document(self, page_source: str):
+        """构建lxml文档树"""
+        return lxml_html.document_fromstring(page_source)
+
+    def iter_strategy_cards(self, root, strategy: str, taken: Set, seen_ids: Set[str]) -> Iterator[Dict[str, Any]]:
+        """
+        只使用单个策略的选择器产出笔记卡片
+
+        Args:
+            root: parse_document返回的文档树
+            strategy: CARD_STRATEGIES中的策略名
+            taken: 已处理的卡片元素（跨策略共享，用于跳过嵌套元素）
+            seen_ids: 已产出的笔记ID（跨策略共享）
+
+        Yields:
+            笔记信息字典
+        """
+        yield from self._iter_from_cards(CARD_STRATEGIES[strategy](root), taken, seen_ids)
+
+    def _iter_from_cards(self, cards: Iterable, taken: Set, seen_ids: Set[str]) -> Iterator[Dict[str, Any]]:
+        """从候选元素中产出不重复的笔记卡片"""
+        for card in cards:
+            # 跳过已处理卡片内部的嵌套元素
+            if any(ancestor in taken for ancestor in card.iterancestors()):
+                continue
+
+            note_info = self._extract_card(card)
+            if not note_info or note_info['note_id'] in seen_ids:
+                continue
+
+            taken.add(card)
+            seen_ids.add(note_info['note_id'])
+            yield note_info
+
+    def extract(self, page_source: str) -> List[Dict[str, Any]]:
+        """提取页面中的全部笔记卡片"""
+        return list(self.iter_cards(page_source))
+
+    def _extract_card(self, card) -> Optional[Dict[str, Any]]:
+        """
+        从单个卡片元素中提取笔记信息
+
+        Args:
+            card: lxml元素
+
+        Returns:
+            笔记信息字典，没有笔记ID时返回None
+        """
+        note_id = self._extract_note_id(card)
+        if not note_id:
+            return None
+
+        title = self._join_text(TITLE_XPATH(card)) or self._join_text(HEADING_XPATH(card))
+        if not title:
+            # 取长度合理的最长文本作为标题
+            texts = [t.strip() for t in TEXT_XPATH(card) if 5 <= len(t.strip()) <= 100]
+            title = max(texts, key=len) if texts else ''
+
+        note_info = {
+            'note_id': note_id,
+            'url': f"{BASE_URL}/explore/{note_id}",
+            'title': title,
+            'content': title,
+            'tags': list(dict.fromkeys(HASH_TAG_PATTERN.findall(title)))[:5],
+        }
+
+        cover_url = self._extract_cover(card)
+        if cover_url:
+            note_info['cover_url'] = cover_url
+
+        username = self._join_text(USERNAME_XPATH(card)) or self._join_text(AUTHOR_XPATH(card))
+        if username and len(username) <= 20:
+            note_info['username'] = username
+
+        likes = LIKES_XPATH(card)
+        if likes:
+            note_info['likes'] = parse_count(likes[0])
+
+        return note_info
+
+    def _extract_note_id(self, card) -> Optional[str]:
+        """从data-note-id属性或链接中提取笔记ID"""
+        data_id = card.get('data-note-id') or card.get('data-id') or ''
+        if NOTE_ID_PATTERN.match(data_id):
+            return data_id
+
+        for href in HREF_XPATH(card):
+            match = NOTE_HREF_PATTERN.search(href)
+            if match:
+                return match.group(1)
+
+        return None
+
+    def _extract_cover(self, card) -> Optional[str]:
+        """提取第一张非图标的封面图片"""
+        for img in IMAGE_XPATH(card):
+            src = normalize_image_url(img.get('src') or img.get('data-src') or '')
+            if not src:
+                continue
+            if any(keyword in src.lower() for keyword in IMAGE_SKIP_KEYWORDS):
+                continue
+            return src
+        return None
+
+    @staticmethod
+    def _join_text(parts: List[str]) -> str:
+        """拼接文本节点并压缩空白"""
+        return re.sub(r'\s+', ' ', ''.join(parts)).strip()
@@ -0,0 +1,106 @@
+"""
+选择器统计模块
+记录各解析策略在最近页面上的产出，按产出排序策略，并可持久化到JSON文件
+"""
+
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from src.utils.helper import safe_json_dump, safe_json_load
+
+
+class SelectorStats:
+    """解析策略命中统计（线程安全）"""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, window: int = 100):
+        """
+        初始化统计
+
+        Args:
+            path: 持久化文件路径，为None时只在内存中统计
+            window: 每个策略保留的最近样本数
+        """
+        self.path = Path(path) if path else None
+        self.window = window
+        # 分组 -> 策略名 -> 最近样本列表
+        self.samples: Dict[str, Dict[str, List[float]]] = {}
+        self._lock = threading.RLock()
+        self.load()
+
+    def load(self):
+        """从文件加载统计"""
+        if not self.path:
+            return
+
+        data = safe_json_load(self.path)
+        if isinstance(data, dict) and isinstance(data.get('samples'), dict):
+            samples = {
+                group: {name: list(values)[-self.window:] for name, values in strategies.items()}
+                for group, strategies in data['samples'].items()
+            }
+            with self._lock:
+                self.samples = samples
+
+    def save(self) -> bool:
+        """保存统计到文件"""
+        if not self.path:
+            return False
+        with self._lock:
+            return safe_json_dump({'window': self.window, 'samples': self.samples}, self.path)
+
+    def record(self, group: str, name: str, value: float):
+        """
+        记录一次样本
+
+        Args:
+            group: 策略分组（如lxml、legacy、legacy_extractor）
+            name: 策略名
+            value: 样本值（产出笔记数，或命中为1、未命中为0）
+        """
+        with self._lock:
+            values = self.samples.setdefault(group, {}).setdefault(name, [])
+            values.append(value)
+            if len(values) > self.window:
+                del values[:len(values) - self.window]
+
+    def reset(self, group: str):
+        """清空一个分组的样本，之后按默认顺序重新排序"""
+        with self._lock:
+            self.samples.pop(group, None)
+
+    def mean(self, group: str, name: str) -> Optional[float]:
+        """最近样本的平均值，没有样本时返回None"""
+        with self._lock:
+            values = self.samples.get(group, {}).get(name)
+            if not values:
+                return None
+            return sum(values) / len(values)
+
+    def rank(self, group: str, names: List[str]) -> List[str]:
+        """
+        按平均产出从高到低排序策略
+
+        没有样本的策略按0处理，产出相同时保持原有顺序
+
+        Args:
+            group: 策略分组
+            names: 策略名列表（默认顺序）
+
+        Returns:
+            排序后的策略名列表
+        """
+        order = {name: index for index, name in enumerate(names)}
+        with self._lock:
+            return sorted(names, key=lambda name: (-(self.mean(group, name) or 0), order[name]))
+
+    def report(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """各策略的样本数和平均产出"""
+        with self._lock:
+            return {
+                group: {
+                    name: {'samples': len(values), 'mean': round(sum(values) / len(values), 3)}
+                    for name, values in strategies.items() if values
+                }
+                for group, strategies in self.samples.items()
+            }
@@ -9,15 +9,186 @@ from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import logging
 
+from config.settings import SELENIUM_SETTINGS
+from config.constants import IMAGE_SKIP_KEYWORDS
+from src.crawler.network_capture import NetworkCapture
+from src.crawler.page_snapshot import PageSnapshot, SnapshotStats
+from src.crawler.warm_start import SessionMarker, cache_driver_path, clear_driver_cache, resolve_driver_path
+from src.crawler.resource_blocking import (
+    PAGE_METRICS_SCRIPT, PageMetrics, content_setting_prefs, enable_url_blocking, resolve_profile
+)
+from src.crawler.readiness import (
+    ReadinessWaiter, CARD_MARKER, FEED_SELECTOR, all_of, any_of, document_ready,
+    element_present, popup_gone, popup_visible
+)
+
 logger = logging.getLogger(__name__)
 
+# 搜索结果中的笔记卡片
+FEED_CARD_SELECTOR = FEED_SELECTOR
+
+# 已登录时显示的用户头像
+AVATAR_SELECTOR = ".avatar, .user-avatar, .header-avatar, .nav-avatar"
+
+# 增量获取新卡片：给已返回的卡片打上当前链接作为标记，
+# 只返回没有标记或被虚拟列表复用后链接已变化的卡片
+COLLECT_NEW_CARDS_SCRIPT = """
+var cards = document.querySelectorAll(arguments[0]);
+var mark = arguments[1];
+var fresh = [];
+for (var i = 0; i < cards.length; i++) {
+    var link = cards[i].querySelector('a[href*="/explore/"], a[href*="/search_result/"]');
+    var key = link ? link.getAttribute('href') : '';
+    if (cards[i].getAttribute(mark) !== key) {
+        cards[i].setAttribute(mark, key);
+        fresh.push(cards[i].outerHTML);
+    }
+}
+return {fresh: fresh, total: cards.length};
+"""
+
+# 一次execute_script收集所有图片的地址、尺寸和可见性，并在浏览器内过滤图标和去重
+COLLECT_IMAGES_SCRIPT = """
+var images = document.querySelectorAll(arguments[0]);
+var skip = arguments[1];
+var minSize = arguments[2];
+var seen = {};
+var result = [];
+
+function absolute(url) {
+    if (!url || url.indexOf('data:') === 0) return '';
+    try { url = new URL(url, location.href).href; } catch (e) { return ''; }
+    return url.indexOf('http') === 0 ? url : '';
+}
+
+function largestCandidate(srcset) {
+    var best = '', bestSize = -1;
+    (srcset || '').split(',').forEach(function (part) {
+        var pieces = part.trim().split(/\\s+/);
+        var size = parseFloat(pieces[1]) || 1;
+        if (pieces[0] && size > bestSize) { best = pieces[0]; bestSize = size; }
+    });
+    return best;
+}
+
+for (var i = 0; i < images.length; i++) {
+    var img = images[i];
+    var url = absolute(largestCandidate(img.getAttribute('srcset')))
+        || absolute(img.currentSrc || img.getAttribute('src'))
+        || absolute(img.getAttribute('data-src'));
+    if (!url || seen[url]) continue;
+
+    var lower = url.toLowerCase();
+    if (skip.some(function (keyword) { return lower.indexOf(keyword) !== -1; })) continue;
+    if (img.naturalWidth && Math.max(img.naturalWidth, img.naturalHeight) < minSize) continue;
+
+    seen[url] = true;
+    result.push({
+        url: url,
+        caption: (img.getAttribute('alt') || '').slice(0, 100),
+        width: img.naturalWidth || 0,
+        height: img.naturalHeight || 0,
+        visible: img.offsetParent !== null && img.getClientRects().length > 0
+    });
+}
+return result;
+"""
+
+# 页面状态探测使用的选择器和关键词
+LOGIN_POPUP_SELECTORS = [
+    ".login-container",
+    ".login-dialog",
+    ".login-box",
+    ".login-modal",
+    ".qrcode-login-container",
+    "[class*='login']",
+    "[class*='Login']",
+]
+AVATAR_SELECTORS = [
+    ".avatar",
+    ".user-avatar",
+    ".header-avatar",
+    ".nav-avatar",
+    "[class*='avatar']",
+    "[class*='Avatar']",
+]
+SEARCH_BOX_SELECTORS = [
+    ".search-input",
+    ".search-box",
+    "input[placeholder*='搜索']",
+    "[class*='search']",
+]
+PAGE_KEYWORDS = {
+    'login': ["立即登录", "登录后查看", "登录解锁", "请先登录", "登录小红书"],
+    'force_login': ["登录后查看", "立即登录", "登录解锁", "登录后继续", "请先登录"],
+    'blocked': ["页面不见了", "访问的页面不存在", "访问异常", "您访问的页面"],
+}
+
+# 一次execute_script返回登录、弹窗、拦截等页面状态，关键词在浏览器内匹配，不传输page_source
+PAGE_PROBE_SCRIPT = """
+var selectors = arguments[0], keywords = arguments[1];
+function visible(selector) {
+    var nodes = document.querySelectorAll(selector);
+    for (var i = 0; i < nodes.length; i++) {
+        if (nodes[i].offsetParent !== null || nodes[i].getClientRects().length) return true;
+    }
+    return false;
+}
+function anyVisible(list) {
+    for (var i = 0; i < list.length; i++) {
+        try { if (visible(list[i])) return true; } catch (e) {}
+    }
+    return false;
+}
+var html = document.documentElement ? document.documentElement.outerHTML : '';
+var found = {};
+for (var name in keywords) {
+    found[name] = keywords[name].filter(function (k) { return html.indexOf(k) !== -1; });
+}
+return {
+    url: location.href,
+    login_popup: anyVisible(selectors.login_popup),
+    avatar: anyVisible(selectors.avatar),
+    search_box: anyVisible(selectors.search_box),
+    feed_container: document.querySelector('.feeds-container') !== null,
+    keywords: found
+};
+"""
+
 class SeleniumHandler:
-    def __init__(self, browser='chrome', headless=False, user_data_dir=None):
+    def __init__(self, browser='chrome', headless=False, user_data_dir=None, blocking_profile=None,
+                 persistent_profile=None):
         self.browser = browser
         self.headless = headless
         self.user_data_dir = user_data_dir
+        
+        # 热启动：本地解析驱动；persistent_profile为True时复用持久化用户目录（同一目录只能被一个浏览器使用）
+        self.warm_start = SELENIUM_SETTINGS.get("warm_start", False)
+        if persistent_profile is None:
+            persistent_profile = self.warm_start
+        if persistent_profile and not self.user_data_dir:
+            self.user_data_dir = str(SELENIUM_SETTINGS["profile_dir"])
+        self.session_marker = None
+        if persistent_profile:
+            self.session_marker = SessionMarker(self.user_data_dir, SELENIUM_SETTINGS.get("session_ttl_hours", 6))
+        self.startup_stats = {}
+        
+        # 资源拦截配置，为None时使用配置中的设置
+        if blocking_profile is None:
+            blocking_profile = SELENIUM_SETTINGS.get("blocking_profile", "off")
+        self.blocking_profile = blocking_profile if isinstance(blocking_profile, str) else 'custom'
+        self.blocked_types = resolve_profile(blocking_profile)
+        self.page_metrics = PageMetrics(self.blocking_profile)
         self.driver = None
         self.wait = None
+        self.waiter = None
+        self.network_capture = None
+        
+        # 页面快照：导航或DOM变化时递增周期编号，同一周期内共享page_source和页面状态
+        self._snapshot = None
+        self._snapshot_epoch = 0
+        self._wait_changes = 0
+        self.snapshot_stats = SnapshotStats()
         self.cookies_file = "xiaohongshu_cookies.json"  # cookie文件路径
     
     def initialize(self):
@@ -57,20 +228,59 @@ class SeleniumHandler:
                 options.add_argument('--disable-notifications')
                 options.add_argument('--disable-popup-blocking')
                 
-                try:
-                    # 尝试使用webdriver-manager自动管理驱动
-                    from selenium.webdriver.chrome.service import Service
-                    from webdriver_manager.chrome import ChromeDriverManager
-                    
-                    service = Service(ChromeDriverManager().install())
-                    self.driver = webdriver.Chrome(service=service, options=options)
-                except Exception as e:
-                    logger.warning(f"webdriver-manager初始化失败，尝试直接使用Chrome: {e}")
-                    # 如果webdriver-manager失败，尝试直接使用系统Chrome
-                    self.driver = webdriver.Chrome(options=options)
+                # 资源拦截：通知、定位等权限弹窗和媒体通过内容设置禁止
+                prefs = content_setting_prefs(self.blocked_types)
+                if prefs:
+                    options.add_experimental_option('prefs', prefs)
+                
+                # 捕获接口响应需要performance日志
+                if SELENIUM_SETTINGS.get("capture_network"):
+                    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+                
+                from selenium.webdriver.chrome.service import Service
+                
+                # 热启动：先使用本地已有的驱动，不访问网络
+                start = time.perf_counter()
+                driver_source = 'manager'
+                if self.warm_start:
+                    driver_path, driver_source = resolve_driver_path(SELENIUM_SETTINGS.get("driver_path"))
+                    if driver_path:
+                        try:
+                            self.driver = webdriver.Chrome(service=Service(driver_path), options=options)
+                        except Exception as e:
+                            # 常见原因是Chrome升级后驱动版本不匹配
+                            logger.warning(f"本地驱动启动失败，改用webdriver-manager: {e}")
+                            clear_driver_cache()
+                            driver_source = 'manager'
+                
+                if self.driver is None:
+                    try:
+                        # 尝试使用webdriver-manager自动管理驱动
+                        from webdriver_manager.chrome import ChromeDriverManager
+                        
+                        driver_path = ChromeDriverManager().install()
+                        self.driver = webdriver.Chrome(service=Service(driver_path), options=options)
+                        driver_source = 'manager'
+                        cache_driver_path(driver_path)
+                    except Exception as e:
+                        logger.warning(f"webdriver-manager初始化失败，尝试直接使用Chrome: {e}")
+                        # 如果webdriver-manager失败，尝试直接使用系统Chrome
+                        self.driver = webdriver.Chrome(options=options)
+                        driver_source = 'selenium'
+                
+                self.startup_stats['driver_source'] = driver_source
+                self.startup_stats['browser_start_seconds'] = round(time.perf_counter() - start, 3)
                 
                 self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
                 
+                if SELENIUM_SETTINGS.get("capture_network"):
+                    self.network_capture = NetworkCapture(self.driver)
+                    self.network_capture.enable()
+                
+                # 视频、字体、统计脚本等通过DevTools按URL拦截
+                if self.blocked_types:
+                    enable_url_blocking(self.driver, self.blocked_types)
+                
             elif self.browser.lower() == 'firefox':
                 # 类似地，可以添加Firefox支持
                 pass
@@ -78,6 +288,11 @@ class SeleniumHandler:
                 raise ValueError(f"不支持的浏览器: {self.browser}")
             
             self.wait = WebDriverWait(self.driver, 10)
+            self.waiter = ReadinessWaiter(
+                self.driver,
+                budget_seconds=SELENIUM_SETTINGS.get("page_latency_budget", 15),
+                poll_interval=SELENIUM_SETTINGS.get("wait_poll_interval", 0.2)
+            )
             
             logger.info(f"Selenium浏览器初始化成功: {self.browser}")
             return True
@@ -99,131 +314,123 @@ class SeleniumHandler:
             
             return False
     
-    def login_with_cookies(self, url="https://www.xiaohongshu.com"):
+    def session_is_fresh(self):
+        """持久化用户目录中的登录会话是否仍然新鲜"""
+        return bool(self.session_marker and self.session_marker.is_fresh())
+    
+    def login_with_cookies(self, url="https://www.xiaohongshu.com", force=False):
         """
         使用cookie登录小红书
+        
+        Args:
+            url: 登录时访问的页面
+            force: 为True时即使会话新鲜也重新登录（如页面提示受限时）
         """
+        if not force and self.session_is_fresh():
+            logger.info("✅ 持久化会话仍然有效，跳过登录检查")
+            self.startup_stats['login_skipped'] = True
+            return True
+        if self.session_marker:
+            self.session_marker.clear()
+        
         try:
             # 首先访问小红书主页
             self.driver.get(url)
-            time.sleep(2)
+            self._new_page()
+            self.wait_until(document_ready(), 'home_ready')
             
             # 检查是否已经有cookie文件
             if os.path.exists(self.cookies_file):
                 logger.info(f"找到cookie文件: {self.cookies_file}")
                 self.load_cookies()
                 self.driver.refresh()
-                time.sleep(3)
+                
+                # 等到出现头像或登录弹窗，即可判断登录状态
+                self._new_page()
+                self.wait_until(
+                    all_of(document_ready(), any_of(element_present(AVATAR_SELECTOR), popup_visible())),
+                    'login_state', timeout=3
+                )
                 
                 # 检查登录状态
                 if self.is_logged_in():
                     logger.info("✅ 已通过cookie自动登录")
+                    self._mark_session()
                     return True
                 else:
                     logger.info("❌ Cookie已失效，需要重新登录")
             
-            # 如果没有cookie或cookie失效，手动登录
+            # 如果没有cookie或cookie失效，手动登录（扫码期间解除资源拦截，否则二维码无法显示）
+            if self.blocked_types:
+                enable_url_blocking(self.driver, [])
+                self.driver.refresh()
             logger.info("📱 请扫描页面上的二维码登录小红书...")
             logger.info("等待30秒供您扫码登录...")
             
             # 等待用户扫码登录
+            logged_in = False
             for i in range(30):
                 time.sleep(1)
+                self.invalidate_snapshot()
                 if self.is_logged_in():
                     logger.info("✅ 登录成功！")
                     self.save_cookies()
-                    return True
+                    self._mark_session()
+                    logged_in = True
+                    break
                 # 每5秒打印一次等待信息
                 if i % 5 == 0:
                     logger.info(f"等待中... ({i+1}/30秒)")
             
-            logger.warning("⚠️ 登录超时，继续尝试无登录状态访问")
-            return False
+            if self.blocked_types:
+                enable_url_blocking(self.driver, self.blocked_types)
+            
+            if not logged_in:
+                logger.warning("⚠️ 登录超时，继续尝试无登录状态访问")
+            return logged_in
             
         except Exception as e:
             logger.error(f"登录过程中发生错误: {e}")
             return False
     
-    def is_logged_in(self):
+    def _mark_session(self):
+        """记录登录成功，下次热启动时可跳过登录检查"""
+        if self.session_marker:
+            self.session_marker.mark()
+    
+    def is_logged_in(self, status=None):
         """
         检查是否已登录
+        
+        Args:
+            status: probe_page()返回的页面状态，为None时使用当前页面快照
         """
-        try:
-            # 检查是否有登录弹窗
-            login_popup_selectors = [
-                ".login-container",
-                ".login-dialog", 
-                ".login-box",
-                ".login-modal",
-                ".qrcode-login-container",
-                "[class*='login']",
-                "[class*='Login']"
-            ]
-            
-            for selector in login_popup_selectors:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for element in elements:
-                        if element.is_displayed():
-                            logger.debug(f"发现登录弹窗: {selector}")
-                            return False
-                except:
-                    continue
-            
-            # 检查是否有用户头像或登录入口
-            user_avatar_selectors = [
-                ".avatar",
-                ".user-avatar",
-                ".header-avatar",
-                ".nav-avatar",
-                "[class*='avatar']",
-                "[class*='Avatar']"
-            ]
-            
-            for selector in user_avatar_selectors:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if elements:
-                        for element in elements:
-                            if element.is_displayed():
-                                logger.debug(f"发现用户头像: {selector}")
-                                return True
-                except:
-                    continue
-            
-            # 检查页面是否有"登录"字样
-            page_text = self.driver.page_source
-            login_keywords = ["立即登录", "登录后查看", "登录解锁", "请先登录", "登录小红书"]
-            for keyword in login_keywords:
-                if keyword in page_text:
-                    logger.debug(f"发现登录提示: {keyword}")
-                    return False
-                    
-            # 检查是否有搜索框（已登录状态通常显示搜索框）
-            search_box_selectors = [
-                ".search-input",
-                ".search-box",
-                "input[placeholder*='搜索']",
-                "[class*='search']"
-            ]
-            
-            for selector in search_box_selectors:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if elements:
-                        for element in elements:
-                            if element.is_displayed():
-                                logger.debug(f"发现搜索框: {selector}")
-                                return True
-                except:
-                    continue
-            
-            logger.debug("无法确定登录状态，默认返回False")
+        status = status or self.snapshot().status
+        if not status:
             return False
-            
-        except Exception as e:
-            logger.error(f"检查登录状态时出错: {e}")
+        
+        # 检查是否有登录弹窗
+        if status['login_popup']:
+            logger.debug("发现登录弹窗")
             return False
+        
+        # 检查是否有用户头像
+        if status['avatar']:
+            logger.debug("发现用户头像")
+            return True
+        
+        # 检查页面是否有"登录"字样
+        if status['keywords']['login']:
+            logger.debug(f"发现登录提示: {status['keywords']['login'][0]}")
+            return False
+        
+        # 检查是否有搜索框（已登录状态通常显示搜索框）
+        if status['search_box']:
+            logger.debug("发现搜索框")
+            return True
+        
+        logger.debug("无法确定登录状态，默认返回False")
+        return False
     
     def save_cookies(self):
         """
@@ -272,29 +479,30 @@ class SeleniumHandler:
             logger.error(f"加载cookies失败: {e}")
             return False
     
-    def force_login_required(self, url):
+    def force_login_required(self, url, status=None):
         """
         强制要求登录的页面处理
+        
+        Args:
+            url: 页面URL
+            status: probe_page()返回的页面状态，为None时使用当前页面快照
         """
-        try:
-            current_url = self.driver.current_url
-            page_text = self.driver.page_source
-            
-            # 检查是否是登录页面
-            if "passport.xiaohongshu.com" in current_url or "login" in current_url:
-                logger.warning("检测到登录页面，需要重新登录")
-                return True
-                
-            # 检查页面内容是否有登录提示
-            login_keywords = ["登录后查看", "立即登录", "登录解锁", "登录后继续", "请先登录"]
-            for keyword in login_keywords:
-                if keyword in page_text:
-                    logger.warning(f"页面提示需要登录: {keyword}")
-                    return True
-            
-            return False
-        except:
+        status = status or self.snapshot().status
+        if not status:
             return False
+        
+        # 检查是否是登录页面
+        current_url = status['url']
+        if "passport.xiaohongshu.com" in current_url or "login" in current_url:
+            logger.warning("检测到登录页面，需要重新登录")
+            return True
+        
+        # 检查页面内容是否有登录提示
+        if status['keywords']['force_login']:
+            logger.warning(f"页面提示需要登录: {status['keywords']['force_login'][0]}")
+            return True
+        
+        return False
 
     def get_page(self, url, wait_selector=None, timeout=10, max_retries=3):
         """
@@ -312,18 +520,18 @@ class SeleniumHandler:
         for attempt in range(max_retries):
             try:
                 logger.info(f"访问页面 (尝试 {attempt+1}/{max_retries}): {url}")
+                if self.network_capture:
+                    self.network_capture.reset()
+                self.invalidate_snapshot()
                 self.driver.get(url)
+                self._new_page()
                 
                 # 等待页面加载
                 if wait_selector:
-                    try:
-                        WebDriverWait(self.driver, timeout).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, wait_selector))
-                        )
-                    except TimeoutException:
+                    if not self.wait_until(element_present(wait_selector), 'page_selector', timeout):
                         logger.warning(f"等待元素超时: {wait_selector}")
                 else:
-                    time.sleep(3)  # 默认等待3秒
+                    self.wait_until(document_ready(), 'document_ready', min(timeout, 3))
                 
                 # 检查是否被重定向
                 if self.check_page_redirected():
@@ -343,6 +551,9 @@ class SeleniumHandler:
                 # 尝试关闭登录弹窗
                 self.close_login_popup()
                 
+                if SELENIUM_SETTINGS.get("record_page_metrics"):
+                    self.record_page_metrics()
+                
                 return True
                 
             except TimeoutException:
@@ -365,13 +576,23 @@ class SeleniumHandler:
         
         return False
     
-    def close_login_popup(self):
+    def close_login_popup(self, status=None):
         """
         关闭登录弹窗
+        
+        Args:
+            status: probe_page()返回的页面状态，为None时使用当前页面快照
         """
         try:
-            # 等待弹窗出现
-            time.sleep(2)
+            # 探测结果中没有弹窗也没有登录提示时直接返回；有登录提示但弹窗尚未显示时才等待其出现
+            status = status or self.snapshot().status
+            if not status:
+                return False
+            if not status['login_popup']:
+                if not status['keywords']['login']:
+                    return False
+                if not self.wait_until(popup_visible(), 'popup_appear', SELENIUM_SETTINGS.get("popup_wait", 1)):
+                    return False
             
             # 尝试多种关闭方式
             close_selectors = [
@@ -394,14 +615,13 @@ class SeleniumHandler:
                             try:
                                 btn.click()
                                 logger.info(f"找到登录弹窗关闭按钮: {selector}")
-                                time.sleep(1)
-                                return True
                             except:
                                 # 如果点击失败，尝试使用JavaScript点击
                                 self.driver.execute_script("arguments[0].click();", btn)
                                 logger.info(f"使用JS点击关闭按钮: {selector}")
-                                time.sleep(1)
-                                return True
+                            self.invalidate_snapshot()
+                            self.wait_until(popup_gone(), 'popup_gone', timeout=1)
+                            return True
                 except:
                     continue
             
@@ -410,7 +630,8 @@ class SeleniumHandler:
                 from selenium.webdriver.common.keys import Keys
                 self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
                 logger.info("尝试按ESC键关闭弹窗")
-                time.sleep(1)
+                self.invalidate_snapshot()
+                return self.wait_until(popup_gone(), 'popup_gone', timeout=1)
             except:
                 pass
             
@@ -422,59 +643,77 @@ class SeleniumHandler:
     
     def extract_images(self, selector="img"):
         """
-        提取页面中的图片
+        提取页面中的图片URL
+        
+        Args:
+            selector: 图片CSS选择器
+        
+        Returns:
+            图片URL列表（已过滤图标并去重）
+        """
+        images = self.collect_images(selector)
+        logger.info(f"提取到 {len(images)} 张图片")
+        return [image['url'] for image in images]
+    
+    def collect_images(self, selector="img", min_size=0, visible_only=False):
+        """
+        一次往返收集页面中的图片信息
+        
+        在浏览器内读取src、data-src、srcset（取最大的候选）、原始尺寸和可见性，
+        并按与解析器相同的关键词过滤图标、头像等图片
+        
+        Args:
+            selector: 图片CSS选择器
+            min_size: 已加载图片的长边小于该像素数时跳过（0表示不限制）
+            visible_only: 是否只保留可见的图片
+        
+        Returns:
+            图片列表：{'url', 'caption', 'width', 'height', 'visible'}
         """
         try:
-            images = self.driver.find_elements(By.CSS_SELECTOR, selector)
-            img_urls = []
-            
-            for img in images:
-                src = img.get_attribute('src')
-                if src and src.startswith('http'):
-                    img_urls.append(src)
-            
-            logger.info(f"提取到 {len(img_urls)} 张图片")
-            return img_urls
-            
+            images = self.driver.execute_script(
+                COLLECT_IMAGES_SCRIPT, selector, IMAGE_SKIP_KEYWORDS, min_size
+            ) or []
         except Exception as e:
             logger.error(f"提取图片时出错: {e}")
             return []
-    def check_page_redirected(self):
+        
+        if visible_only:
+            images = [image for image in images if image.get('visible')]
+        return images
+    
+    def check_page_redirected(self, status=None):
         """
         检查页面是否被重定向（反爬措施）
 
+        Args:
+            status: probe_page()返回的页面状态，为None时使用当前页面快照
+
         Returns:
             True如果被重定向，False如果正常
         """
-        try:
-            current_url = self.driver.current_url
-            
-            # 检查是否是首页（被重定向）
-            if current_url == "https://www.xiaohongshu.com/" or "xiaohongshu.com/?redirect" in current_url:
-                logger.warning("页面被重定向到首页（反爬机制）")
-                return True
-            
-            # 检查页面内容是否有"页面不见了"等提示
-            page_text = self.driver.page_source
-            blocked_keywords = ["页面不见了", "访问的页面不存在", "访问异常", "您访问的页面"]
-            
-            for keyword in blocked_keywords:
-                if keyword in page_text:
-                    logger.warning(f"检测到页面异常：{keyword}")
-                    return True
-            
-            # 检查是否显示搜索结果
-            if "search_result" in current_url:
-                # 应该有搜索结果
-                if "feeds-container" not in self.driver.page_source:
-                    logger.warning("搜索结果页面没有内容")
-                    return True
-            
-            return False
-            
-        except Exception as e:
-            logger.error(f"检查页面重定向时出错: {e}")
+        status = status or self.snapshot().status
+        if not status:
             return False
+        
+        current_url = status['url']
+        
+        # 检查是否是首页（被重定向）
+        if current_url == "https://www.xiaohongshu.com/" or "xiaohongshu.com/?redirect" in current_url:
+            logger.warning("页面被重定向到首页（反爬机制）")
+            return True
+        
+        # 检查页面内容是否有"页面不见了"等提示
+        if status['keywords']['blocked']:
+            logger.warning(f"检测到页面异常：{status['keywords']['blocked'][0]}")
+            return True
+        
+        # 检查是否显示搜索结果
+        if "search_result" in current_url and not status['feed_container']:
+            logger.warning("搜索结果页面没有内容")
+            return True
+        
+        return False
 
     def handle_page_redirect(self, original_url=None):
         """
@@ -491,7 +730,8 @@ class SeleniumHandler:
             
             # 1. 先刷新页面
             self.driver.refresh()
-            time.sleep(3)
+            self._new_page()
+            self.wait_until(document_ready(), 'redirect_refresh', timeout=3)
             
             # 2. 如果仍然被重定向，尝试重新登录
             if self.check_page_redirected():
@@ -502,14 +742,14 @@ class SeleniumHandler:
                 
                 # 清除cookies重新登录
                 self.driver.delete_all_cookies()
-                time.sleep(2)
                 
                 # 重新访问小红书
                 self.driver.get("https://www.xiaohongshu.com")
-                time.sleep(3)
+                self._new_page()
+                self.wait_until(document_ready(), 'home_ready', timeout=3)
                 
                 # 重新登录
-                login_success = self.login_with_cookies()
+                login_success = self.login_with_cookies(force=True)
                 
                 if login_success and original_url:
                     # 重新访问原始URL
@@ -596,6 +836,7 @@ class SeleniumHandler:
                 time.sleep(random.uniform(0.1, 0.3))
             
             # 随机滚动
+            self.invalidate_snapshot()
             for _ in range(random.randint(1, 3)):
                 scroll_amount = random.randint(200, 800)
                 self.driver.execute_script(f"window.scrollBy(0, {scroll_amount});")
@@ -617,11 +858,136 @@ class SeleniumHandler:
         try:
             # 使用JavaScript滚动页面
             self.driver.execute_script(f"window.scrollBy(0, {pixels});")
+            self.invalidate_snapshot()
             time.sleep(duration)
             logger.info(f"页面滚动 {pixels} 像素")
         except Exception as e:
             logger.error(f"滚动页面失败: {e}")
 
+    def probe_page(self):
+        """
+        单次往返探测页面状态
+        
+        Returns:
+            状态字典：url, login_popup, avatar, search_box, feed_container,
+            keywords（login/force_login/blocked各自命中的关键词）；探测失败返回None
+        """
+        try:
+            return self.driver.execute_script(
+                PAGE_PROBE_SCRIPT,
+                {
+                    'login_popup': LOGIN_POPUP_SELECTORS,
+                    'avatar': AVATAR_SELECTORS,
+                    'search_box': SEARCH_BOX_SELECTORS,
+                },
+                PAGE_KEYWORDS
+            )
+        except Exception as e:
+            logger.error(f"探测页面状态失败: {e}")
+            return None
+    
+    def record_page_metrics(self):
+        """
+        记录当前页面的传输量和加载时间
+        
+        Returns:
+            本页面的指标字典，获取失败时返回None
+        """
+        try:
+            metrics = self.driver.execute_script(PAGE_METRICS_SCRIPT)
+            self.page_metrics.record(metrics)
+            return metrics
+        except Exception as e:
+            logger.debug(f"获取页面指标失败: {e}")
+            return None
+    
+    def capture_api_responses(self, kind=None):
+        """
+        获取当前页面加载以来捕获的接口响应
+        
+        Args:
+            kind: 接口类型（search, feed, homefeed），为None时返回全部
+        
+        Returns:
+            响应列表：{'kind', 'url', 'data'}；未开启捕获时为空列表
+        """
+        if not self.network_capture:
+            return []
+        return self.network_capture.drain(kind)
+    
+    def wait_until(self, condition, name, timeout=None):
+        """
+        等待页面就绪条件
+        
+        Args:
+            condition: readiness模块中的等待条件
+            name: 等待名称（用于统计耗时）
+            timeout: 本次等待上限，不超过当前页面剩余的延迟预算
+        
+        Returns:
+            条件是否满足
+        """
+        ready = self.waiter.wait(condition, name, timeout)
+        if self.waiter.changes != self._wait_changes:
+            # 条件经过等待才满足，说明DOM已变化，旧快照作废
+            self._wait_changes = self.waiter.changes
+            self.invalidate_snapshot()
+        return ready
+    
+    def snapshot(self):
+        """
+        获取当前页面快照
+        
+        同一次导航或DOM变化周期内返回同一个对象，page_source和页面状态最多各拉取一次
+        
+        Returns:
+            PageSnapshot实例
+        """
+        if self._snapshot is None or self._snapshot.epoch != self._snapshot_epoch:
+            self._snapshot = PageSnapshot(self.driver, self._snapshot_epoch, self.probe_page, self.snapshot_stats)
+        return self._snapshot
+    
+    def invalidate_snapshot(self):
+        """页面导航或DOM发生变化后作废当前快照"""
+        self._snapshot_epoch += 1
+    
+    def snapshot_report(self):
+        """page_source和页面状态的拉取、复用次数及省下的传输量"""
+        return self.snapshot_stats.report()
+    
+    def _new_page(self):
+        """开始新页面：重置延迟预算并作废快照"""
+        self.waiter.new_page()
+        self.invalidate_snapshot()
+    
+    def readiness_report(self):
+        """各类就绪等待的次数和耗时"""
+        return self.waiter.report() if self.waiter else {}
+    
+    def collect_new_feed_cards(self, selector=FEED_CARD_SELECTOR):
+        """
+        获取上次调用以来新出现的笔记卡片
+        
+        只传输新卡片的outerHTML，而不是整个page_source
+        
+        Args:
+            selector: 卡片CSS选择器
+            
+        Returns:
+            (新卡片outerHTML列表, 页面当前卡片总数)
+        """
+        try:
+            result = self.driver.execute_script(COLLECT_NEW_CARDS_SCRIPT, selector, CARD_MARKER) or {}
+            fresh = result.get('fresh') or []
+            if fresh:
+                # 新卡片被打上已收集标记，页面源码随之变化
+                self.invalidate_snapshot()
+            logger.debug(f"新增卡片 {len(fresh)} 个，页面共 {result.get('total', 0)} 个")
+            return fresh, result.get('total', 0)
+        except Exception as e:
+            logger.error(f"获取新增卡片失败: {e}")
+            return [], 0
+    
     def extract_image_urls(self):
         """
         提取页面中的图片URL
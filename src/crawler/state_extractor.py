@@ -0,0 +1,123 @@
+"""
+页面状态提取器模块
+直接从页面源码中定位window.__INITIAL_STATE__，按括号配对截取对象并容错解码
+"""
+
+import re
+import json
+from typing import Any, Dict, Optional, Tuple
+
+
+STATE_MARKER = 'window.__INITIAL_STATE__'
+
+# 括号扫描：整体跳过字符串，只关心花括号
+_SCAN_PATTERN = re.compile(
+    r'"[^"\\]*(?:\\.[^"\\]*)*"'
+    r"|'[^'\\]*(?:\\.[^'\\]*)*'"
+    r'|[{}]',
+    re.DOTALL
+)
+
+# JS字面量修正：字符串原样保留，其余替换为合法JSON
+_JS_LITERAL_PATTERN = re.compile(
+    r'"[^"\\]*(?:\\.[^"\\]*)*"'
+    r"|'[^'\\]*(?:\\.[^'\\]*)*'"
+    r'|-?\bInfinity\b|\bundefined\b|\bNaN\b'
+    r'|,(?=\s*[}\]])',
+    re.DOTALL
+)
+
+
+def find_object_span(text: str, marker: str = STATE_MARKER) -> Optional[Tuple[int, int]]:
+    """
+    定位赋值给marker的对象字面量位置
+
+    Args:
+        text: 页面源码或脚本文本
+        marker: 赋值语句左侧的标识
+
+    Returns:
+        (起始位置, 结束位置)，找不到或对象不完整时返回None
+    """
+    pos = text.find(marker)
+    while pos != -1:
+        start = pos + len(marker)
+        # 跳过空白和等号
+        while start < len(text) and text[start] in ' \t\r\n=':
+            start += 1
+
+        if start < len(text) and text[start] == '{':
+            depth = 0
+            for match in _SCAN_PATTERN.finditer(text, start):
+                token = match.group(0)
+                if token == '{':
+                    depth += 1
+                elif token == '}':
+                    depth -= 1
+                    if depth == 0:
+                        return start, match.end()
+            return None
+
+        pos = text.find(marker, pos + len(marker))
+
+    return None
+
+
+def _replace_js_literal(match) -> str:
+    """将单个JS字面量转换为JSON写法"""
+    token = match.group(0)
+    if token.startswith('"'):
+        return token
+    if token.startswith("'"):
+        inner = token[1:-1].replace("\\'", "'").replace('"', '\\"')
+        return f'"{inner}"'
+    if token == ',':
+        return ''
+    return 'null'
+
+
+def decode_js_object(text: str) -> Any:
+    """
+    解码JS对象字面量，兼容undefined、NaN、Infinity、单引号字符串和尾随逗号
+
+    Args:
+        text: 对象字面量文本
+
+    Returns:
+        解码后的Python对象
+
+    Raises:
+        ValueError: 修正后仍无法解析
+    """
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+
+    return json.loads(_JS_LITERAL_PATTERN.sub(_replace_js_literal, text))
+
+
+def extract_initial_state(page_source: str, marker: str = STATE_MARKER) -> Optional[Dict[str, Any]]:
+    """
+    从页面源码中提取window.__INITIAL_STATE__
+
+    Args:
+        page_source: 页面HTML源代码
+        marker: 状态变量标识
+
+    Returns:
+        状态字典，提取或解码失败返回None
+    """
+    if not page_source:
+        return None
+
+    span = find_object_span(page_source, marker)
+    if not span:
+        return None
+
+    try:
+        state = decode_js_object(page_source[span[0]:span[1]])
+    except ValueError:
+        return None
+
+    return state if isinstance(state, dict) else None
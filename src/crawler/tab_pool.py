@@ -0,0 +1,259 @@
+"""
+多标签页并发模块
+在同一个浏览器（共享登录cookie）中打开多个标签页并行加载页面，
+driver只在标签页之间切换以检查就绪状态和取回已加载完成的页面
+"""
+
+import time
+import random
+import logging
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.crawler.readiness import Condition, any_of, document_ready, element_present, state_script_present
+
+logger = logging.getLogger(__name__)
+
+# 记下当前文档的标记后跳转，新文档中没有该标记即说明已开始加载目标页面
+NAVIGATE_SCRIPT = """
+window.__xhsTabToken = arguments[1];
+window.location.href = arguments[0];
+"""
+
+NAVIGATED_SCRIPT = "return window.__xhsTabToken === undefined && document.readyState !== 'loading';"
+
+STOP_SCRIPT = "window.stop();"
+
+
+def note_ready() -> Condition:
+    """笔记详情页的页面状态或正文已渲染"""
+    return any_of(state_script_present(), element_present('.note-content, #detail-desc'))
+
+
+class TabPool:
+    """单浏览器多标签页工作池"""
+
+    def __init__(self, handler, size: int = 3, page_timeout: float = 15, min_interval: float = 1.5,
+                 jitter: float = 1.0, poll_interval: float = 0.2):
+        """
+        初始化标签页池
+
+        Args:
+            handler: SeleniumHandler实例（已初始化并登录）
+            size: 标签页数量（包含原有的标签页）
+            page_timeout: 单个页面从开始加载到就绪的上限（秒）
+            min_interval: 两次开始加载页面之间的最小间隔（秒），避免同时发出过多请求
+            jitter: 在最小间隔之上追加的随机间隔上限（秒）
+            poll_interval: 所有标签页都未就绪时的轮询间隔（秒）
+        """
+        self.handler = handler
+        self.size = max(1, size)
+        self.page_timeout = page_timeout
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self.poll_interval = poll_interval
+
+        self.main_handle = None
+        self.handles: List[str] = []
+        self.stats: Dict[str, Any] = {
+            'processed': 0,
+            'failed': 0,
+            'timeouts': 0,
+            'skipped': 0,     # 满足停止条件时放弃的正在加载的页面
+            'switches': 0,
+            'tabs': {},
+        }
+
+    @property
+    def driver(self):
+        return self.handler.driver
+
+    def open(self) -> int:
+        """
+        打开标签页
+
+        Returns:
+            可用的标签页数量
+        """
+        self.main_handle = self.driver.current_window_handle
+        self.handles = [self.main_handle]
+        try:
+            for _ in range(self.size - 1):
+                self.driver.switch_to.new_window('tab')
+                self.handles.append(self.driver.current_window_handle)
+        except Exception as e:
+            logger.warning(f"打开标签页失败，使用 {len(self.handles)} 个标签页: {e}")
+        finally:
+            self._switch(self.main_handle)
+
+        for index in range(len(self.handles)):
+            self.stats['tabs'].setdefault(index, {'pages': 0, 'timeouts': 0, 'total_seconds': 0.0, 'max_seconds': 0.0})
+        logger.info(f"已打开 {len(self.handles)} 个标签页")
+        return len(self.handles)
+
+    def run(self, items, url_of: Callable[[Any], str], collect: Callable[[Any, Any], Any],
+            ready: Optional[Condition] = None,
+            should_stop: Optional[Callable[[], bool]] = None) -> List[Tuple[Any, Any]]:
+        """
+        在各标签页中并行加载页面，就绪后依次取回
+
+        Args:
+            items: 任务列表（如笔记信息）
+            url_of: 返回任务对应页面URL的函数
+            collect: 页面就绪后调用的函数，参数为(SeleniumHandler, 任务)，此时driver位于该标签页
+            ready: 页面就绪条件，默认为笔记详情页就绪
+            should_stop: 返回True时不再开始加载新页面，也不再取回正在加载的页面
+
+        Returns:
+            (任务, 结果)列表，按完成顺序排列；超时或失败的任务不在其中
+        """
+        if not self.handles:
+            raise RuntimeError("标签页池未打开")
+
+        ready = ready or note_ready()
+        pending = deque(items)
+        idle = deque(range(len(self.handles)))
+        # 标签页序号 -> (任务, 开始加载时间)
+        active: Dict[int, Tuple[Any, float]] = {}
+        results: List[Tuple[Any, Any]] = []
+        next_start = 0.0
+
+        try:
+            while active or pending:
+                if should_stop and should_stop():
+                    self._abandon(active)
+                    break
+                
+                # 空闲标签页开始加载下一个页面
+                while idle and pending and not (should_stop and should_stop()):
+                    wait = next_start - time.monotonic()
+                    if wait > 0 and active:
+                        break
+                    if wait > 0:
+                        time.sleep(wait)
+                    index = idle.popleft()
+                    item = pending.popleft()
+                    if self._navigate(index, url_of(item)):
+                        active[index] = (item, time.monotonic())
+                    else:
+                        self.stats['failed'] += 1
+                        idle.append(index)
+                    next_start = time.monotonic() + self.min_interval + random.uniform(0, self.jitter)
+
+                # 检查正在加载的标签页，取回已就绪的页面
+                collected = False
+                for index, (item, started) in list(active.items()):
+                    if collected and should_stop and should_stop():
+                        break
+                    elapsed = time.monotonic() - started
+                    self._switch(self.handles[index])
+                    if self._is_ready(ready):
+                        del active[index]
+                        idle.append(index)
+                        self._record(index, time.monotonic() - started)
+                        try:
+                            results.append((item, collect(self.handler, item)))
+                            self.stats['processed'] += 1
+                        except Exception as e:
+                            logger.error(f"标签页 {index} 处理页面失败: {e}")
+                            self.stats['failed'] += 1
+                        collected = True
+                    elif elapsed >= self.page_timeout:
+                        logger.warning(f"标签页 {index} 加载超时: {url_of(item)}")
+                        del active[index]
+                        idle.append(index)
+                        self._record(index, elapsed, timeout=True)
+
+                if active and not collected:
+                    time.sleep(self.poll_interval)
+        finally:
+            self._switch(self.main_handle)
+
+        return results
+
+    def _abandon(self, active: Dict[int, Tuple[Any, float]]):
+        """停止正在加载的标签页，这些页面不再解析"""
+        if not active:
+            return
+        logger.info(f"已满足停止条件，放弃 {len(active)} 个正在加载的页面")
+        for index in list(active):
+            try:
+                self._switch(self.handles[index])
+                self.driver.execute_script(STOP_SCRIPT)
+            except Exception as e:
+                logger.debug(f"标签页 {index} 停止加载失败: {e}")
+        self.stats['skipped'] += len(active)
+        active.clear()
+
+    def _navigate(self, index: int, url: str) -> bool:
+        """在指定标签页开始加载页面，不等待加载完成"""
+        try:
+            self._switch(self.handles[index])
+            self.driver.execute_script(NAVIGATE_SCRIPT, url, f"{index}-{time.monotonic()}")
+            return True
+        except Exception as e:
+            logger.error(f"标签页 {index} 跳转失败: {e}")
+            return False
+
+    def _is_ready(self, ready: Condition) -> bool:
+        """当前标签页已跳转到新页面且满足就绪条件"""
+        try:
+            return bool(self.driver.execute_script(NAVIGATED_SCRIPT)) and bool(ready(self.driver))
+        except Exception:
+            return False
+
+    def _switch(self, handle: str):
+        """切换标签页，切换后当前页面快照作废"""
+        if handle is None:
+            return
+        self.driver.switch_to.window(handle)
+        self.handler.invalidate_snapshot()
+        self.stats['switches'] += 1
+
+    def _record(self, index: int, seconds: float, timeout: bool = False):
+        """记录标签页加载耗时"""
+        tab = self.stats['tabs'][index]
+        if timeout:
+            tab['timeouts'] += 1
+            self.stats['timeouts'] += 1
+            return
+        tab['pages'] += 1
+        tab['total_seconds'] += seconds
+        tab['max_seconds'] = max(tab['max_seconds'], seconds)
+
+    def report(self) -> Dict[str, Any]:
+        """标签页池统计"""
+        return {
+            'size': len(self.handles),
+            'processed': self.stats['processed'],
+            'failed': self.stats['failed'],
+            'timeouts': self.stats['timeouts'],
+            'skipped': self.stats['skipped'],
+            'switches': self.stats['switches'],
+            'tabs': {
+                index: {
+                    'pages': tab['pages'],
+                    'timeouts': tab['timeouts'],
+                    'avg_seconds': round(tab['total_seconds'] / tab['pages'], 2) if tab['pages'] else 0,
+                    'max_seconds': round(tab['max_seconds'], 2),
+                }
+                for index, tab in self.stats['tabs'].items()
+            },
+        }
+
+    def close(self):
+        """关闭额外打开的标签页，回到原标签页"""
+        for handle in self.handles:
+            if handle == self.main_handle:
+                continue
+            try:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            except Exception as e:
+                logger.debug(f"关闭标签页失败: {e}")
+        self.handles = []
+        if self.main_handle:
+            try:
+                self._switch(self.main_handle)
+            except Exception as e:
+                logger.debug(f"切换回原标签页失败: {e}")
@@ -0,0 +1,102 @@
+"""
+浏览器热启动模块
+从本地缓存解析ChromeDriver路径（不访问网络），并记录持久化用户目录中的登录会话是否仍然新鲜
+"""
+
+import time
+import shutil
+import logging
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from config.settings import BASE_DIR, DATA_DIR
+from src.utils.helper import safe_json_dump, safe_json_load
+
+logger = logging.getLogger(__name__)
+
+# 上次成功使用的驱动路径
+DRIVER_CACHE_FILE = DATA_DIR / "webdriver_cache.json"
+
+# 项目根目录下手动放置的驱动（见install_chromedriver.py）
+LOCAL_DRIVER_NAMES = ('chromedriver.exe', 'chromedriver')
+
+
+def resolve_driver_path(explicit_path: Optional[Union[str, Path]] = None,
+                        cache_file: Union[str, Path] = DRIVER_CACHE_FILE) -> Tuple[Optional[str], str]:
+    """
+    在本地解析ChromeDriver路径，不访问网络
+
+    依次尝试：配置中指定的路径、上次成功使用的路径、项目根目录下的驱动、PATH中的驱动
+
+    Args:
+        explicit_path: 配置中指定的驱动路径
+        cache_file: 驱动路径缓存文件
+
+    Returns:
+        (驱动路径, 来源)；找不到时路径为None
+    """
+    if explicit_path and Path(explicit_path).is_file():
+        return str(explicit_path), 'settings'
+
+    cached = safe_json_load(Path(cache_file))
+    if isinstance(cached, dict) and cached.get('path') and Path(cached['path']).is_file():
+        return cached['path'], 'cache'
+
+    for name in LOCAL_DRIVER_NAMES:
+        local_path = Path(BASE_DIR) / name
+        if local_path.is_file():
+            return str(local_path), 'local'
+
+    found = shutil.which('chromedriver')
+    if found:
+        return found, 'path'
+
+    return None, 'none'
+
+
+def cache_driver_path(path: str, cache_file: Union[str, Path] = DRIVER_CACHE_FILE) -> bool:
+    """记录成功使用的驱动路径"""
+    return safe_json_dump({'path': str(path), 'cached_at': time.time()}, Path(cache_file))
+
+
+def clear_driver_cache(cache_file: Union[str, Path] = DRIVER_CACHE_FILE):
+    """驱动与浏览器版本不匹配时清除缓存"""
+    Path(cache_file).unlink(missing_ok=True)
+
+
+class SessionMarker:
+    """持久化用户目录中的登录会话标记"""
+
+    FILENAME = 'xhs_session.json'
+
+    def __init__(self, profile_dir: Union[str, Path], ttl_hours: float = 6):
+        """
+        初始化会话标记
+
+        Args:
+            profile_dir: 浏览器用户目录
+            ttl_hours: 登录成功后多少小时内视为会话新鲜
+        """
+        self.path = Path(profile_dir) / self.FILENAME
+        self.ttl_seconds = ttl_hours * 3600
+
+    def age(self) -> Optional[float]:
+        """距上次登录成功的秒数，没有记录时返回None"""
+        data = safe_json_load(self.path)
+        if not isinstance(data, dict) or not data.get('logged_in_at'):
+            return None
+        return time.time() - data['logged_in_at']
+
+    def is_fresh(self) -> bool:
+        """会话是否仍在有效期内"""
+        age = self.age()
+        return age is not None and 0 <= age < self.ttl_seconds
+
+    def mark(self):
+        """记录一次登录成功"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        safe_json_dump({'logged_in_at': time.time()}, self.path)
+
+    def clear(self):
+        """会话失效时清除标记"""
+        self.path.unlink(missing_ok=True)
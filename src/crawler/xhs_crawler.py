@@ -1,19 +1,29 @@
 import time
 import json
-##import random##
+import heapq
+import random
 import logging
+import threading
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
 from config.settings import (
     CRAWLER_SETTINGS, FILTER_RULES, COMICS_DIR,
-    SELENIUM_SETTINGS, TAGS
+    SELENIUM_SETTINGS, PARSER_SETTINGS, TAGS
 )
 from config.constants import DATA_TEMPLATE
 from src.crawler.selenium_handler import SeleniumHandler
+from src.crawler.readiness import feed_populated
+from src.crawler.driver_pool import DriverPool
+from src.crawler.scroll_harvester import ScrollHarvester
+from src.crawler.tab_pool import TabPool, note_ready
 from src.crawler.parser import XHSParser
+from src.crawler.page_cache import ParsedPage
 from src.crawler.request_handler import RequestHandler
+from src.crawler.download_engine import DownloadEngine
+from src.storage.image_store import ImageStore
 from src.utils.helper import generate_id, safe_json_dump, format_timestamp
+from src.utils.keyword_matcher import get_theme_matcher
 from src.utils.logger import setup_logger
 
 logger = logging.getLogger(__name__)
@@ -35,6 +45,17 @@ class SimpleXHSCrawler:
         self.selenium_handler = None
         self.parser = None
         self.request_handler = None
+        self.download_engine = None
+        self.image_store = None
+        self.driver_pool = None
+        self.tab_pool = None
+        
+        # 工作池并发处理笔记时保护编号、名额和收集结果；解析和保存（下载图片）在锁外并发进行
+        self._lock = threading.Lock()
+        self._annotations_lock = threading.Lock()
+        self._pending_comics = 0  # 已预留名额、正在保存的连环画数
+        self._next_comic_number = 1
+        self._free_comic_numbers: List[int] = []  # 保存失败后归还的编号（小顶堆）
         
         # 数据存储
         self.collected_comics = []
@@ -42,8 +63,11 @@ class SimpleXHSCrawler:
             'total_found': 0,
             'total_collected': 0,
             'start_time': None,
-            'end_time': None
+            'end_time': None,
+            'first_search_seconds': None,  # 从开始爬取到第一个搜索页加载完成的时间
+            'scroll_harvest': {},  # 关键词 -> 滚动收集统计
         }
+        self._crawl_started = None
         
         # 初始化日志
         self.logger = setup_logger("xhs_crawler")
@@ -62,11 +86,19 @@ class SimpleXHSCrawler:
                 self.logger.error("Selenium浏览器初始化失败")
                 return False
             
-            # 初始化解析器
-            self.parser = XHSParser()
+            # 初始化解析器（选择器统计跨运行持久化）
+            self.parser = XHSParser(stats_file=PARSER_SETTINGS["selector_stats_file"])
             
             # 初始化请求处理器
             self.request_handler = RequestHandler()
+            self.download_engine = DownloadEngine(self.request_handler, download_root=COMICS_DIR)
+            
+            # 初始化内容寻址图片存储
+            if CRAWLER_SETTINGS.get("image_store"):
+                self.image_store = ImageStore(
+                    CRAWLER_SETTINGS["image_store_dir"],
+                    CRAWLER_SETTINGS.get("cdn_hosts", ["xhscdn.com"])
+                )
             
             self.logger.info("所有组件初始化成功")
             return True
@@ -83,6 +115,7 @@ class SimpleXHSCrawler:
             爬取报告，失败返回None
         """
         self.stats['start_time'] = format_timestamp()
+        self._crawl_started = time.perf_counter()
         self.logger.info("开始爬取流程")
         
         # 初始化组件
@@ -94,6 +127,10 @@ class SimpleXHSCrawler:
             if not self.login_xiaohongshu():
                 self.logger.warning("登录失败或未完全登录，继续尝试爬取")
             
+            # 登录后cookie文件已更新，工作池中的浏览器共享这份cookie
+            self._start_driver_pool()
+            self._open_tab_pool()
+            
             # 搜索关键词并爬取
             keywords = CRAWLER_SETTINGS["search_keywords"]
             self.logger.info(f"搜索关键词: {keywords}")
@@ -172,6 +209,10 @@ class SimpleXHSCrawler:
                         self.logger.error(f"重试 {max_attempts} 次后仍然失败")
                         return
                 
+                if self.stats['first_search_seconds'] is None and self._crawl_started is not None:
+                    self.stats['first_search_seconds'] = round(time.perf_counter() - self._crawl_started, 3)
+                    self.logger.info(f"启动到首个搜索页耗时 {self.stats['first_search_seconds']} 秒")
+                
                 # 检查页面是否正常
                 if self.selenium_handler.check_page_redirected():
                     self.logger.warning(f"页面被重定向，尝试恢复...")
@@ -188,29 +229,35 @@ class SimpleXHSCrawler:
                         self.logger.error(f"重试 {max_attempts} 次后仍然被重定向")
                         return
                 
-                # 等待页面加载
-                time.sleep(5)  # 增加到5秒
+                # 等待搜索结果卡片渲染
+                self.selenium_handler.wait_until(feed_populated(), 'search_feed', timeout=5)
                 
                 # 检查登录状态
                 if not self.selenium_handler.is_logged_in():
                     self.logger.warning(f"搜索'{keyword}'时可能受限，尝试重新登录")
-                    self.selenium_handler.login_with_cookies(search_url)
+                    self.selenium_handler.login_with_cookies(search_url, force=True)
+                
+                # 获取一次页面源码，供解析共享
+                page = self._current_page(search_url)
+                
+                # 优先使用捕获到的搜索接口JSON
+                notes = self._notes_from_captured_search(keyword)
+                
+                # 增量模式：滚动加载并只解析新增卡片
+                if not notes and CRAWLER_SETTINGS.get("incremental_search"):
+                    notes = self._harvest_search_notes(keyword)
                 
-                # 获取页面源码
-                page_source = self.selenium_handler.driver.page_source
                 # 方法1: 主解析方法
-                notes = self.parser.parse_search_results_direct(page_source, keyword)
+                if not notes:
+                    notes = self.parser.parse_search_results_direct(page, keyword)
     
                 # 方法2: 如果主方法失败，使用简单方法
                 if not notes:
                     self.logger.warning("主解析方法失败，尝试简单方法...")
-                    notes = self.parser.parse_search_results_simple(page_source, keyword)
+                    notes = self.parser.parse_search_results_simple(page, keyword)
                 
                 # 保存页面源码用于调试
-                self._save_page_for_debug(page_source, keyword)
-                
-                # 解析搜索结果
-                notes = self.parser.parse_search_results_direct(page_source, keyword)
+                self._save_page_for_debug(page.text, keyword)
                 
                 self.logger.info(f"解析到 {len(notes)} 个笔记")
                 
@@ -219,13 +266,27 @@ class SimpleXHSCrawler:
                     return
                 
                 # 处理每个笔记
-                for note in notes:
-                    if len(self.collected_comics) >= self.max_comics:
-                        break
-                    
-                    # 添加随机延迟，避免请求过快
-                    time.sleep(random.uniform(1, 3))
-                    self.process_note(note)
+                if self.driver_pool:
+                    self.driver_pool.run(
+                        notes,
+                        lambda handler, note: self.process_note(note, handler),
+                        should_stop=lambda: len(self.collected_comics) >= self.max_comics
+                    )
+                elif self.tab_pool:
+                    self.tab_pool.run(
+                        notes,
+                        url_of=lambda note: f"https://www.xiaohongshu.com/explore/{note['note_id']}",
+                        collect=lambda handler, note: self._finish_note(note, handler, use_capture=False),
+                        should_stop=lambda: len(self.collected_comics) >= self.max_comics
+                    )
+                else:
+                    for note in notes:
+                        if len(self.collected_comics) >= self.max_comics:
+                            break
+                        
+                        # 添加随机延迟，避免请求过快
+                        time.sleep(random.uniform(1, 3))
+                        self.process_note(note)
                 
                 # 成功完成搜索，退出重试循环
                 break
@@ -240,19 +301,99 @@ class SimpleXHSCrawler:
                 else:
                     self.logger.error(f"重试 {max_attempts} 次后仍然失败")
                     return
-    def _scroll_page_for_more_content(self):
-        """滚动页面加载更多内容"""
-        try:
-            # 滚动3次以加载更多内容
-            for i in range(3):
-                self.selenium_handler.driver.execute_script(
-                    "window.scrollTo(0, document.body.scrollHeight);"
-                )
-                time.sleep(2)  # 等待加载
-                self.logger.info(f"第{i+1}次滚动页面")
-        except Exception as e:
-            self.logger.debug(f"滚动页面失败: {e}")
-
+    
+    def _notes_from_captured_search(self, keyword: str) -> List[Dict[str, Any]]:
+        """
+        从捕获的搜索接口响应中解析笔记
+        
+        Args:
+            keyword: 搜索关键词
+            
+        Returns:
+            去重后的笔记列表，没有捕获到响应时为空
+        """
+        notes = []
+        seen_ids = set()
+        for response in self.selenium_handler.capture_api_responses('search'):
+            for note_info in self.parser.parse_feed_response(response['data'], keyword):
+                if note_info['note_id'] not in seen_ids:
+                    seen_ids.add(note_info['note_id'])
+                    notes.append(note_info)
+        
+        if notes:
+            self.logger.info(f"从搜索接口响应中解析到 {len(notes)} 个笔记")
+        return notes
+    
+    def _harvest_search_notes(self, keyword: str) -> List[Dict[str, Any]]:
+        """
+        滚动搜索结果页，每次只解析新增的卡片
+        
+        Args:
+            keyword: 搜索关键词
+            
+        Returns:
+            按出现顺序排列的相关笔记列表
+        """
+        seen_ids = set()
+        harvester = ScrollHarvester(
+            self.selenium_handler,
+            target=CRAWLER_SETTINGS.get("search_note_target", 50),
+            max_scrolls=CRAWLER_SETTINGS["max_scroll_attempts"],
+            scroll_wait=CRAWLER_SETTINGS["scroll_pause_time"],
+            time_budget=CRAWLER_SETTINGS.get("scroll_time_budget", 30),
+            no_growth_rounds=CRAWLER_SETTINGS.get("scroll_no_growth_rounds", 2)
+        )
+        notes = harvester.harvest(
+            lambda fragments: self.parser.parse_search_fragments(fragments, keyword, seen_ids)
+        )
+        self.stats['scroll_harvest'][keyword] = harvester.stats
+        return notes
+    
+    def _current_page(self, url: str = '', handler: Optional[SeleniumHandler] = None) -> ParsedPage:
+        """获取当前页面对象：同一DOM周期内复用快照中的源码，内容未变化时复用已有的解析结果"""
+        page = (handler or self.selenium_handler).snapshot().page_for('parser')
+        if url and not page.url:
+            page.url = url
+        if self.parser.parse_cache:
+            return self.parser.parse_cache.get_page(page, url)
+        return page
+    
+    def _start_driver_pool(self):
+        """按配置启动浏览器工作池，启动失败时退回单浏览器顺序处理"""
+        pool_size = SELENIUM_SETTINGS.get("pool_size", 1)
+        if pool_size <= 1:
+            return
+        
+        pool = DriverPool(
+            size=pool_size,
+            headless=self.headless,
+            min_interval=SELENIUM_SETTINGS.get("worker_min_interval", 3),
+            jitter=SELENIUM_SETTINGS.get("worker_jitter", 2)
+        )
+        if pool.start():
+            self.driver_pool = pool
+        else:
+            self.logger.warning("浏览器工作池启动失败，使用单浏览器顺序处理笔记")
+    
+    def _open_tab_pool(self):
+        """按配置在主浏览器中打开多个标签页并行加载笔记详情页（未启用浏览器工作池时）"""
+        tab_count = SELENIUM_SETTINGS.get("tab_count", 1)
+        if tab_count <= 1 or self.driver_pool:
+            return
+        
+        pool = TabPool(
+            self.selenium_handler,
+            size=tab_count,
+            page_timeout=SELENIUM_SETTINGS.get("tab_page_timeout", 15),
+            min_interval=SELENIUM_SETTINGS.get("tab_min_interval", 1.5),
+            jitter=SELENIUM_SETTINGS.get("tab_jitter", 1)
+        )
+        if pool.open() > 1:
+            self.tab_pool = pool
+        else:
+            pool.close()
+            self.logger.warning("打开标签页失败，使用单标签页顺序处理笔记")
+    
     def _save_page_for_debug(self, page_source: str, keyword: str):
         """保存页面源码用于调试"""
         try:
@@ -293,9 +434,17 @@ class SimpleXHSCrawler:
             notes.append(note_info)
         
         self.logger.info(f"备用方法找到 {len(notes)} 个笔记ID")
-        return notes    
-    def process_note(self, note_info: Dict[str, Any]):
-        """处理单个笔记"""
+        return notes
+    
+    def process_note(self, note_info: Dict[str, Any], handler: Optional[SeleniumHandler] = None):
+        """
+        处理单个笔记
+        
+        Args:
+            note_info: 笔记信息
+            handler: 访问详情页使用的浏览器，默认为主浏览器（工作池中为各自的浏览器）
+        """
+        handler = handler or self.selenium_handler
         try:
             note_id = note_info.get('note_id')
             if not note_id:
@@ -305,33 +454,98 @@ class SimpleXHSCrawler:
             
             # 访问笔记详情页
             note_url = f"https://www.xiaohongshu.com/explore/{note_id}"
-            if not self.selenium_handler.get_page(note_url, wait_selector=".note-container"):
+            if not handler.get_page(note_url, wait_selector=".note-container"):
                 self.logger.warning(f"笔记页面访问失败: {note_id}")
                 return
             
-            # 等待页面加载
-            time.sleep(2)
+            # 等待页面状态或正文渲染
+            handler.wait_until(note_ready(), 'note_ready', timeout=2)
             
-            # 解析笔记详情
-            note_detail = self.parser.parse_note_detail_direct(
-                self.selenium_handler.driver.page_source,
-                note_url
-            )
+            self._finish_note(note_info, handler)
+                
+        except Exception as e:
+            self.logger.error(f"处理笔记失败: {e}", exc_info=True)
+    
+    def _finish_note(self, note_info: Dict[str, Any], handler: SeleniumHandler, use_capture: bool = True):
+        """
+        解析已加载的笔记详情页，符合要求时保存
+        
+        Args:
+            note_info: 笔记信息
+            handler: 当前位于该笔记详情页的浏览器
+            use_capture: 是否使用捕获到的详情接口JSON（多标签页时各页面的响应混在一起，不使用）
+        """
+        note_id = note_info.get('note_id')
+        note_url = f"https://www.xiaohongshu.com/explore/{note_id}"
+        try:
+            # 解析笔记详情：优先使用捕获到的详情接口JSON，否则解析HTML
+            note_detail = None
+            for response in handler.capture_api_responses('feed') if use_capture else []:
+                note_detail = self.parser.parse_note_response(response['data'], note_url)
+                if note_detail.get('content') and note_detail.get('images'):
+                    break
+                note_detail = None
+            
+            if note_detail is None:
+                page = self._current_page(note_url, handler)
+                note_detail = self.parser.parse_note_detail_direct(page, note_url)
             
             # 验证笔记是否符合要求
-            if self.validate_note(note_detail):
+            if not self.validate_note(note_detail):
+                self.logger.debug(f"笔记验证失败: {note_id}")
+                return
+            
+            # 预留名额和编号后在锁外保存，多个工作线程的图片下载可以同时进行
+            comic_id = self._reserve_comic_id()
+            if not comic_id:
+                return
+            
+            saved = None
+            try:
                 # 处理为连环画格式
-                comic_data = self.process_to_comic(note_detail)
-                
+                comic_data = self.process_to_comic(note_detail, comic_id)
                 if comic_data and self.save_comic(comic_data):
-                    self.collected_comics.append(comic_data)
-                    self.logger.info(f"成功收集连环画 {len(self.collected_comics)}/{self.max_comics}: {comic_data['title']}")
-            else:
-                self.logger.debug(f"笔记验证失败: {note_id}")
+                    saved = comic_data
+            finally:
+                self._complete_comic(comic_id, saved)
                 
         except Exception as e:
             self.logger.error(f"处理笔记失败: {e}", exc_info=True)
     
+    def _reserve_comic_id(self) -> Optional[str]:
+        """
+        预留一个收集名额和连环画编号
+        
+        Returns:
+            连环画ID，名额已满（含正在保存的）时返回None
+        """
+        with self._lock:
+            if len(self.collected_comics) + self._pending_comics >= self.max_comics:
+                return None
+            self._pending_comics += 1
+            if self._free_comic_numbers:
+                number = heapq.heappop(self._free_comic_numbers)
+            else:
+                number = self._next_comic_number
+                self._next_comic_number += 1
+            return f"comic_{number:03d}"
+    
+    def _complete_comic(self, comic_id: str, comic_data: Optional[Dict[str, Any]]):
+        """
+        结束预留：保存成功时加入收集结果，失败时归还编号
+        
+        Args:
+            comic_id: 预留的连环画ID
+            comic_data: 保存成功的连环画数据，失败为None
+        """
+        with self._lock:
+            self._pending_comics -= 1
+            if comic_data is None:
+                heapq.heappush(self._free_comic_numbers, int(comic_id.rsplit('_', 1)[-1]))
+                return
+            self.collected_comics.append(comic_data)
+            self.logger.info(f"成功收集连环画 {len(self.collected_comics)}/{self.max_comics}: {comic_data['title']}")
+    
     def validate_note(self, note: Dict[str, Any]) -> bool:
         """验证笔记是否符合要求"""
         try:
@@ -348,29 +562,28 @@ class SimpleXHSCrawler:
                 return False
             
             # 主题过滤 - 确保是"外卖/点餐翻车"相关
-            title = note.get('title', '').lower()
-            content_lower = content.lower()
-            
-            # 检查是否包含主题关键词
             theme_keywords = ['外卖', '点餐', '翻车', '吃啥', '漫画', '送餐', '饿了么', '美团']
             
-            has_theme = any(keyword in title or keyword in content_lower 
-                        for keyword in theme_keywords)
+            # 一次扫描标题和内容，得到命中关键词和相关度
+            matcher = get_theme_matcher()
+            match_result = matcher.match_note(note, fields=('title', 'content'))
             
-            if not has_theme:
-                self.logger.debug(f"笔记不符合主题: {title[:30]}...")
+            if not matcher.contains_any(note, theme_keywords, fields=('title', 'content'), result=match_result):
+                self.logger.debug(f"笔记不符合主题: {note.get('title', '')[:30]}...")
                 return False
             
+            self.logger.debug(f"主题关键词: {match_result['matched']}, 相关度: {match_result['score']}")
+            
             return True
             
         except Exception as e:
             self.logger.debug(f"验证笔记时出错: {e}")
             return False
         
-    def process_to_comic(self, note: Dict[str, Any]) -> Dict[str, Any]:
-        """将笔记处理为连环画格式"""
+    def process_to_comic(self, note: Dict[str, Any], comic_id: Optional[str] = None) -> Dict[str, Any]:
+        """将笔记处理为连环画格式（comic_id为预留的编号，为None时按已收集数量编号）"""
         try:
-            comic_id = f"comic_{len(self.collected_comics) + 1:03d}"
+            comic_id = comic_id or f"comic_{len(self.collected_comics) + 1:03d}"
             
             comic_data = {
                 'comic_id': comic_id,
@@ -403,38 +616,54 @@ class SimpleXHSCrawler:
             comic_dir.mkdir(parents=True, exist_ok=True)
             images_dir.mkdir(parents=True, exist_ok=True)
             
-            # 下载图片
+            # 并发下载图片（最多6张）
             downloaded_images = []
             images = comic_data.get('images', [])
             
-            for i, img_info in enumerate(images[:6]):  # 最多6张
+            # 图片存储中已有的图片直接链接，不再下载
+            entries = []
+            for i, img_info in enumerate(images[:6]):
                 img_url = img_info['url'] if isinstance(img_info, dict) else img_info
+                img_path = images_dir / f"image_{i+1:02d}.jpg"
+                ref = f"{comic_id}/{img_path.name}"
+                md5 = self.image_store.link_known(img_url, img_path, ref) if self.image_store else None
+                entries.append((img_url, img_path, ref, md5))
+            
+            jobs = [(img_url, img_path) for img_url, img_path, _, md5 in entries if not md5]
+            results = iter(self.download_engine.download_batch(jobs))
+            for i, (img_url, img_path, ref, md5) in enumerate(entries):
+                if md5:
+                    self.logger.info(f"图片已在存储中: {img_path.name}")
+                else:
+                    result = next(results)
+                    if not result['success']:
+                        self.logger.warning(f"下载图片失败: {result['message']}")
+                        continue
+                    self.logger.info(f"下载图片成功: {img_path.name} ({result['seconds']}秒)")
+                    md5 = result['md5']
+                    if self.image_store:
+                        md5 = self.image_store.ingest(img_path, ref, img_url, md5)
                 
-                try:
-                    img_name = f"image_{i+1:02d}.jpg"
-                    img_path = images_dir / img_name
-                    
-                    # 下载图片
-                    success, message = self.request_handler.download_image(img_url, str(img_path))
-                    
-                    if success:
-                        downloaded_images.append({
-                            'filename': img_name,
-                            'path': str(img_path.relative_to(COMICS_DIR)),
-                            'order': i + 1,
-                            'original_url': img_url
-                        })
-                        self.logger.info(f"下载图片成功: {img_name}")
-                    else:
-                        self.logger.warning(f"下载图片失败: {message}")
-                        
-                except Exception as e:
-                    self.logger.error(f"下载图片时出错: {e}")
+                downloaded_images.append({
+                    'filename': img_path.name,
+                    'path': str(img_path.relative_to(COMICS_DIR)),
+                    'order': i + 1,
+                    'original_url': img_url,
+                    'md5': md5
+                })
             
             if len(downloaded_images) < 3:  # 至少需要3张合格图片
                 self.logger.warning(f"合格图片数量不足: {len(downloaded_images)}")
+                if self.image_store:
+                    for image in downloaded_images:
+                        self.image_store.release(f"{comic_id}/{image['filename']}")
+                    self.image_store.save()
+                self._remove_rejected_images(comic_dir, [img_path for _, img_path, _, _ in entries])
                 return False
             
+            if self.image_store:
+                self.image_store.save()
+            
             # 更新图片信息
             comic_data['images'] = downloaded_images
             comic_data['downloaded_image_count'] = len(downloaded_images)
@@ -453,6 +682,23 @@ class SimpleXHSCrawler:
             self.logger.error(f"保存连环画失败: {e}")
             return False
     
+    def _remove_rejected_images(self, comic_dir: Path, image_paths: List[Path]):
+        """
+        删除未通过的连环画已写入的图片（链接或下载的文件），目录为空时一并删除
+        
+        Args:
+            comic_dir: 连环画目录
+            image_paths: 本次写入的图片路径
+        """
+        for path in image_paths:
+            path.unlink(missing_ok=True)
+        for directory in (comic_dir / 'images', comic_dir):
+            try:
+                directory.rmdir()
+            except OSError:
+                # 目录中还有其他文件（如之前运行留下的数据）
+                break
+    
     def generate_annotations(self, comic_data: Dict[str, Any], comic_dir: Path):
         """生成标注JSON文件"""
         try:
@@ -480,7 +726,12 @@ class SimpleXHSCrawler:
             self.logger.error(f"生成标注文件失败: {e}")
     
     def update_global_annotations(self, new_annotations: Dict[str, Any]):
-        """更新全局标注文件"""
+        """更新全局标注文件（多个工作线程保存时串行读写）"""
+        with self._annotations_lock:
+            self._update_global_annotations(new_annotations)
+    
+    def _update_global_annotations(self, new_annotations: Dict[str, Any]):
+        """读取、合并并写回全局标注文件"""
         try:
             from config.settings import COMICS_DIR
             global_annotations_path = COMICS_DIR / 'annotations.json'
@@ -535,6 +786,35 @@ class SimpleXHSCrawler:
             }
         }
         
+        if self.parser and self.parser.parse_cache:
+            report['parse_cache'] = self.parser.parse_cache.stats()
+        if self.parser:
+            report['selector_stats'] = self.parser.selector_stats.report()
+            report['detail_parse'] = self.parser.detail_parse_report()
+        if self.driver_pool:
+            report['driver_pool'] = self.driver_pool.report()
+        if self.tab_pool:
+            report['tab_pool'] = self.tab_pool.report()
+        if self.download_engine:
+            report['downloads'] = self.download_engine.report()
+        if self.image_store:
+            report['image_store'] = self.image_store.report()
+        if self.request_handler:
+            report['rate_limiter'] = self.request_handler.rate_limiter.report()
+            if self.request_handler.cache:
+                report['http_cache'] = self.request_handler.cache.report()
+        if self.selenium_handler:
+            report['readiness'] = self.selenium_handler.readiness_report()
+            report['page_metrics'] = self.selenium_handler.page_metrics.report()
+            report['snapshots'] = self.selenium_handler.snapshot_report()
+            report['scroll_harvest'] = self.stats['scroll_harvest']
+            report['startup'] = {
+                **self.selenium_handler.startup_stats,
+                'first_search_seconds': self.stats['first_search_seconds'],
+            }
+            if self.selenium_handler.network_capture:
+                report['network_capture'] = dict(self.selenium_handler.network_capture.stats)
+        
         return report
     
     def save_report(self, report: Dict[str, Any]):
@@ -549,8 +829,14 @@ class SimpleXHSCrawler:
     
     def close(self):
         """关闭爬虫"""
+        if self.parser:
+            self.parser.save_selector_stats()
+        if self.driver_pool:
+            self.driver_pool.close()
         if self.selenium_handler:
             self.selenium_handler.close()
+        if self.download_engine:
+            self.download_engine.close()
         if self.request_handler:
             self.request_handler.close()
         self.logger.info("爬虫已关闭")
\ No newline at end of file
@@ -0,0 +1,241 @@
+"""
+图片内容寻址存储模块
+图片按MD5存放在分片目录中，连环画目录中的图片是指向存储文件的硬链接，
+索引记录每个文件的引用和已知的CDN地址，重复的图片既不重复下载也不重复占用磁盘
+"""
+
+import os
+import shutil
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set, Union
+from urllib.parse import urlparse
+
+from src.utils.helper import calculate_md5, safe_json_dump, safe_json_load
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_image_url(url: str, cdn_hosts: Iterable[str] = ('xhscdn.com',)) -> str:
+    """
+    规范化图片地址，同一张图片的不同访问地址得到相同的键
+
+    CDN地址的主机、时间戳目录、查询参数和"!"后的处理样式都会变化，只保留最后一段图片标识；
+    其他地址去掉协议、查询参数和片段
+
+    Args:
+        url: 图片地址
+        cdn_hosts: CDN主机后缀
+
+    Returns:
+        规范化后的键
+    """
+    parsed = urlparse(url if '//' in url else '//' + url)
+    host = parsed.netloc.lower()
+    path = parsed.path.split('!')[0].rstrip('/')
+
+    if any(host == suffix or host.endswith('.' + suffix) for suffix in cdn_hosts):
+        return 'cdn:' + path.rsplit('/', 1)[-1]
+    return f"{host}{path}"
+
+
+class ImageStore:
+    """内容寻址的图片存储"""
+
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, root: Union[str, Path], cdn_hosts: Iterable[str] = ('xhscdn.com',)):
+        """
+        初始化存储
+
+        Args:
+            root: 存储根目录
+            cdn_hosts: 规范化地址时视为CDN的主机后缀
+        """
+        self.root = Path(root)
+        self.cdn_hosts = tuple(cdn_hosts)
+        self.index_path = self.root / self.INDEX_FILE
+        self._lock = threading.Lock()
+
+        index = safe_json_load(self.index_path)
+        index = index if isinstance(index, dict) else {}
+        # md5 -> {'size', 'suffix', 'refs': [引用]}
+        self.blobs: Dict[str, Dict[str, Any]] = index.get('blobs', {})
+        # 规范化地址 -> md5
+        self.urls: Dict[str, str] = index.get('urls', {})
+
+        # 反向索引（不保存，由上面两项重建）：引用 -> md5，md5 -> 规范化地址
+        self._ref_blobs: Dict[str, str] = {
+            ref: md5 for md5, blob in self.blobs.items() for ref in blob['refs']
+        }
+        self._blob_urls: Dict[str, Set[str]] = {}
+        for key, md5 in self.urls.items():
+            self._blob_urls.setdefault(md5, set()).add(key)
+
+        self.stats = {
+            'url_hits': 0,         # 已知地址，跳过下载
+            'content_hits': 0,     # 下载后发现内容已存在
+            'stored': 0,           # 新存入的文件
+            'download_bytes_saved': 0,
+            'disk_bytes_saved': 0,
+        }
+
+    def blob_path(self, md5: str, suffix: str = '.jpg') -> Path:
+        """文件在存储中的路径（按哈希前两级分片）"""
+        return self.root / md5[:2] / md5[2:4] / f"{md5}{suffix}"
+
+    def lookup(self, url: str) -> Optional[str]:
+        """
+        查找已下载过的图片
+
+        Args:
+            url: 图片地址
+
+        Returns:
+            文件的md5，未知地址或文件已丢失时返回None
+        """
+        with self._lock:
+            md5 = self.urls.get(normalize_image_url(url, self.cdn_hosts))
+            if md5 and md5 in self.blobs and self._blob(md5).exists():
+                return md5
+            return None
+
+    def link_known(self, url: str, dest: Union[str, Path], ref: str) -> Optional[str]:
+        """
+        已知地址的图片直接链接到目标路径
+
+        Args:
+            url: 图片地址
+            dest: 连环画中的图片路径
+            ref: 引用名（如comic_001/image_01.jpg）
+
+        Returns:
+            文件的md5，未知地址时返回None
+        """
+        md5 = self.lookup(url)
+        if not md5:
+            return None
+        with self._lock:
+            self._link(self._blob(md5), Path(dest))
+            self._add_ref(md5, ref)
+            self.stats['url_hits'] += 1
+            self.stats['download_bytes_saved'] += self.blobs[md5]['size']
+            self.stats['disk_bytes_saved'] += self.blobs[md5]['size']
+        return md5
+
+    def ingest(self, path: Union[str, Path], ref: str, url: str = '', md5: str = '') -> str:
+        """
+        将刚下载的文件存入存储，原路径替换为指向存储文件的链接
+
+        Args:
+            path: 已下载的文件路径（连环画中的图片路径）
+            ref: 引用名
+            url: 图片地址（记录后同一图片不再下载）
+            md5: 下载时计算的MD5，为空时读取文件计算
+
+        Returns:
+            文件的md5
+        """
+        path = Path(path)
+        md5 = md5 or calculate_md5(path.read_bytes())
+
+        with self._lock:
+            if md5 in self.blobs and self._blob(md5).exists():
+                # 内容已存在：丢弃新文件，改为链接
+                self.stats['content_hits'] += 1
+                self.stats['disk_bytes_saved'] += self.blobs[md5]['size']
+                self._link(self._blob(md5), path)
+            else:
+                blob = self.blob_path(md5, path.suffix or '.jpg')
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(path, blob)
+                self._link(blob, path)
+                # 文件丢失后重新存入时保留其他连环画的引用
+                refs = self.blobs[md5]['refs'] if md5 in self.blobs else []
+                self.blobs[md5] = {'size': blob.stat().st_size, 'suffix': blob.suffix, 'refs': refs}
+                self.stats['stored'] += 1
+
+            self._add_ref(md5, ref)
+            if url:
+                self._add_url(normalize_image_url(url, self.cdn_hosts), md5)
+        return md5
+
+    def release(self, ref: str) -> int:
+        """
+        删除一个引用，没有引用的文件从存储中删除
+
+        Args:
+            ref: 引用名
+
+        Returns:
+            删除的文件数
+        """
+        with self._lock:
+            return self._drop_ref(ref)
+
+    def save(self) -> bool:
+        """保存索引"""
+        with self._lock:
+            return safe_json_dump({'blobs': self.blobs, 'urls': self.urls}, self.index_path)
+
+    def report(self) -> Dict[str, Any]:
+        """存储统计"""
+        with self._lock:
+            return {
+                **self.stats,
+                'blobs': len(self.blobs),
+                'refs': sum(len(blob['refs']) for blob in self.blobs.values()),
+                'stored_bytes': sum(blob['size'] for blob in self.blobs.values()),
+            }
+
+    def _blob(self, md5: str) -> Path:
+        return self.blob_path(md5, self.blobs[md5].get('suffix', '.jpg'))
+
+    def _add_ref(self, md5: str, ref: str):
+        """记录引用；同名引用（如重新爬取时覆盖的图片）先从原文件上移除"""
+        self._drop_ref(ref, keep=md5)
+        if ref not in self.blobs[md5]['refs']:
+            self.blobs[md5]['refs'].append(ref)
+        self._ref_blobs[ref] = md5
+
+    def _add_url(self, key: str, md5: str):
+        """记录规范化地址对应的文件"""
+        previous = self.urls.get(key)
+        if previous and previous != md5:
+            self._blob_urls.get(previous, set()).discard(key)
+        self.urls[key] = md5
+        self._blob_urls.setdefault(md5, set()).add(key)
+
+    def _drop_ref(self, ref: str, keep: str = '') -> int:
+        """从除keep以外的文件上移除引用，删除不再被引用的文件"""
+        md5 = self._ref_blobs.get(ref)
+        if not md5 or md5 == keep:
+            return 0
+
+        del self._ref_blobs[ref]
+        blob = self.blobs.get(md5)
+        if blob is None:
+            return 0
+        if ref in blob['refs']:
+            blob['refs'].remove(ref)
+        if blob['refs']:
+            return 0
+
+        self._blob(md5).unlink(missing_ok=True)
+        del self.blobs[md5]
+        for key in self._blob_urls.pop(md5, ()):
+            del self.urls[key]
+        return 1
+
+    @staticmethod
+    def _link(blob: Path, dest: Path):
+        """在目标路径创建指向存储文件的硬链接，不支持硬链接时复制"""
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if dest.exists() or dest.is_symlink():
+            dest.unlink()
+        try:
+            os.link(blob, dest)
+        except OSError as e:
+            logger.debug(f"创建硬链接失败，改为复制: {e}")
+            shutil.copy2(blob, dest)
@@ -0,0 +1,254 @@
+"""
+关键词匹配工具模块
+基于Aho-Corasick自动机，一次扫描文本即可找出所有命中的关键词
+"""
+
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from config.settings import CRAWLER_SETTINGS, TAGS, RELATED_KEYWORDS
+
+
+# 各字段命中关键词时的权重
+FIELD_WEIGHTS = {
+    'title': 3.0,
+    'tags': 2.0,
+    'content': 1.0,
+}
+
+
+class KeywordMatcher:
+    """多模式关键词匹配器（Aho-Corasick）"""
+
+    def __init__(self, keywords: Iterable[str] = ()):
+        """
+        初始化匹配器
+
+        Args:
+            keywords: 初始关键词
+        """
+        # 节点以列表下标表示：转移表、失败指针、节点自身的关键词、合并失败链后的输出
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._own: List[List[str]] = [[]]
+        self._output: List[List[str]] = [[]]
+        self._keywords: Set[str] = set()
+        self._built = True
+
+        for keyword in keywords:
+            self.add(keyword)
+        self.build()
+
+    def __contains__(self, keyword: str) -> bool:
+        return keyword.lower() in self._keywords
+
+    def __len__(self) -> int:
+        return len(self._keywords)
+
+    @property
+    def keywords(self) -> Set[str]:
+        """已加入的关键词（小写）"""
+        return set(self._keywords)
+
+    def add(self, keyword: str):
+        """
+        加入关键词，加入后需要调用build()
+
+        Args:
+            keyword: 关键词，匹配时不区分大小写
+        """
+        keyword = (keyword or '').strip().lower()
+        if not keyword or keyword in self._keywords:
+            return
+
+        node = 0
+        for char in keyword:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._own.append([])
+                self._output.append([])
+                self._goto[node][char] = next_node
+            node = next_node
+
+        self._own[node].append(keyword)
+        self._keywords.add(keyword)
+        self._built = False
+
+    def build(self):
+        """按BFS计算失败指针，并由各节点自身的关键词重新合并输出"""
+        queue = deque()
+        for node in self._goto[0].values():
+            self._fail[node] = 0
+            self._output[node] = list(self._own[node])
+            queue.append(node)
+
+        while queue:
+            current = queue.popleft()
+            for char, child in self._goto[current].items():
+                queue.append(child)
+
+                fallback = self._fail[current]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._own[child] + self._output[self._fail[child]]
+
+        self._built = True
+
+    def find_all(self, text: str) -> List[Tuple[int, str]]:
+        """
+        查找文本中所有命中的关键词
+
+        Args:
+            text: 待匹配文本
+
+        Returns:
+            (结束位置, 关键词) 列表
+        """
+        if not self._built:
+            self.build()
+
+        matches = []
+        if not text:
+            return matches
+
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        node = 0
+
+        for index, char in enumerate(text.lower()):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if output[node]:
+                for keyword in output[node]:
+                    matches.append((index, keyword))
+
+        return matches
+
+    def matched_keywords(self, text: str) -> List[str]:
+        """返回文本中命中的关键词（按首次出现顺序去重）"""
+        return list(dict.fromkeys(keyword for _, keyword in self.find_all(text)))
+
+    def match_note(self, note: Dict[str, Any],
+                   fields: Tuple[str, ...] = ('title', 'content', 'tags')) -> Dict[str, Any]:
+        """
+        对笔记的标题、内容和标签进行一次扫描匹配
+
+        Args:
+            note: 笔记数据
+            fields: 参与匹配的字段
+
+        Returns:
+            {'matched': 命中关键词列表, 'fields': {关键词: 命中字段列表}, 'score': 相关度分数}
+        """
+        hits: Dict[str, List[str]] = {}
+
+        for field in fields:
+            value = note.get(field)
+            if not value:
+                continue
+            if isinstance(value, (list, tuple)):
+                # 标签之间用换行分隔，避免跨标签误匹配
+                value = '\n'.join(str(item) for item in value)
+
+            for keyword in self.matched_keywords(str(value)):
+                field_hits = hits.setdefault(keyword, [])
+                if field not in field_hits:
+                    field_hits.append(field)
+
+        score = sum(
+            max(FIELD_WEIGHTS.get(field, 1.0) for field in field_hits)
+            for field_hits in hits.values()
+        )
+
+        return {
+            'matched': list(hits),
+            'fields': hits,
+            'score': score,
+        }
+
+    def contains_any(self, note: Dict[str, Any], keywords: Iterable[str],
+                     fields: Tuple[str, ...] = ('title', 'content', 'tags'),
+                     result: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        判断笔记是否包含任一指定关键词
+
+        Args:
+            note: 笔记数据
+            keywords: 目标关键词
+            fields: 参与匹配的字段
+            result: 已有的match_note结果，传入可避免重复扫描
+
+        Returns:
+            是否命中
+        """
+        targets = {kw.strip().lower() for kw in keywords if kw and kw.strip()}
+        if not targets:
+            return False
+
+        result = result or self.match_note(note, fields)
+        if targets.intersection(result['matched']):
+            return True
+
+        # 不在自动机中的关键词退回到直接查找
+        missing = [kw for kw in targets if kw not in self._keywords]
+        if not missing:
+            return False
+
+        texts = []
+        for field in fields:
+            value = note.get(field)
+            if isinstance(value, (list, tuple)):
+                texts.extend(str(item) for item in value)
+            elif value:
+                texts.append(str(value))
+        all_text = '\n'.join(texts).lower()
+
+        return any(kw in all_text for kw in missing)
+
+
+_theme_matcher: Optional[KeywordMatcher] = None
+_theme_matcher_lock = threading.Lock()
+
+
+def build_theme_keywords() -> List[str]:
+    """汇总配置中的主题关键词"""
+    keywords = []
+    keywords.extend(TAGS.get('primary_tags', []))
+    keywords.extend(TAGS.get('secondary_tags', []))
+    keywords.extend(CRAWLER_SETTINGS.get('search_keywords', []))
+    for related in RELATED_KEYWORDS.values():
+        keywords.extend(related)
+    return keywords
+
+
+def get_theme_matcher() -> KeywordMatcher:
+    """
+    获取共享的主题关键词匹配器（首次调用时构建）
+
+    Returns:
+        KeywordMatcher实例
+    """
+    global _theme_matcher
+    with _theme_matcher_lock:
+        if _theme_matcher is None:
+            _theme_matcher = KeywordMatcher(build_theme_keywords())
+        return _theme_matcher
+
+
+if __name__ == "__main__":
+    # 测试关键词匹配
+    matcher = get_theme_matcher()
+    test_note = {
+        'title': '外卖翻车记',
+        'content': '今天点的外卖太难吃了',
+        'tags': ['美食', '吐槽']
+    }
+    print(f"关键词数量: {len(matcher)}")
+    print(f"匹配结果: {matcher.match_note(test_note)}")
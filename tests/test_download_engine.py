@@ -0,0 +1,115 @@
+"""
+图片下载引擎测试
+替身请求处理器模拟下载耗时，并记录每个主机的最大并发数
+"""
+
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from urllib.parse import urlparse
+
+from src.crawler.download_engine import DownloadEngine
+
+
+class FakeRequestHandler:
+    """每张图片耗时seconds秒，URL含fail时下载失败"""
+
+    def __init__(self, seconds=0.1):
+        self.seconds = seconds
+        self.active = {}
+        self.max_active = {}
+        self._lock = threading.Lock()
+
+    def stream_download(self, url, save_path, delay=True):
+        host = urlparse(url).netloc
+        with self._lock:
+            self.active[host] = self.active.get(host, 0) + 1
+            self.max_active[host] = max(self.max_active.get(host, 0), self.active[host])
+        time.sleep(self.seconds)
+        with self._lock:
+            self.active[host] -= 1
+
+        if 'fail' in url:
+            return {'success': False, 'message': "请求失败，状态码: 404", 'bytes': 0, 'md5': ''}
+        Path(save_path).write_bytes(b'x' * 10)
+        return {'success': True, 'message': "下载成功", 'bytes': 10, 'md5': 'm'}
+
+
+class TestDownloadEngine(unittest.TestCase):
+    """测试并发下载"""
+
+    def test_batch_takes_about_the_slowest_image(self):
+        handler = FakeRequestHandler(seconds=0.1)
+        engine = DownloadEngine(handler, max_workers=6, per_host=6)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            jobs = [(f"https://ci.xhscdn.com/{i}.jpg", Path(temp_dir) / f"image_{i:02d}.jpg") for i in range(6)]
+            start = time.perf_counter()
+            results = engine.download_batch(jobs)
+            elapsed = time.perf_counter() - start
+        engine.close()
+
+        self.assertLess(elapsed, 0.1 * 6)
+        self.assertEqual([result['url'] for result in results], [url for url, _ in jobs])
+        self.assertTrue(all(result['success'] and result['bytes'] == 10 for result in results))
+
+    def test_per_host_limit_and_failures(self):
+        handler = FakeRequestHandler(seconds=0.05)
+        engine = DownloadEngine(handler, max_workers=6, per_host=2)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            jobs = [(f"https://a.example.com/{i}.jpg", Path(temp_dir) / f"a{i}.jpg") for i in range(4)]
+            jobs.append(("https://b.example.com/fail.jpg", Path(temp_dir) / "b.jpg"))
+            results = engine.download_batch(jobs)
+        engine.close()
+
+        self.assertLessEqual(handler.max_active['a.example.com'], 2)
+        self.assertFalse(results[-1]['success'])
+        self.assertEqual(engine.report()['failed'], 1)
+        self.assertEqual(engine.report()['images'], 5)
+
+    def test_concurrent_batches_overlap_and_share_host_limit(self):
+        handler = FakeRequestHandler(seconds=0.1)
+        engine = DownloadEngine(handler, max_workers=8, per_host=4)
+        spans = {}
+
+        def run_batch(name, temp_dir):
+            jobs = [(f"https://ci.xhscdn.com/{name}{i}.jpg", Path(temp_dir) / f"{name}{i}.jpg") for i in range(3)]
+            start = time.perf_counter()
+            engine.download_batch(jobs)
+            spans[name] = (start, time.perf_counter())
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            threads = [threading.Thread(target=run_batch, args=(name, temp_dir)) for name in ('a', 'b')]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        engine.close()
+
+        # 两个连环画的批次同时进行（单个批次只有3张），主机并发上限在批次之间共享
+        (a_start, a_end), (b_start, b_end) = spans['a'], spans['b']
+        self.assertLess(max(a_start, b_start), min(a_end, b_end))
+        self.assertEqual(handler.max_active['ci.xhscdn.com'], 4)
+        self.assertEqual(engine.report()['batches'], 2)
+
+
+class TestSweepPartialDownloads(unittest.TestCase):
+    """测试启动时清理残留的下载临时文件"""
+
+    def test_stale_partials_removed_at_start(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            images = Path(temp_dir) / "comic_001" / "images"
+            images.mkdir(parents=True)
+            (images / ".download-abc.part").write_bytes(b"half")
+            (images / "image_01.jpg").write_bytes(b"image")
+
+            engine = DownloadEngine(FakeRequestHandler(), download_root=temp_dir)
+            engine.close()
+
+            self.assertEqual(engine.report()['swept_partials'], 1)
+            self.assertEqual([path.name for path in images.iterdir()], ["image_01.jpg"])
+
+
+if __name__ == "__main__":
+    unittest.main()
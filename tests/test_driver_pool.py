@@ -0,0 +1,138 @@
+"""
+浏览器工作池测试
+使用不启动浏览器的替身处理器
+"""
+
+import threading
+import time
+import unittest
+
+from src.crawler.driver_pool import DriverPool
+from src.crawler.xhs_crawler import SimpleXHSCrawler
+
+
+class FakeHandler:
+    """替身浏览器"""
+
+    def __init__(self, ok=True):
+        self.ok = ok
+        self.visits = []
+        self.closed = False
+
+    def initialize(self):
+        return self.ok
+
+    def login_with_cookies(self):
+        return True
+
+    def close(self):
+        self.closed = True
+
+
+class TestDriverPool(unittest.TestCase):
+    """测试浏览器工作池"""
+
+    def test_start_skips_failed_browsers(self):
+        handlers = iter([FakeHandler(), FakeHandler(ok=False), FakeHandler()])
+        lock = threading.Lock()
+
+        def factory():
+            with lock:
+                return next(handlers)
+
+        pool = DriverPool(size=3, handler_factory=factory)
+        self.assertEqual(pool.start(), 2)
+        pool.close()
+
+    def test_run_distributes_work(self):
+        pool = DriverPool(size=3, min_interval=0, jitter=0, handler_factory=FakeHandler)
+        pool.start()
+
+        def task(handler, item):
+            handler.visits.append(item)
+            time.sleep(0.01)
+            if item == 5:
+                raise ValueError("页面访问失败")
+            return item * 2
+
+        results = pool.run(range(12), task)
+
+        self.assertEqual(sorted(result for _, result in results), [i * 2 for i in range(12) if i != 5])
+        self.assertEqual(sum(len(h.visits) for h in pool.handlers), 12)
+        self.assertTrue(all(h.visits for h in pool.handlers))
+
+        report = pool.report()
+        self.assertEqual(report['processed'], 11)
+        self.assertEqual(report['failed'], 1)
+
+        handlers = pool.handlers
+        pool.close()
+        self.assertTrue(all(h.closed for h in handlers))
+
+    def test_should_stop_and_pacing(self):
+        pool = DriverPool(size=1, min_interval=0.05, jitter=0, handler_factory=FakeHandler)
+        pool.start()
+        done = []
+
+        results = pool.run(range(10), lambda handler, item: done.append(item),
+                           should_stop=lambda: len(done) >= 3)
+
+        self.assertEqual(len(results), 3)
+        # 同一个浏览器的相邻任务之间至少间隔min_interval
+        self.assertGreaterEqual(pool.report()['pacing_wait_seconds'], 0.08)
+
+    def test_run_requires_start(self):
+        with self.assertRaises(RuntimeError):
+            DriverPool(size=1, handler_factory=FakeHandler).run([1], lambda handler, item: item)
+
+
+class FakeParser:
+    """按URL返回符合要求的笔记详情"""
+
+    def parse_note_detail_direct(self, page, note_url):
+        return {
+            'note_id': note_url.rsplit('/', 1)[-1],
+            'title': '外卖翻车漫画',
+            'content': '今天点的外卖又翻车了，画成漫画记录一下',
+            'images': [f"https://ci.xhscdn.com/{i}.jpg" for i in range(3)],
+            'url': note_url,
+        }
+
+
+class TestConcurrentNoteSaving(unittest.TestCase):
+    """测试工作池中多个笔记同时保存"""
+
+    def test_saves_overlap_and_ids_stay_unique(self):
+        crawler = SimpleXHSCrawler(max_comics=3)
+        crawler.parser = FakeParser()
+        crawler._current_page = lambda url, handler: url
+
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def save_comic(comic_data):
+            with lock:
+                active.append(comic_data['comic_id'])
+                peak.append(len(active))
+            time.sleep(0.1)
+            with lock:
+                active.remove(comic_data['comic_id'])
+            # 第一个笔记保存失败，编号归还给后面的笔记
+            return comic_data['note_id'] != 'note0'
+
+        crawler.save_comic = save_comic
+        pool = DriverPool(size=3, min_interval=0, jitter=0, handler_factory=FakeHandler)
+        pool.start()
+        pool.run([{'note_id': f'note{i}'} for i in range(6)],
+                 lambda handler, note: crawler._finish_note(note, handler, use_capture=False))
+        pool.close()
+
+        self.assertGreater(max(peak), 1)
+        self.assertEqual(sorted(comic['comic_id'] for comic in crawler.collected_comics),
+                         ['comic_001', 'comic_002', 'comic_003'])
+        self.assertNotIn('note0', [comic['note_id'] for comic in crawler.collected_comics])
+
+
+if __name__ == "__main__":
+    unittest.main()
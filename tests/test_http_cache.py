@@ -0,0 +1,168 @@
+"""
+HTTP响应缓存测试
+本地HTTP服务返回带ETag的响应，收到匹配的If-None-Match时返回304
+"""
+
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+from src.crawler.http_cache import HTTPCache, normalize_url
+from src.crawler.request_handler import RequestHandler
+
+BODY = b"<html>note</html>" * 100
+ETAG = '"v1"'
+
+
+class ETagHandler(BaseHTTPRequestHandler):
+    """返回带ETag的页面，记录收到的请求"""
+
+    requests = []
+
+    def do_GET(self):
+        self.requests.append((self.path, self.headers.get('If-None-Match')))
+        if self.headers.get('If-None-Match') == ETAG:
+            self.send_response(304)
+            self.send_header('ETag', ETAG)
+            self.end_headers()
+        else:
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', str(len(BODY)))
+            self.send_header('ETag', ETAG)
+            self.end_headers()
+            self.wfile.write(BODY)
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestNormalizeUrl(unittest.TestCase):
+    """测试缓存键规范化"""
+
+    def test_query_order_and_fragment_ignored(self):
+        self.assertEqual(
+            normalize_url("HTTPS://Example.com/search?b=2&a=1#top"),
+            normalize_url("https://example.com/search?a=1&b=2")
+        )
+
+
+class TestHTTPCache(unittest.TestCase):
+    """测试请求处理器的条件缓存"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(('127.0.0.1', 0), ETagHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        ETagHandler.requests.clear()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self.temp_dir.name) / "cache"
+        self.handler = self.make_handler()
+
+    def tearDown(self):
+        self.handler.close()
+        self.temp_dir.cleanup()
+
+    def make_handler(self, ttl=3600):
+        handler = RequestHandler(use_proxy=False, use_cache=False)
+        handler.cache = HTTPCache(self.cache_dir, ttl_seconds=ttl)
+        return handler
+
+    def get(self, path):
+        success, response, message = self.handler.make_request(f"{self.base_url}{path}", delay=False)
+        self.assertTrue(success, message)
+        return response.content
+
+    def test_fresh_entry_skips_network(self):
+        self.assertEqual(self.get("/note?b=2&a=1"), BODY)
+        self.assertEqual(self.get("/note?a=1&b=2"), BODY)
+
+        self.assertEqual(len(ETagHandler.requests), 1)
+        report = self.handler.cache.report()
+        self.assertEqual((report['misses'], report['hits'], report['stored']), (1, 1, 1))
+
+    def test_stale_entry_is_revalidated_after_restart(self):
+        self.get("/note")
+        self.handler.close()
+
+        # 新进程加载已保存的索引，缓存已过期，只发送条件请求
+        self.handler = self.make_handler(ttl=0)
+        self.assertEqual(self.get("/note"), BODY)
+        self.assertEqual(ETagHandler.requests[-1], ("/note", ETAG))
+        self.assertEqual(self.handler.cache.report()['revalidated'], 1)
+
+    def test_stream_download_served_from_cache(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            first = Path(temp_dir) / "a.jpg"
+            second = Path(temp_dir) / "b.jpg"
+            self.assertTrue(self.handler.stream_download(f"{self.base_url}/img", str(first), delay=False)['success'])
+            result = self.handler.stream_download(f"{self.base_url}/img", str(second), delay=False)
+
+            self.assertTrue(result['success'])
+            self.assertEqual(second.read_bytes(), BODY)
+            self.assertEqual(len(ETagHandler.requests), 1)
+
+    def test_stream_download_keyed_by_prepared_url(self):
+        # 请求时空格会被编码，流式下载保存的缓存也要能被make_request命中
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "a.jpg"
+            self.assertTrue(self.handler.stream_download(f"{self.base_url}/img a", str(path), delay=False)['success'])
+
+        self.assertEqual(self.get("/img a"), BODY)
+        self.assertEqual(len(ETagHandler.requests), 1)
+
+    def test_bodies_written_before_crash_are_accounted(self):
+        headers = {'ETag': ETAG}
+        cache = HTTPCache(self.cache_dir, max_bytes=25, save_every=2)
+        for i in range(3):
+            cache.store(f"http://a/{i}", b"x" * 10, headers)
+        # 没有调用save()就退出：第三个响应体不在已写入的索引中
+
+        cache = HTTPCache(self.cache_dir, max_bytes=25)
+        bodies = [path for path in self.cache_dir.glob('*/*') if path.is_file()]
+        self.assertEqual(len(bodies), len(cache.entries))
+        self.assertEqual(cache.total_bytes, sum(path.stat().st_size for path in bodies))
+        self.assertLessEqual(cache.total_bytes, 25)
+
+    def test_store_does_not_disturb_reader(self):
+        cache = HTTPCache(self.cache_dir)
+        cache.store("http://a/1", b"old" * 100000, {'ETag': ETAG})
+        response = cache.response(cache.lookup("http://a/1"))
+
+        # 读取过程中同一键被新内容覆盖，已打开的响应仍读到完整的旧内容
+        first = response.raw.read(10)
+        cache.store("http://a/1", b"new", {'ETag': '"v2"'})
+        self.assertEqual(first + response.raw.read(), b"old" * 100000)
+        response.close()
+
+        with cache.response(cache.lookup("http://a/1")) as response:
+            self.assertEqual(response.content, b"new")
+        self.assertEqual([path.name for path in self.cache_dir.glob('*/.store-*')], [])
+
+    def test_least_recently_used_entry_evicted(self):
+        cache = HTTPCache(self.cache_dir, max_bytes=25)
+        headers = {'ETag': ETAG}
+        cache.store("http://a/1", b"x" * 10, headers)
+        cache.store("http://a/2", b"x" * 10, headers)
+        cache.response(cache.lookup("http://a/1")).close()
+        cache.store("http://a/3", b"x" * 10, headers)
+
+        self.assertIsNone(cache.lookup("http://a/2"))
+        self.assertIsNotNone(cache.lookup("http://a/1"))
+        self.assertEqual(cache.report()['evicted'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,199 @@
+"""
+网络响应捕获测试
+本地HTTP服务提供录制的接口JSON，替身driver模拟Chrome性能日志和DevTools读取body
+"""
+
+import json
+import threading
+import unittest
+import urllib.request
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from src.crawler.network_capture import NetworkCapture
+from src.crawler.parser import XHSParser
+
+
+SEARCH_RESPONSE = {
+    'code': 0,
+    'success': True,
+    'data': {
+        'has_more': True,
+        'items': [
+            {
+                'id': '687288e40000000017033540',
+                'model_type': 'note',
+                'xsec_token': 'token-1',
+                'note_card': {
+                    'display_title': '外卖翻车现场 #外卖',
+                    'user': {'nickname': '小明'},
+                    'interact_info': {'liked_count': '1.2万'},
+                    'cover': {'url_default': 'https://sns-webpic-qc.xhscdn.com/cover_1.jpg'},
+                },
+            },
+            {'id': 'hot-query', 'model_type': 'hot_query', 'hot_query': {}},
+            {
+                'id': '66f7f255000000001a020eb9',
+                'model_type': 'note',
+                'note_card': {'display_title': '今天的晚饭'},
+            },
+        ],
+    },
+}
+
+FEED_RESPONSE = {
+    'code': 0,
+    'data': {
+        'items': [
+            {
+                'id': '687288e40000000017033540',
+                'model_type': 'note',
+                'note_card': {
+                    'note_id': '687288e40000000017033540',
+                    'title': '外卖翻车',
+                    'desc': '今天点的外卖翻车了，汤全洒了',
+                    'user': {'nickname': '小明'},
+                    'interact_info': {'liked_count': '390', 'comment_count': '12', 'collected_count': '1.5k'},
+                    'tag_list': [{'id': 't1', 'name': '外卖'}],
+                    'image_list': [
+                        {'url_default': 'https://sns-webpic-qc.xhscdn.com/1.jpg', 'width': 1080, 'height': 1440},
+                        {'url_default': 'https://sns-webpic-qc.xhscdn.com/2.jpg'},
+                    ],
+                },
+            }
+        ]
+    },
+}
+
+RESPONSES = {
+    '/api/sns/web/v1/search/notes': SEARCH_RESPONSE,
+    '/api/sns/web/v1/feed': FEED_RESPONSE,
+}
+
+
+class RecordedAPIHandler(BaseHTTPRequestHandler):
+    """返回录制的接口JSON"""
+
+    def do_GET(self):
+        body = json.dumps(RESPONSES.get(self.path.split('?')[0], {}), ensure_ascii=False).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeChromeDriver:
+    """模拟页面加载时发出的接口请求"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.requests = {}
+        self.log = []
+
+    def load(self, *paths):
+        """模拟页面加载：产生responseReceived和loadingFinished事件"""
+        for path in paths:
+            request_id = str(len(self.requests) + 1)
+            url = self.base_url + path
+            self.requests[request_id] = url
+            self.log.append(self._event('Network.responseReceived', {
+                'requestId': request_id,
+                'response': {'url': url, 'mimeType': 'application/json'},
+            }))
+            self.log.append(self._event('Network.loadingFinished', {'requestId': request_id}))
+
+    @staticmethod
+    def _event(method, params):
+        return {'message': json.dumps({'message': {'method': method, 'params': params}})}
+
+    def get_log(self, log_type):
+        entries, self.log = self.log, []
+        return entries
+
+    def execute_cdp_cmd(self, cmd, params):
+        if cmd == 'Network.getResponseBody':
+            with urllib.request.urlopen(self.requests[params['requestId']]) as response:
+                return {'body': response.read().decode('utf-8'), 'base64Encoded': False}
+        return {}
+
+
+class TestNetworkCapture(unittest.TestCase):
+    """测试接口响应捕获与解析"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(('127.0.0.1', 0), RecordedAPIHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.driver = FakeChromeDriver(self.base_url)
+        self.capture = NetworkCapture(self.driver)
+        self.parser = XHSParser(cache_size=0)
+
+    def test_capture_matching_responses(self):
+        self.driver.load('/api/sns/web/v1/search/notes?keyword=x', '/static/app.js', '/api/sns/web/v1/feed')
+
+        responses = self.capture.drain()
+        self.assertEqual([r['kind'] for r in responses], ['search', 'feed'])
+        self.assertEqual(responses[0]['data'], SEARCH_RESPONSE)
+        self.assertEqual(self.capture.stats['captured'], 2)
+
+        # 已读取的日志不会重复返回
+        self.assertEqual(self.capture.drain(), [])
+
+    def test_reset_discards_previous_page(self):
+        self.driver.load('/api/sns/web/v1/search/notes')
+        self.capture.reset()
+        self.driver.load('/api/sns/web/v1/feed')
+
+        self.assertEqual([r['kind'] for r in self.capture.drain('feed')], ['feed'])
+
+    def test_other_kinds_kept_for_later_drain(self):
+        self.driver.load('/api/sns/web/v1/search/notes', '/api/sns/web/v1/feed')
+
+        self.assertEqual([r['kind'] for r in self.capture.drain('feed')], ['feed'])
+        # 只读取了feed的body，search响应留给之后的drain
+        self.assertEqual(self.capture.stats['captured'], 1)
+        self.assertEqual(self.capture.drain('search')[0]['data'], SEARCH_RESPONSE)
+        self.assertEqual(self.capture.drain(), [])
+
+    def test_parse_feed_response(self):
+        self.driver.load('/api/sns/web/v1/search/notes')
+        response = self.capture.drain('search')[0]
+
+        notes = self.parser.parse_feed_response(response['data'])
+        self.assertEqual([n['note_id'] for n in notes], ['687288e40000000017033540', '66f7f255000000001a020eb9'])
+        self.assertEqual(notes[0]['likes'], 12000)
+        self.assertEqual(notes[0]['xsec_token'], 'token-1')
+
+        related = self.parser.parse_feed_response(response['data'], '外卖翻车')
+        self.assertEqual([n['note_id'] for n in related], ['687288e40000000017033540'])
+
+    def test_parse_note_response(self):
+        self.driver.load('/api/sns/web/v1/feed')
+        response = self.capture.drain('feed')[0]
+
+        detail = self.parser.parse_note_response(
+            response['data'], "https://www.xiaohongshu.com/explore/687288e40000000017033540"
+        )
+        self.assertEqual(detail['note_id'], '687288e40000000017033540')
+        self.assertEqual(detail['title'], '外卖翻车')
+        self.assertEqual(detail['username'], '小明')
+        self.assertEqual(detail['likes'], 390)
+        self.assertEqual(detail['collections'], 1500)
+        self.assertEqual(len(detail['images']), 2)
+        self.assertEqual(self.parser.parse_note_response({}, ''), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
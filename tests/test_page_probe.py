@@ -0,0 +1,100 @@
+"""
+页面状态探测测试
+替身driver返回预设的探测结果，并统计往返次数
+"""
+
+import unittest
+
+from src.crawler.selenium_handler import SeleniumHandler, PAGE_KEYWORDS
+
+
+def make_status(**overrides):
+    """构造探测结果"""
+    status = {
+        'url': 'https://www.xiaohongshu.com/search_result?keyword=x',
+        'login_popup': False,
+        'avatar': False,
+        'search_box': False,
+        'feed_container': True,
+        'keywords': {name: [] for name in PAGE_KEYWORDS},
+    }
+    status.update(overrides)
+    return status
+
+
+class FakeDriver:
+    """只支持execute_script的替身driver"""
+
+    def __init__(self, status):
+        self.status = status
+        self.calls = 0
+
+    def execute_script(self, script, *args):
+        self.calls += 1
+        return self.status
+
+    @property
+    def page_source(self):
+        raise AssertionError("探测模式不应拉取page_source")
+
+
+class TestPageProbe(unittest.TestCase):
+    """测试基于单次探测的页面检查"""
+
+    def make_handler(self, **overrides):
+        handler = SeleniumHandler()
+        handler.driver = FakeDriver(make_status(**overrides))
+        return handler
+
+    def test_logged_in_checks_in_one_round_trip(self):
+        handler = self.make_handler(avatar=True)
+        self.assertTrue(handler.is_logged_in())
+        self.assertEqual(handler.driver.calls, 1)
+
+        handler = self.make_handler(login_popup=True, avatar=True)
+        self.assertFalse(handler.is_logged_in())
+
+        handler = self.make_handler(search_box=True, keywords={'login': ['立即登录'], 'force_login': [], 'blocked': []})
+        self.assertFalse(handler.is_logged_in())
+
+    def test_redirect_detection(self):
+        self.assertFalse(self.make_handler().check_page_redirected())
+        self.assertTrue(self.make_handler(feed_container=False).check_page_redirected())
+        self.assertTrue(self.make_handler(url='https://www.xiaohongshu.com/').check_page_redirected())
+        self.assertTrue(self.make_handler(
+            keywords={'login': [], 'force_login': [], 'blocked': ['页面不见了']}
+        ).check_page_redirected())
+
+    def test_status_shared_between_checks(self):
+        handler = self.make_handler(url='https://passport.xiaohongshu.com/login')
+        status = handler.probe_page()
+
+        self.assertTrue(handler.force_login_required('', status))
+        self.assertFalse(handler.is_logged_in(status))
+        self.assertEqual(handler.driver.calls, 1)
+
+    def test_no_popup_wait_without_login_prompt(self):
+        handler = self.make_handler()
+        self.assertFalse(handler.close_login_popup())
+        # 只用了一次探测，没有等待弹窗出现
+        self.assertEqual(handler.driver.calls, 1)
+
+
+class TestCollectImages(unittest.TestCase):
+    """测试单次往返收集图片"""
+
+    def test_one_round_trip(self):
+        images = [
+            {'url': 'https://ci.xhscdn.com/a.jpg', 'caption': '', 'width': 800, 'height': 600, 'visible': True},
+            {'url': 'https://ci.xhscdn.com/b.jpg', 'caption': '', 'width': 0, 'height': 0, 'visible': False},
+        ]
+        handler = SeleniumHandler()
+        handler.driver = FakeDriver(images)
+
+        self.assertEqual(handler.extract_images(), ['https://ci.xhscdn.com/a.jpg', 'https://ci.xhscdn.com/b.jpg'])
+        self.assertEqual(len(handler.collect_images(visible_only=True)), 1)
+        self.assertEqual(handler.driver.calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
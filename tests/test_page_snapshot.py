@@ -0,0 +1,89 @@
+"""
+页面快照测试
+替身driver统计page_source和探测脚本的调用次数
+"""
+
+import unittest
+
+from src.crawler.selenium_handler import SeleniumHandler, PAGE_KEYWORDS
+
+
+class FakeDriver:
+    """统计往返次数的替身driver"""
+
+    def __init__(self, source='<html><body><div class="feeds-container"></div></body></html>'):
+        self.source = source
+        self.source_calls = 0
+        self.script_calls = 0
+        self.current_url = 'https://www.xiaohongshu.com/search_result?keyword=x'
+
+    @property
+    def page_source(self):
+        self.source_calls += 1
+        return self.source
+
+    def execute_script(self, script, *args):
+        self.script_calls += 1
+        return {
+            'url': self.current_url,
+            'login_popup': False,
+            'avatar': True,
+            'search_box': True,
+            'feed_container': True,
+            'keywords': {name: [] for name in PAGE_KEYWORDS},
+        }
+
+
+class TestPageSnapshot(unittest.TestCase):
+    """测试同一DOM周期内共享页面源码和状态"""
+
+    def setUp(self):
+        self.handler = SeleniumHandler()
+        self.handler.driver = FakeDriver()
+
+    def test_checks_share_one_probe(self):
+        self.assertFalse(self.handler.check_page_redirected())
+        self.assertTrue(self.handler.is_logged_in())
+        self.assertFalse(self.handler.force_login_required(''))
+        self.assertEqual(self.handler.driver.script_calls, 1)
+        self.assertEqual(self.handler.driver.source_calls, 0)
+
+    def test_source_fetched_once_per_epoch(self):
+        snapshot = self.handler.snapshot()
+        self.assertIn('feeds-container', snapshot.text)
+        self.assertIs(self.handler.snapshot().page, snapshot.page)
+        self.assertEqual(self.handler.driver.source_calls, 1)
+        # 重复读取属性不算复用
+        self.assertEqual(self.handler.snapshot_report()['source_reuses'], 0)
+
+        # 每个消费方只在第一次使用时计为复用
+        for _ in range(3):
+            snapshot.page_for('parser')
+        snapshot.page_for('debug')
+
+        stats = self.handler.snapshot_stats
+        self.assertEqual(stats.reuses, 2)
+        self.assertEqual(stats.saved_bytes, 2 * len(self.handler.driver.source.encode('utf-8')))
+        self.assertEqual(self.handler.driver.source_calls, 1)
+
+    def test_invalidate_starts_new_epoch(self):
+        first = self.handler.snapshot()
+        first.text
+
+        self.handler.invalidate_snapshot()
+        self.handler.driver.source = '<html><body>new</body></html>'
+        second = self.handler.snapshot()
+
+        self.assertIsNot(first, second)
+        self.assertIn('new', second.text)
+        self.assertEqual(self.handler.driver.source_calls, 2)
+        self.assertEqual(self.handler.snapshot_report()['snapshots'], 2)
+
+    def test_url_from_status(self):
+        snapshot = self.handler.snapshot()
+        snapshot.status
+        self.assertEqual(snapshot.page.url, self.handler.driver.current_url)
+
+
+if __name__ == "__main__":
+    unittest.main()
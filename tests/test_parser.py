@@ -0,0 +1,385 @@
+"""
+解析器模块测试文件
+"""
+
+import glob
+import json
+import re
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.crawler.parser import XHSParser
+from src.crawler.search_extractor import SearchResultExtractor, parse_count
+from src.crawler.state_extractor import decode_js_object, extract_initial_state
+from src.crawler.field_collector import FieldCollector, find_note_subtree
+from src.crawler.page_cache import ParseCache, ParsedPage
+from src.crawler.selector_stats import SelectorStats
+
+
+SEARCH_PAGE = """
+<html><body>
+<div class="feeds-container">
+  <section class="note-item" data-index="0">
+    <div>
+      <a href="/explore/687288e40000000017033540" style="display: none;"></a>
+      <a class="cover mask ld" href="/search_result/687288e40000000017033540?xsec_token=x">
+        <img src="https://sns-webpic-qc.xhscdn.com/cover_1.jpg">
+      </a>
+      <div class="footer">
+        <a class="title"><span>外卖翻车现场 #外卖</span></a>
+        <div class="card-bottom-wrapper">
+          <a class="author" href="/user/profile/1">
+            <img class="author-avatar" src="https://sns-avatar-qc.xhscdn.com/avatar/1.jpg">
+            <div class="name-time-wrapper"><div class="name">小明</div><div class="time">2025-07-13</div></div>
+          </a>
+          <span class="like-wrapper"><span class="count">1.2万</span></span>
+        </div>
+      </div>
+    </div>
+  </section>
+  <section class="note-item" data-index="1">
+    <a href="/explore/66f7f255000000001a020eb9"></a>
+    <a class="title"><span>今天的晚饭</span></a>
+  </section>
+</div>
+</body></html>
+"""
+
+
+class TestSearchResultExtractor(unittest.TestCase):
+    """测试lxml搜索结果提取器"""
+
+    def setUp(self):
+        self.extractor = SearchResultExtractor()
+
+    def test_extract_cards(self):
+        cards = self.extractor.extract(SEARCH_PAGE)
+        self.assertEqual(len(cards), 2)
+
+        card = cards[0]
+        self.assertEqual(card['note_id'], '687288e40000000017033540')
+        self.assertEqual(card['title'], '外卖翻车现场 #外卖')
+        self.assertEqual(card['username'], '小明')
+        self.assertEqual(card['likes'], 12000)
+        self.assertEqual(card['tags'], ['外卖'])
+        self.assertEqual(card['cover_url'], 'https://sns-webpic-qc.xhscdn.com/cover_1.jpg')
+
+    def test_empty_page(self):
+        self.assertEqual(self.extractor.extract(''), [])
+
+    def test_extract_fragments_incrementally(self):
+        fragments = re.findall(r'<section.*?</section>', SEARCH_PAGE, re.S)
+        seen_ids = set()
+
+        first = self.extractor.extract_fragments(fragments[:1], seen_ids)
+        self.assertEqual([c['note_id'] for c in first], ['687288e40000000017033540'])
+        self.assertEqual(first[0]['username'], '小明')
+
+        # 虚拟列表复用后重复返回的卡片不再产出
+        second = self.extractor.extract_fragments(fragments, seen_ids)
+        self.assertEqual([c['note_id'] for c in second], ['66f7f255000000001a020eb9'])
+        self.assertEqual(self.extractor.extract_fragments([], seen_ids), [])
+
+    def test_parse_count(self):
+        self.assertEqual(parse_count('390'), 390)
+        self.assertEqual(parse_count('1.5k'), 1500)
+        self.assertEqual(parse_count('赞'), 0)
+
+
+class TestXHSParserSearch(unittest.TestCase):
+    """测试搜索结果解析入口"""
+
+    def setUp(self):
+        self.parser = XHSParser()
+
+    def test_keyword_filter(self):
+        notes = self.parser.parse_search_results_direct(SEARCH_PAGE, '外卖翻车')
+        self.assertEqual([n['note_id'] for n in notes], ['687288e40000000017033540'])
+        self.assertEqual(notes[0]['search_keyword'], '外卖翻车')
+
+    def test_parse_search_fragments(self):
+        fragments = re.findall(r'<section.*?</section>', SEARCH_PAGE, re.S)
+        seen_ids = set()
+        notes = self.parser.parse_search_fragments(fragments, '外卖翻车', seen_ids)
+        self.assertEqual([n['note_id'] for n in notes], ['687288e40000000017033540'])
+        self.assertEqual(len(seen_ids), 2)
+        self.assertEqual(self.parser.parse_search_fragments(fragments, '外卖翻车', seen_ids), [])
+
+    def test_invalid_engine(self):
+        with self.assertRaises(ValueError):
+            XHSParser(search_engine='unknown')
+
+    def test_engines_agree_on_recorded_pages(self):
+        files = sorted(glob.glob('debug_pages/search_*.html'))
+        if not files:
+            self.skipTest("没有录制的搜索页面")
+
+        with open(files[0], 'r', encoding='utf-8') as f:
+            page_source = f.read()
+        keyword = files[0].split('_')[-2]
+
+        # 与旧引擎的完整扫描对比
+        parser = XHSParser(cache_size=0, adaptive=False)
+        legacy = parser.parse_search_results_direct(page_source, keyword, engine='legacy')
+        fast = parser.parse_search_results_direct(page_source, keyword, engine='lxml')
+
+        # 新引擎应至少找到旧引擎找到的所有笔记
+        legacy_ids = {n['note_id'] for n in legacy}
+        fast_ids = {n['note_id'] for n in fast}
+        self.assertTrue(legacy_ids.issubset(fast_ids))
+
+
+class TestStateExtractor(unittest.TestCase):
+    """测试页面状态提取"""
+
+    def test_nested_object_with_braces_in_strings(self):
+        page = (
+            '<script>window.__INITIAL_STATE__ = {"note": {"title": "括号}{测试", '
+            '"user": {"nickname": "a\\"b"}}, "list": [{"id": 1}]};</script>'
+        )
+        state = extract_initial_state(page)
+        self.assertEqual(state['note']['title'], '括号}{测试')
+        self.assertEqual(state['list'], [{'id': 1}])
+
+    def test_js_literals(self):
+        data = decode_js_object("{\"a\": undefined, \"b\": 'x', \"c\": \"undefined\", \"d\": [1, 2,],}")
+        self.assertEqual(data, {'a': None, 'b': 'x', 'c': 'undefined', 'd': [1, 2]})
+
+    def test_missing_or_truncated_state(self):
+        self.assertIsNone(extract_initial_state('<html></html>'))
+        self.assertIsNone(extract_initial_state('window.__INITIAL_STATE__={"a": {"b": 1}'))
+
+    def test_search_parser_uses_state_feeds(self):
+        page = (
+            '<html><body><script>window.__INITIAL_STATE__={"search": {"feeds": [{'
+            '"id": "687288e40000000017033540", "modelType": "note", "noteCard": {'
+            '"displayTitle": "外卖翻车了", "user": {"nickname": "小明"}, '
+            '"interactInfo": {"likedCount": "390"}, "cover": {"urlDefault": undefined}}}]}}</script>'
+            '</body></html>'
+        )
+        notes = XHSParser().parse_search_results_direct(page, '外卖翻车')
+        self.assertEqual(len(notes), 1)
+        self.assertEqual(notes[0]['username'], '小明')
+        self.assertEqual(notes[0]['likes'], 390)
+
+
+NOTE_STATE = {
+    'global': {'id': 'global-id', 'name': '全局'},
+    'note': {
+        'currentNoteId': '687288e40000000017033540',
+        'noteDetailMap': {
+            '687288e40000000017033540': {
+                'note': {
+                    'noteId': '687288e40000000017033540',
+                    'title': '外卖翻车',
+                    'desc': '今天的外卖',
+                    'user': {'nickname': '小明'},
+                    'interactInfo': {'likedCount': '1.2万'},
+                    'tagList': [{'id': 't1', 'name': '外卖'}],
+                    'imageList': [
+                        {'urlDefault': 'https://a.xhscdn.com/1.jpg', 'width': 1080, 'height': 1440,
+                         'infoList': [{'url': 'https://a.xhscdn.com/1_prv.jpg'}]},
+                        {'urlDefault': 'https://a.xhscdn.com/2.jpg'},
+                    ],
+                }
+            }
+        }
+    }
+}
+
+
+class TestFieldCollector(unittest.TestCase):
+    """测试单次遍历字段收集"""
+
+    def test_collect_from_note_subtree(self):
+        subtree, path = find_note_subtree(NOTE_STATE)
+        values, paths = FieldCollector().collect(subtree, path)
+
+        self.assertEqual(values['note_id'], '687288e40000000017033540')
+        self.assertEqual(values['username'], '小明')
+        self.assertEqual([img['url'] for img in values['images']],
+                         ['https://a.xhscdn.com/1.jpg', 'https://a.xhscdn.com/2.jpg'])
+        self.assertEqual(values['tags'], ['外卖'])
+        self.assertEqual(paths['username'],
+                         'note.noteDetailMap.687288e40000000017033540.note.user.nickname')
+
+    def test_tag_names_before_user_are_ignored(self):
+        note = {
+            'noteId': '687288e40000000017033540',
+            'desc': '今天的外卖',
+            'tagList': [{'id': 't1', 'name': '外卖'}],
+            'user': {'userId': 'u1', 'name': '小明'},
+        }
+        values, paths = FieldCollector().collect(note)
+
+        self.assertEqual(values['username'], '小明')
+        self.assertEqual(paths['username'], 'user.name')
+        self.assertNotIn('title', values)
+        self.assertEqual(values['tags'], ['外卖'])
+
+    def test_parse_json_data(self):
+        result = XHSParser()._parse_json_data(NOTE_STATE)
+        self.assertEqual(result['title'], '外卖翻车')
+        self.assertEqual(result['likes'], 12000)
+        self.assertEqual(result['images'][0]['width'], 1080)
+
+    def test_without_note_subtree(self):
+        subtree, path = find_note_subtree({'feed': {'id': 'abc'}})
+        values, paths = FieldCollector().collect(subtree, path)
+        self.assertEqual(values['note_id'], 'abc')
+        self.assertEqual(paths['note_id'], 'feed.id')
+
+
+class TestNoteDetailPartialParse(unittest.TestCase):
+    """测试详情页部分解析"""
+
+    def setUp(self):
+        self.parser = XHSParser(cache_size=0)
+        self.url = "https://www.xiaohongshu.com/explore/687288e40000000017033540"
+
+    def test_state_page_skips_full_dom(self):
+        page = f"<html><body><div>正文</div><script>window.__INITIAL_STATE__={json.dumps(NOTE_STATE)}</script></body></html>"
+        detail = self.parser.parse_note_detail_direct(page, self.url)
+
+        self.assertEqual(detail['content'], '今天的外卖')
+        report = self.parser.detail_parse_report()
+        self.assertEqual(report['full_soup'], 0)
+        self.assertEqual(report['fast_path_rate'], 100)
+
+    def test_html_fallback_builds_full_dom(self):
+        page = "<html><body><h1 class='title'>外卖翻车</h1><div class='content'>今天的外卖翻车了，汤全洒了</div></body></html>"
+        self.parser.parse_note_detail_direct(page, self.url)
+
+        report = self.parser.detail_parse_report()
+        self.assertEqual(report['script_soup'], 1)
+        self.assertEqual(report['full_soup'], 1)
+        self.assertEqual(report['fast_path'], 0)
+        self.assertIsNotNone(report['avg_full_soup_ms'])
+        self.assertGreater(report['avg_full_soup_nodes'], report['avg_partial_soup_nodes'])
+        self.assertEqual(report['avg_nodes_per_page'],
+                         report['avg_full_soup_nodes'] + report['avg_partial_soup_nodes'])
+        # 子树构建耗时计入成本，没有快速路径页面时节省为负
+        self.assertLessEqual(report['estimated_saved_ms'], 0)
+
+
+class TestParseCache(unittest.TestCase):
+    """测试按内容哈希的解析缓存"""
+
+    def test_same_page_parsed_once(self):
+        parser = XHSParser(cache_size=4)
+        first = parser.parse_search_results_direct(SEARCH_PAGE, '外卖翻车')
+        first[0]['title'] = '被调用方修改'
+        second = parser.parse_search_results_direct(SEARCH_PAGE, '外卖翻车')
+
+        self.assertEqual(parser.parse_cache.stats()['hits'], 1)
+        self.assertEqual(parser.parse_cache.stats()['misses'], 1)
+        # 返回副本，调用方的修改不影响缓存
+        self.assertEqual(second[0]['title'], '外卖翻车现场 #外卖')
+
+    def test_parsed_page_shared(self):
+        cache = ParseCache(maxsize=2)
+        page = cache.get_page(SEARCH_PAGE, 'https://www.xiaohongshu.com/search_result')
+        self.assertIs(cache.get_page(SEARCH_PAGE), page)
+        self.assertEqual(page.find_keyword(['不存在', 'feeds-container']), 'feeds-container')
+        self.assertIsNone(page.state)
+
+    def test_lru_eviction(self):
+        cache = ParseCache(maxsize=2)
+        for i in range(3):
+            cache.get_or_compute(i, lambda: i)
+        cache.get_or_compute(0, lambda: 'recomputed')
+        self.assertEqual(cache.stats()['misses'], 4)
+
+    def test_cache_disabled(self):
+        parser = XHSParser(cache_size=0)
+        self.assertIsNone(parser.parse_cache)
+        notes = parser.parse_search_results_direct(ParsedPage(SEARCH_PAGE), '外卖翻车')
+        self.assertEqual(len(notes), 1)
+
+
+class TestSelectorStats(unittest.TestCase):
+    """测试选择器命中统计"""
+
+    def test_rank_and_window(self):
+        stats = SelectorStats(window=3)
+        self.assertEqual(stats.rank('lxml', ['a', 'b', 'c']), ['a', 'b', 'c'])
+
+        for value in (0, 0, 0, 5):
+            stats.record('lxml', 'a', value)
+        stats.record('lxml', 'c', 10)
+
+        self.assertEqual(stats.samples['lxml']['a'], [0, 0, 5])
+        self.assertEqual(stats.rank('lxml', ['a', 'b', 'c']), ['c', 'a', 'b'])
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "stats.json"
+            stats = SelectorStats(path)
+            stats.record('legacy', 'article', 3)
+            self.assertTrue(stats.save())
+
+            self.assertEqual(SelectorStats(path).mean('legacy', 'article'), 3)
+
+    def test_adaptive_matches_full_scan(self):
+        parser = XHSParser(cache_size=0)
+        full = XHSParser(cache_size=0, adaptive=False)
+
+        for _ in range(2):
+            adaptive_ids = [n['note_id'] for n in parser.parse_search_results_direct(SEARCH_PAGE, '外卖翻车')]
+        full_ids = [n['note_id'] for n in full.parse_search_results_direct(SEARCH_PAGE, '外卖翻车')]
+
+        self.assertEqual(adaptive_ids, full_ids)
+        self.assertIn('lxml', parser.selector_stats.report())
+
+    def test_yield_drop_falls_back_to_full_scan(self):
+        parser = XHSParser(cache_size=0)
+        # 历史上产出最高的策略在本页没有卡片
+        for _ in range(3):
+            parser.selector_stats.record('lxml', 'div[data-note-id]', 30)
+
+        notes = parser.parse_search_results_direct(SEARCH_PAGE, '外卖翻车')
+
+        self.assertEqual([n['note_id'] for n in notes], ['687288e40000000017033540'])
+        self.assertNotIn('lxml', parser.selector_stats.report())
+
+    def test_legacy_engine_not_adaptive_by_default(self):
+        parser = XHSParser(cache_size=0)
+        self.assertTrue(parser.adaptive)
+        self.assertFalse(parser.adaptive_legacy)
+
+        parser.parse_search_results_direct(SEARCH_PAGE, '外卖翻车', engine='legacy')
+        self.assertNotIn('legacy', parser.selector_stats.report())
+
+
+class TestParseMany(unittest.TestCase):
+    """测试进程池批量解析"""
+
+    def test_parse_many_paths_and_strings(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            page_path = Path(temp_dir) / "search_外卖翻车_1.html"
+            page_path.write_text(SEARCH_PAGE, encoding='utf-8')
+            output_path = Path(temp_dir) / "parsed.jsonl"
+
+            records = list(XHSParser().parse_many(
+                [page_path, SEARCH_PAGE, str(page_path)],
+                workers=2, chunksize=1, output_path=output_path
+            ))
+
+            self.assertEqual([r['index'] for r in records], [0, 1, 2])
+            self.assertTrue(all(r['ok'] for r in records))
+            # 路径输入从文件名提取关键词，源码输入没有关键词
+            self.assertEqual(len(records[0]['result']), 1)
+            self.assertEqual(records[1]['result'], [])
+
+            lines = output_path.read_text(encoding='utf-8').splitlines()
+            self.assertEqual(len(lines), 3)
+            self.assertEqual(json.loads(lines[2])['source'], str(page_path))
+
+    def test_invalid_kind(self):
+        with self.assertRaises(ValueError):
+            list(XHSParser().parse_many([], kind='unknown'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+限速器测试
+使用替身时钟，等待时间直接推进时钟
+"""
+
+import unittest
+
+from src.crawler.rate_limiter import RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestRateLimiter(unittest.TestCase):
+    """测试按主机的令牌桶限速"""
+
+    def make_limiter(self):
+        self.clock = FakeClock()
+        return RateLimiter(
+            {'site': {'rate': 0.5, 'burst': 1}, 'cdn': {'rate': 10, 'burst': 5}},
+            ['xhscdn.com'], clock=self.clock, sleep=self.clock.sleep
+        )
+
+    def test_waits_only_when_over_budget(self):
+        limiter = self.make_limiter()
+        self.assertEqual(limiter.acquire('https://www.xiaohongshu.com/a'), 0)
+        self.assertAlmostEqual(limiter.acquire('https://www.xiaohongshu.com/b'), 2.0)
+
+        # 距上次请求已超过间隔时不等待
+        self.clock.now += 5
+        self.assertEqual(limiter.acquire('https://www.xiaohongshu.com/c'), 0)
+
+        report = limiter.report()['site']
+        self.assertEqual(report['requests'], 3)
+        self.assertEqual(report['waits'], 1)
+        self.assertEqual(report['wait_seconds'], 2.0)
+
+    def test_cdn_budget_and_hosts_are_separate(self):
+        limiter = self.make_limiter()
+        self.assertEqual(limiter.budget_for('sns-img-qc.xhscdn.com'), 'cdn')
+        self.assertEqual(limiter.budget_for('www.xiaohongshu.com'), 'site')
+
+        # CDN允许突发5个请求，且不占用站点预算
+        waits = [limiter.acquire(f'https://ci.xhscdn.com/{i}.jpg') for i in range(6)]
+        self.assertEqual(waits[:5], [0] * 5)
+        self.assertAlmostEqual(waits[5], 0.1)
+        self.assertEqual(limiter.acquire('https://www.xiaohongshu.com/'), 0)
+
+        # 不同主机各自计算
+        self.assertEqual(limiter.acquire('https://edith.xiaohongshu.com/api'), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
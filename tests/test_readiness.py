@@ -0,0 +1,71 @@
+"""
+页面就绪等待测试
+使用按脚本返回预设值的替身driver
+"""
+
+import time
+import unittest
+
+from selenium.common.exceptions import JavascriptException
+
+from src.crawler.readiness import (
+    ReadinessWaiter, all_of, any_of, document_ready, feed_populated, popup_gone
+)
+
+
+class FakeDriver:
+    """第ready_after次调用后页面就绪"""
+
+    def __init__(self, ready_after=0, cards=5):
+        self.calls = 0
+        self.ready_after = ready_after
+        self.cards = cards
+
+    def execute_script(self, script, *args):
+        self.calls += 1
+        if 'readyState' in script:
+            return 'complete' if self.calls > self.ready_after else 'loading'
+        if 'querySelectorAll(arguments[0]).length' in script:
+            return self.cards
+        if 'offsetParent' in script:
+            raise JavascriptException("页面正在跳转")
+        return None
+
+
+class TestReadinessWaiter(unittest.TestCase):
+    """测试就绪等待"""
+
+    def test_returns_as_soon_as_ready(self):
+        waiter = ReadinessWaiter(FakeDriver(ready_after=2), budget_seconds=5, poll_interval=0.01)
+
+        start = time.monotonic()
+        self.assertTrue(waiter.wait(document_ready(), 'document_ready'))
+        self.assertLess(time.monotonic() - start, 1)
+
+        report = waiter.report()['document_ready']
+        self.assertEqual(report['count'], 1)
+        self.assertEqual(report['timeouts'], 0)
+
+    def test_timeout_is_capped_by_page_budget(self):
+        waiter = ReadinessWaiter(FakeDriver(cards=0), budget_seconds=0.1, poll_interval=0.01)
+
+        start = time.monotonic()
+        self.assertFalse(waiter.wait(feed_populated(), 'search_feed', timeout=10))
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(waiter.report()['search_feed']['timeouts'], 1)
+
+        # 新页面重置预算
+        waiter.new_page()
+        self.assertGreater(waiter.budget.remaining(), 0)
+
+    def test_composed_conditions(self):
+        driver = FakeDriver(cards=3)
+        self.assertTrue(all_of(document_ready(), feed_populated(min_count=3))(driver))
+        self.assertFalse(all_of(document_ready(), feed_populated(min_count=4))(driver))
+        # 脚本出错视为未就绪
+        self.assertFalse(popup_gone()(driver))
+        self.assertTrue(any_of(popup_gone(), document_ready())(driver))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+请求处理器下载测试
+本地HTTP服务返回图片数据，/truncated声明的长度大于实际发送的数据
+"""
+
+import hashlib
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+from src.crawler.request_handler import RequestHandler
+
+IMAGE_BYTES = bytes(range(256)) * 1024
+
+
+class ImageHandler(BaseHTTPRequestHandler):
+    """返回图片数据"""
+
+    def do_GET(self):
+        body = IMAGE_BYTES
+        declared = len(body) * 2 if self.path == '/truncated' else len(body)
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(declared))
+        self.end_headers()
+        self.wfile.write(body)
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestStreamDownload(unittest.TestCase):
+    """测试流式原子下载"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(('127.0.0.1', 0), ImageHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.handler = RequestHandler(use_proxy=False)
+        self.handler.chunk_size = 4096
+
+    def tearDown(self):
+        self.handler.close()
+
+    def test_complete_download_is_renamed_with_hash(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            save_path = Path(temp_dir) / "image_01.jpg"
+            result = self.handler.stream_download(f"{self.base_url}/image.jpg", str(save_path), delay=False)
+
+            self.assertTrue(result['success'])
+            self.assertEqual(save_path.read_bytes(), IMAGE_BYTES)
+            self.assertEqual(result['bytes'], len(IMAGE_BYTES))
+            self.assertEqual(result['md5'], hashlib.md5(IMAGE_BYTES).hexdigest())
+            self.assertEqual([p.name for p in Path(temp_dir).iterdir()], ["image_01.jpg"])
+
+    def test_short_read_leaves_no_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            save_path = Path(temp_dir) / "image_01.jpg"
+            success, message = self.handler.download_image(f"{self.base_url}/truncated", str(save_path), delay=False)
+
+            self.assertFalse(success)
+            self.assertEqual(list(Path(temp_dir).iterdir()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
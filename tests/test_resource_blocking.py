@@ -0,0 +1,77 @@
+"""
+资源拦截测试
+"""
+
+import unittest
+
+from src.crawler.resource_blocking import (
+    PageMetrics, RESOURCE_PATTERNS, blocked_url_patterns, content_setting_prefs,
+    enable_url_blocking, resolve_profile
+)
+from src.crawler.selenium_handler import SeleniumHandler
+
+
+class FakeCDPDriver:
+    """记录DevTools命令的替身driver"""
+
+    def __init__(self):
+        self.commands = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.commands.append((cmd, params))
+        return {}
+
+
+class TestResourceBlocking(unittest.TestCase):
+    """测试资源拦截配置"""
+
+    def test_resolve_profile(self):
+        self.assertEqual(resolve_profile('off'), [])
+        self.assertEqual(resolve_profile(None), [])
+        self.assertIn('image', resolve_profile('scrape'))
+        self.assertNotIn('image', resolve_profile('lite'))
+        self.assertEqual(resolve_profile(['font']), ['font'])
+
+        with self.assertRaises(ValueError):
+            resolve_profile('unknown')
+        with self.assertRaises(ValueError):
+            resolve_profile(['script'])
+
+    def test_patterns_and_prefs(self):
+        patterns = blocked_url_patterns(['font', 'media'])
+        self.assertEqual(len(patterns), len(RESOURCE_PATTERNS['font']) + len(RESOURCE_PATTERNS['media']))
+        self.assertIn('*.woff2', patterns)
+
+        # 图片只走URL拦截，扫码登录时可以解除
+        prefs = content_setting_prefs(['image'])
+        self.assertNotIn('profile.managed_default_content_settings.images', prefs)
+        self.assertEqual(content_setting_prefs([]), {})
+
+    def test_enable_and_lift_url_blocking(self):
+        driver = FakeCDPDriver()
+        self.assertTrue(enable_url_blocking(driver, ['tracker']))
+        self.assertTrue(enable_url_blocking(driver, []))
+
+        blocked = [params['urls'] for cmd, params in driver.commands if cmd == 'Network.setBlockedURLs']
+        self.assertEqual(blocked, [RESOURCE_PATTERNS['tracker'], []])
+
+    def test_page_metrics(self):
+        metrics = PageMetrics('scrape')
+        metrics.record({'transfer_bytes': 2048, 'load_ms': 300, 'resources': 10})
+        metrics.record({'transfer_bytes': 1024, 'load_ms': 100, 'resources': 4})
+        metrics.record(None)
+
+        report = metrics.report()
+        self.assertEqual(report['pages'], 2)
+        self.assertEqual(report['avg_transfer_kb'], 1.5)
+        self.assertEqual(report['avg_load_ms'], 200)
+
+    def test_handler_profile(self):
+        handler = SeleniumHandler(blocking_profile='lite')
+        self.assertEqual(handler.blocked_types, ['media', 'font', 'tracker'])
+        self.assertEqual(handler.page_metrics.profile_name, 'lite')
+        self.assertEqual(SeleniumHandler(blocking_profile='off').blocked_types, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+滚动收集测试
+替身浏览器按滚动次数依次返回新卡片
+"""
+
+import unittest
+
+from src.crawler.scroll_harvester import (
+    ScrollHarvester, STOP_MAX_SCROLLS, STOP_NO_GROWTH, STOP_TARGET, STOP_TIME_BUDGET
+)
+
+
+class FakeWaiter:
+    def new_page(self):
+        pass
+
+
+class FakeHandler:
+    """每次collect_new_feed_cards返回下一批卡片"""
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.scrolls = 0
+        self.waiter = FakeWaiter()
+
+    def collect_new_feed_cards(self, selector=None):
+        fresh = self.batches.pop(0) if self.batches else []
+        return fresh, 0
+
+    def scroll_down(self, pixels=500, duration=1):
+        self.scrolls += 1
+
+    def wait_until(self, condition, name, timeout=None):
+        return bool(self.batches and self.batches[0])
+
+
+def parse(fragments):
+    """卡片内容即笔记ID"""
+    return [{'note_id': fragment} for fragment in fragments]
+
+
+class TestScrollHarvester(unittest.TestCase):
+    """测试滚动收集的去重和停止条件"""
+
+    def test_ordered_dedup_and_target(self):
+        handler = FakeHandler([['a', 'b'], ['b', 'c'], ['d', 'e'], ['f']])
+        harvester = ScrollHarvester(handler, target=4, max_scrolls=10)
+
+        notes = harvester.harvest(parse)
+        self.assertEqual([note['note_id'] for note in notes], ['a', 'b', 'c', 'd'])
+        self.assertEqual(harvester.note_ids, ['a', 'b', 'c', 'd', 'e'])
+        self.assertEqual(harvester.stats['stop_reason'], STOP_TARGET)
+        self.assertEqual(handler.scrolls, 2)
+
+    def test_stop_on_no_growth(self):
+        handler = FakeHandler([['a'], ['b'], [], [], ['c']])
+        harvester = ScrollHarvester(handler, target=10, max_scrolls=10, no_growth_rounds=2)
+
+        harvester.harvest(parse)
+        self.assertEqual(harvester.note_ids, ['a', 'b'])
+        self.assertEqual(harvester.stats['stop_reason'], STOP_NO_GROWTH)
+
+    def test_stop_on_max_scrolls_and_time_budget(self):
+        harvester = ScrollHarvester(FakeHandler([['a'], ['b'], ['c']]), target=10, max_scrolls=1)
+        harvester.harvest(parse)
+        self.assertEqual(harvester.stats['stop_reason'], STOP_MAX_SCROLLS)
+
+        handler = FakeHandler([['a'], ['b']])
+        harvester = ScrollHarvester(handler, target=10, max_scrolls=10, time_budget=0)
+        harvester.harvest(parse)
+        self.assertEqual(harvester.stats['stop_reason'], STOP_TIME_BUDGET)
+        self.assertEqual(handler.scrolls, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+存储模块测试
+"""
+
+import hashlib
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.crawler.xhs_crawler import SimpleXHSCrawler
+from src.storage.image_store import ImageStore, normalize_image_url
+
+
+class TestNormalizeImageUrl(unittest.TestCase):
+    """测试图片地址规范化"""
+
+    def test_cdn_variants_share_key(self):
+        a = "https://sns-webpic-qc.xhscdn.com/202403211230/abc/1040g008token!nd_dft_wlteh_webp_3"
+        b = "http://sns-img-bd.xhscdn.com/1040g008token?imageView2/2/w/1080"
+        self.assertEqual(normalize_image_url(a), normalize_image_url(b))
+        self.assertEqual(normalize_image_url("https://example.com/a.jpg?x=1"), "example.com/a.jpg")
+
+
+class TestImageStore(unittest.TestCase):
+    """测试内容寻址存储"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self.temp_dir.name)
+        self.store = ImageStore(self.base / "store")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def download(self, comic, name, content):
+        path = self.base / comic / "images" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+        return path
+
+    def test_duplicate_content_is_stored_once(self):
+        first = self.download("comic_001", "image_01.jpg", b"same image")
+        second = self.download("comic_002", "image_01.jpg", b"same image")
+
+        md5 = self.store.ingest(first, "comic_001/image_01.jpg", "https://ci.xhscdn.com/a")
+        self.assertEqual(md5, hashlib.md5(b"same image").hexdigest())
+        self.assertEqual(self.store.ingest(second, "comic_002/image_01.jpg", "https://ci.xhscdn.com/b"), md5)
+
+        blob = self.store.blob_path(md5)
+        self.assertEqual(blob.parent.parent.name, md5[:2])
+        self.assertEqual(first.read_bytes(), b"same image")
+        self.assertEqual(first.stat().st_ino, blob.stat().st_ino)
+        self.assertEqual(second.stat().st_ino, blob.stat().st_ino)
+
+        report = self.store.report()
+        self.assertEqual((report['blobs'], report['refs'], report['content_hits']), (1, 2, 1))
+
+    def test_known_url_skips_download_and_index_persists(self):
+        path = self.download("comic_001", "image_01.jpg", b"image")
+        md5 = self.store.ingest(path, "comic_001/image_01.jpg", "https://sns-webpic-qc.xhscdn.com/1/token!style")
+        self.store.save()
+
+        store = ImageStore(self.base / "store")
+        dest = self.base / "comic_002" / "images" / "image_03.jpg"
+        self.assertEqual(store.link_known("https://sns-img-bd.xhscdn.com/token", dest, "comic_002/image_03.jpg"), md5)
+        self.assertEqual(dest.read_bytes(), b"image")
+        self.assertIsNone(store.link_known("https://ci.xhscdn.com/other", dest, "comic_002/image_04.jpg"))
+        self.assertEqual(store.report()['download_bytes_saved'], 5)
+
+    def test_release_removes_unreferenced_blob(self):
+        path = self.download("comic_001", "image_01.jpg", b"image")
+        md5 = self.store.ingest(path, "comic_001/image_01.jpg")
+
+        # 同名引用指向新内容时，旧文件不再被引用
+        replaced = self.download("comic_001", "image_01.jpg", b"new image")
+        self.store.ingest(replaced, "comic_001/image_01.jpg")
+        self.assertFalse(self.store.blob_path(md5).exists())
+
+        self.assertEqual(self.store.release("comic_001/image_01.jpg"), 1)
+        self.assertEqual(self.store.report()['blobs'], 0)
+
+    def test_missing_blob_keeps_other_refs(self):
+        path = self.download("comic_001", "image_01.jpg", b"image")
+        md5 = self.store.ingest(path, "comic_001/image_01.jpg", "https://ci.xhscdn.com/a")
+        self.store.blob_path(md5).unlink()
+
+        # 文件丢失后重新下载存入，comic_001的引用仍然保留
+        again = self.download("comic_002", "image_01.jpg", b"image")
+        self.store.ingest(again, "comic_002/image_01.jpg")
+        self.assertEqual(self.store.release("comic_002/image_01.jpg"), 0)
+        self.assertTrue(self.store.blob_path(md5).exists())
+
+        self.assertEqual(self.store.release("comic_001/image_01.jpg"), 1)
+        self.assertIsNone(self.store.lookup("https://ci.xhscdn.com/a"))
+        self.assertEqual(self.store.urls, {})
+
+
+class FailingEngine:
+    """只有第一张图片下载成功"""
+
+    def download_batch(self, jobs):
+        results = []
+        for index, (url, path) in enumerate(jobs):
+            success = index == 0
+            if success:
+                Path(path).write_bytes(b"new image")
+            results.append({'url': url, 'path': str(path), 'success': success, 'message': '',
+                            'seconds': 0.0, 'bytes': 9 if success else 0, 'md5': ''})
+        return results
+
+
+class TestRejectedComic(unittest.TestCase):
+    """测试图片不足的连环画不留下文件"""
+
+    def test_linked_and_downloaded_images_removed(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            base = Path(temp_dir)
+            store = ImageStore(base / "store")
+            known = base / "comic_009" / "images" / "image_01.jpg"
+            known.parent.mkdir(parents=True)
+            known.write_bytes(b"known image")
+            md5 = store.ingest(known, "comic_009/image_01.jpg", "https://ci.xhscdn.com/known")
+
+            crawler = SimpleXHSCrawler()
+            crawler.image_store = store
+            crawler.download_engine = FailingEngine()
+            comic = {'comic_id': 'comic_001', 'images': [
+                "https://ci.xhscdn.com/known", "https://ci.xhscdn.com/new", "https://ci.xhscdn.com/fail",
+            ]}
+            with mock.patch('src.crawler.xhs_crawler.COMICS_DIR', base):
+                self.assertFalse(crawler.save_comic(comic))
+
+            self.assertFalse((base / "comic_001").exists())
+            self.assertEqual(store.blob_path(md5).read_bytes(), b"known image")
+            self.assertEqual(store.report()['refs'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
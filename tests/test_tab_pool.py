@@ -0,0 +1,121 @@
+"""
+多标签页工作池测试
+替身driver模拟各标签页的页面加载耗时
+"""
+
+import time
+import unittest
+
+from src.crawler.tab_pool import NAVIGATE_SCRIPT, NAVIGATED_SCRIPT, STOP_SCRIPT, TabPool
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current_window_handle = handle
+
+    def new_window(self, kind):
+        handle = f"tab-{len(self.driver.tabs)}"
+        self.driver.tabs[handle] = {'url': 'about:blank', 'started': 0.0}
+        self.driver.current_window_handle = handle
+
+
+class FakeDriver:
+    """每个页面加载load_seconds秒后就绪"""
+
+    def __init__(self, load_seconds=0.1, broken_url=None):
+        self.load_seconds = load_seconds
+        self.broken_url = broken_url
+        self.tabs = {'main': {'url': 'search', 'started': 0.0}}
+        self.stopped = []
+        self.current_window_handle = 'main'
+        self.switch_to = FakeSwitchTo(self)
+
+    def execute_script(self, script, *args):
+        tab = self.tabs[self.current_window_handle]
+        if script == NAVIGATE_SCRIPT:
+            tab['url'], tab['started'] = args[0], time.monotonic()
+            return None
+        if script == NAVIGATED_SCRIPT:
+            return tab['url'] != self.broken_url and time.monotonic() - tab['started'] >= self.load_seconds
+        if script == STOP_SCRIPT:
+            self.stopped.append(tab['url'])
+            return None
+        raise AssertionError(script)
+
+    def close(self):
+        del self.tabs[self.current_window_handle]
+
+
+class FakeHandler:
+    def __init__(self, driver):
+        self.driver = driver
+        self.invalidations = 0
+
+    def invalidate_snapshot(self):
+        self.invalidations += 1
+
+
+class TestTabPool(unittest.TestCase):
+    """测试多标签页并行加载"""
+
+    def test_pages_load_in_parallel(self):
+        driver = FakeDriver(load_seconds=0.2)
+        pool = TabPool(FakeHandler(driver), size=3, min_interval=0, jitter=0, poll_interval=0.01)
+        self.assertEqual(pool.open(), 3)
+
+        start = time.monotonic()
+        results = pool.run(
+            range(6),
+            url_of=lambda item: f"note-{item}",
+            collect=lambda handler, item: handler.driver.tabs[handler.driver.current_window_handle]['url'],
+            ready=lambda d: True
+        )
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(sorted(results), [(i, f"note-{i}") for i in range(6)])
+        # 3个标签页并行，6个页面约为2轮加载时间，而不是6轮
+        self.assertLess(elapsed, 0.2 * 6)
+        self.assertEqual(sum(tab['pages'] for tab in pool.report()['tabs'].values()), 6)
+        self.assertEqual(driver.current_window_handle, 'main')
+
+        pool.close()
+        self.assertEqual(list(driver.tabs), ['main'])
+
+    def test_timeout_and_stop(self):
+        driver = FakeDriver(load_seconds=0, broken_url='note-1')
+        pool = TabPool(FakeHandler(driver), size=2, page_timeout=0.1, min_interval=0, jitter=0, poll_interval=0.01)
+        pool.open()
+
+        results = pool.run(range(2), url_of=lambda item: f"note-{item}",
+                           collect=lambda handler, item: item, ready=lambda d: True)
+        self.assertEqual(results, [(0, 0)])
+        self.assertEqual(pool.report()['timeouts'], 1)
+
+        collected = []
+        pool.run(range(10), url_of=lambda item: f"note-{item + 2}",
+                 collect=lambda handler, item: collected.append(item),
+                 ready=lambda d: True, should_stop=lambda: len(collected) >= 3)
+        self.assertLess(len(collected), 10)
+
+    def test_active_tabs_skipped_after_stop(self):
+        driver = FakeDriver(load_seconds=0.05)
+        pool = TabPool(FakeHandler(driver), size=3, min_interval=0, jitter=0, poll_interval=0.01)
+        pool.open()
+
+        # 3个标签页同时就绪，取回第一个后即满足停止条件
+        collected = []
+        pool.run(range(6), url_of=lambda item: f"note-{item}",
+                 collect=lambda handler, item: collected.append(item),
+                 ready=lambda d: True, should_stop=lambda: len(collected) >= 1)
+
+        self.assertEqual(len(collected), 1)
+        self.assertEqual(pool.report()['skipped'], 2)
+        self.assertEqual(len(driver.stopped), 2)
+        self.assertEqual(driver.current_window_handle, 'main')
+
+
+if __name__ == "__main__":
+    unittest.main()
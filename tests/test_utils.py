@@ -8,6 +8,7 @@ from pathlib import Path
 import json
 
 from src.utils.validator import DataValidator
+from src.utils.keyword_matcher import KeywordMatcher
 from src.utils.helper import (
     generate_id,
     format_timestamp,
@@ -95,5 +96,41 @@ class TestHelperFunctions(unittest.TestCase):
             self.assertNotIn(char, clean_name)
 
 
+class TestKeywordMatcher(unittest.TestCase):
+    """测试关键词匹配器"""
+    
+    def setUp(self):
+        self.matcher = KeywordMatcher(['外卖', '外卖小哥', '小哥', '翻车', 'ABC'])
+    
+    def test_overlapping_keywords(self):
+        matched = self.matcher.matched_keywords("今天的外卖小哥翻车了")
+        self.assertEqual(set(matched), {'外卖', '外卖小哥', '小哥', '翻车'})
+        
+        # 不区分大小写
+        self.assertEqual(self.matcher.matched_keywords("xabcx"), ['abc'])
+    
+    def test_match_note_score(self):
+        note = {'title': '外卖翻车', 'content': '翻车现场', 'tags': ['小哥']}
+        result = self.matcher.match_note(note)
+        
+        self.assertEqual(result['fields']['翻车'], ['title', 'content'])
+        # 外卖(标题3) + 翻车(标题3) + 小哥(标签2)
+        self.assertEqual(result['score'], 8.0)
+    
+    def test_contains_any_with_unknown_keyword(self):
+        note = {'title': '今天吃啥', 'content': '', 'tags': []}
+        self.assertFalse(self.matcher.contains_any(note, ['外卖']))
+        self.assertTrue(self.matcher.contains_any(note, ['吃啥']))
+    
+    def test_repeated_build_does_not_duplicate_matches(self):
+        matcher = KeywordMatcher(['b'])
+        matcher.add('ab')
+        matcher.build()
+        matcher.add('xy')
+        matcher.build()
+        
+        self.assertEqual(sorted(matcher.find_all('ab')), [(1, 'ab'), (1, 'b')])
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,67 @@
+"""
+浏览器热启动测试
+"""
+
+import json
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from src.crawler.selenium_handler import SeleniumHandler
+from src.crawler.warm_start import SessionMarker, cache_driver_path, clear_driver_cache, resolve_driver_path
+
+
+class TestDriverResolution(unittest.TestCase):
+    """测试本地驱动解析"""
+
+    def test_explicit_then_cached_path(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            driver = Path(temp_dir) / "chromedriver"
+            driver.write_text("")
+            cache_file = Path(temp_dir) / "cache.json"
+
+            self.assertEqual(resolve_driver_path(driver, cache_file), (str(driver), 'settings'))
+
+            self.assertTrue(cache_driver_path(str(driver), cache_file))
+            self.assertEqual(resolve_driver_path(None, cache_file), (str(driver), 'cache'))
+
+            # 缓存的驱动已不存在时不再使用
+            clear_driver_cache(cache_file)
+            self.assertNotEqual(resolve_driver_path(Path(temp_dir) / "missing", cache_file)[1], 'cache')
+
+
+class TestSessionMarker(unittest.TestCase):
+    """测试登录会话标记"""
+
+    def test_fresh_and_expired(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            marker = SessionMarker(Path(temp_dir) / "profile", ttl_hours=1)
+            self.assertFalse(marker.is_fresh())
+
+            marker.mark()
+            self.assertTrue(marker.is_fresh())
+
+            marker.path.write_text(json.dumps({'logged_in_at': time.time() - 7200}))
+            self.assertFalse(marker.is_fresh())
+
+            marker.clear()
+            self.assertIsNone(marker.age())
+
+    def test_login_skipped_when_session_fresh(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            handler = SeleniumHandler(user_data_dir=temp_dir, persistent_profile=True)
+            handler.session_marker.mark()
+
+            # 会话新鲜时不访问浏览器（driver为None）
+            self.assertTrue(handler.login_with_cookies())
+            self.assertTrue(handler.startup_stats['login_skipped'])
+
+    def test_pool_handlers_do_not_share_profile(self):
+        handler = SeleniumHandler(persistent_profile=False)
+        self.assertIsNone(handler.user_data_dir)
+        self.assertIsNone(handler.session_marker)
+
+
+if __name__ == "__main__":
+    unittest.main()